@@ -10,3 +10,76 @@ Copyright:
     and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
     that is included as part of this package.
 """
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from stl_2_scad.api import (
+        ConversionOptions,
+        as_mesh,
+        generate_embed,
+        generate_import,
+        get_bounds,
+        write_embed,
+        write_import,
+        write_mesh,
+    )
+    from stl_2_scad.convex_hull import OrientedBoundingBox
+    from stl_2_scad.stl_helpers import BoundingBox, StlMesh, load_stl
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Public API and the modules defining it. The modules are imported on the
+# first access, so importing the package, e.g., by the command line interface,
+# doesn't import numpy.
+_API_MODULES = {
+    "ConversionOptions": "stl_2_scad.api",
+    "as_mesh": "stl_2_scad.api",
+    "generate_embed": "stl_2_scad.api",
+    "generate_import": "stl_2_scad.api",
+    "get_bounds": "stl_2_scad.api",
+    "write_embed": "stl_2_scad.api",
+    "write_import": "stl_2_scad.api",
+    "write_mesh": "stl_2_scad.api",
+    "OrientedBoundingBox": "stl_2_scad.convex_hull",
+    "BoundingBox": "stl_2_scad.stl_helpers",
+    "StlMesh": "stl_2_scad.stl_helpers",
+    "load_stl": "stl_2_scad.stl_helpers",
+}
+
+__all__ = [
+    "BoundingBox",
+    "ConversionOptions",
+    "OrientedBoundingBox",
+    "StlMesh",
+    "as_mesh",
+    "generate_embed",
+    "generate_import",
+    "get_bounds",
+    "load_stl",
+    "write_embed",
+    "write_import",
+    "write_mesh",
+]
+
+
+# -----------------------------------------------------------------------------
+# Lazy Import
+# -----------------------------------------------------------------------------
+def __getattr__(name: str) -> Any:
+    """Import the public API on the first access."""
+    if name not in _API_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_API_MODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Get the names of the module including the public API."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,266 @@
+"""
+Module containing the python API of stl2scad.
+
+The functions accept the mesh as path of an STL file, as loaded StlMesh, as
+stl.mesh.Mesh of numpy-stl, as numpy array of triangles of shape (n, 3, 3) or
+as tuple of numpy arrays of vertices of shape (m, 3) and faces of shape
+(n, 3). The generated code is either returned as string or written into any
+file-like object, so meshes held in memory can be converted without writing
+them into a file and running the command line interface, which is a thin
+wrapper around these functions.
+
+Example:
+    import stl_2_scad
+
+    options = stl_2_scad.ConversionOptions(indexed=True, precision="float32")
+    with open("part.scad", "w", encoding="utf-8") as file_handle:
+        stl_2_scad.write_embed(file_handle, (vertices, faces), "part", options)
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import dataclasses
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+
+from stl_2_scad.mesh_cache import CachedStl
+from stl_2_scad.scad_generator import (
+    AnyBoundingBox,
+    get_bounding_box,
+    get_import_module,
+    write_embed_modules,
+    write_sidecar,
+)
+from stl_2_scad.scad_writer import FLOAT32_PRECISION, FULL_PRECISION, Precision, write_header
+from stl_2_scad.stl_helpers import StlMesh
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Meshes accepted by the functions of the API, see as_mesh() for details.
+MeshLike = Union[str, "os.PathLike[str]", StlMesh, np.ndarray, Tuple[np.ndarray, np.ndarray], Any]
+
+# Name used as file name in the comments of the generated code for meshes
+# that are not read from a file.
+MEMORY_FILE_NAME = "<memory>"
+
+
+# -----------------------------------------------------------------------------
+# Options
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ConversionOptions:
+    """Options of the generated OpenSCAD code.
+
+    The attributes correspond to the command line options of the same name.
+    The options of the mesh (indexed, tolerance, target_faces, max_error,
+    reverse_faces and repair) are only used by the embed functions and
+    write_mesh(), the split, tile and lod options only by the embed functions.
+
+    Raises ValueError for invalid options.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    precision: Precision = FULL_PRECISION
+    bbox: str = "axis"
+    indexed: bool = False
+    tolerance: float = 0.0
+    target_faces: Optional[int] = None
+    max_error: Optional[float] = None
+    reverse_faces: bool = False
+    repair: bool = False
+    split: bool = False
+    tile: Optional[int] = None
+    lod: Optional[Sequence[float]] = None
+
+    def __post_init__(self) -> None:
+        """Check the options."""
+        if self.precision not in (FULL_PRECISION, FLOAT32_PRECISION) and not (
+            isinstance(self.precision, int) and 0 <= self.precision <= 15
+        ):
+            raise ValueError(f"Invalid precision {self.precision!r}, use 'full', 'float32' or 0 to 15 decimals.")
+        if self.bbox not in ("axis", "oriented"):
+            raise ValueError(f"Invalid bounding box type {self.bbox!r}, use 'axis' or 'oriented'.")
+        if self.tolerance < 0.0:
+            raise ValueError(f"Invalid tolerance {self.tolerance!r}, it must not be negative.")
+        if self.tile is not None and self.tile < 1:
+            raise ValueError(f"Invalid number of tiles {self.tile!r}, it must be positive.")
+        if self.lod is not None and not all(0.0 < ratio < 1.0 for ratio in self.lod):
+            raise ValueError(f"Invalid levels of detail {self.lod!r}, use ratios between 0 and 1.")
+        if sum((self.split, self.tile is not None, self.lod is not None)) > 1:
+            raise ValueError("The split, tile and lod options can't be combined.")
+
+    @classmethod
+    def from_args(cls, args) -> "ConversionOptions":
+        """Create the options from the parsed command line arguments using the defaults for missing options."""
+        options: Dict[str, Any] = {
+            field.name: getattr(args, field.name) for field in dataclasses.fields(cls) if hasattr(args, field.name)
+        }
+        return cls(**options)
+
+
+# -----------------------------------------------------------------------------
+# Meshes
+# -----------------------------------------------------------------------------
+def as_mesh(mesh: MeshLike) -> StlMesh:
+    """Convert a mesh given as StlMesh, stl.mesh.Mesh, array of triangles or tuple of vertices and faces.
+
+    The triangles are used without copying them if possible. Integer
+    coordinates are converted to float64. Raises TypeError or ValueError if
+    the mesh is not supported.
+    """
+    if isinstance(mesh, StlMesh):
+        return mesh
+
+    normals = None
+    if isinstance(mesh, tuple) and len(mesh) == 2:
+        vertices, faces = (np.asarray(array) for array in mesh)
+        if vertices.ndim != 2 or vertices.shape[1] != 3 or faces.ndim != 2 or faces.shape[1] != 3:
+            raise ValueError("The vertices and faces must have the shapes (m, 3) and (n, 3).")
+        if not np.issubdtype(faces.dtype, np.integer):
+            raise ValueError("The faces must be integer indices of the vertices.")
+        if faces.size and (faces.min() < 0 or faces.max() >= len(vertices)):
+            raise ValueError(f"The face indices must be between 0 and {len(vertices) - 1}.")
+        vectors = vertices[faces]
+    elif isinstance(mesh, np.ndarray):
+        vectors = mesh.reshape(-1, 3, 3) if mesh.ndim == 2 and mesh.shape[1] == 9 else mesh
+    elif hasattr(mesh, "vectors"):
+        # stl.mesh.Mesh of numpy-stl or a similar object
+        vectors = np.asarray(mesh.vectors)
+        normals = getattr(mesh, "normals", None)
+    else:
+        raise TypeError(f"Unsupported mesh type {type(mesh).__name__}.")
+
+    if vectors.ndim != 3 or vectors.shape[1:] != (3, 3):
+        raise ValueError(f"The triangles must have the shape (n, 3, 3), not {vectors.shape}.")
+    if not np.issubdtype(vectors.dtype, np.floating):
+        vectors = vectors.astype(np.float64)
+    if normals is None or len(normals) != len(vectors):
+        normals = np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    return StlMesh(normals=np.asarray(normals), vectors=vectors)
+
+
+def _open_mesh(mesh: MeshLike) -> CachedStl:
+    """Get the access to the mesh. STL files are loaded without the mesh cache."""
+    if isinstance(mesh, CachedStl):
+        return mesh
+    if isinstance(mesh, (str, os.PathLike)):
+        return CachedStl(os.fspath(mesh), None)
+    return CachedStl(MEMORY_FILE_NAME, None, as_mesh(mesh))
+
+
+def _get_object_name(stl_file: CachedStl, name: Optional[str]) -> str:
+    """Get the name of the object, which defaults to the STL filename without the suffix."""
+    if name is not None:
+        return name
+    if stl_file.filename == MEMORY_FILE_NAME:
+        raise ValueError("The name of the object is required for meshes that are not read from a file.")
+    return Path(stl_file.filename).stem
+
+
+# -----------------------------------------------------------------------------
+# Bounds
+# -----------------------------------------------------------------------------
+def get_bounds(mesh: MeshLike, oriented: bool = False) -> AnyBoundingBox:
+    """Get the axis aligned bounding box or, if oriented is set, the oriented bounding box of the mesh."""
+    return get_bounding_box(_open_mesh(mesh), ConversionOptions(bbox="oriented" if oriented else "axis"))
+
+
+# -----------------------------------------------------------------------------
+# Import
+# -----------------------------------------------------------------------------
+def generate_import(
+    mesh: MeshLike,
+    name: Optional[str] = None,
+    import_path: Optional[str] = None,
+    options: Optional[ConversionOptions] = None,
+) -> str:
+    """Get the OpenSCAD module importing the STL file with anchoring support.
+
+    The bounding box is calculated from the mesh. The import statement uses
+    the given import_path, which is required if the mesh is not given as path
+    of the STL file.
+    """
+    stl_file = _open_mesh(mesh)
+    options = options or ConversionOptions()
+    if import_path is None:
+        if stl_file.filename == MEMORY_FILE_NAME:
+            raise ValueError("The import path is required for meshes that are not read from a file.")
+        import_path = stl_file.filename
+    return get_import_module(
+        get_bounding_box(stl_file, options), _get_object_name(stl_file, name), import_path, options.precision
+    )
+
+
+def write_import(
+    file_handle: TextIO,
+    mesh: MeshLike,
+    name: Optional[str] = None,
+    import_path: Optional[str] = None,
+    options: Optional[ConversionOptions] = None,
+) -> None:
+    """Write the OpenSCAD module importing the STL file into the file handle. See generate_import() for details."""
+    file_handle.write(generate_import(mesh, name, import_path, options))
+
+
+# -----------------------------------------------------------------------------
+# Embed
+# -----------------------------------------------------------------------------
+def write_embed(
+    file_handle: TextIO,
+    mesh: MeshLike,
+    name: Optional[str] = None,
+    options: Optional[ConversionOptions] = None,
+    sidecar_path: Optional[str] = None,
+) -> None:
+    """Write the OpenSCAD modules embedding the mesh into the file handle.
+
+    This writes the module polyhedron_<name> containing the mesh and the
+    module <name> placing it with anchoring support. If sidecar_path is
+    given, polyhedron_<name> imports the mesh file written by write_mesh()
+    from this path instead of embedding the mesh.
+    """
+    stl_file = _open_mesh(mesh)
+    object_name = _get_object_name(stl_file, name)
+    write_header(file_handle)
+    write_embed_modules(
+        file_handle, stl_file, options or ConversionOptions(), object_name, Path(stl_file.filename).name, sidecar_path
+    )
+
+
+def generate_embed(
+    mesh: MeshLike,
+    name: Optional[str] = None,
+    options: Optional[ConversionOptions] = None,
+    sidecar_path: Optional[str] = None,
+) -> str:
+    """Get the OpenSCAD modules embedding the mesh. See write_embed() for details."""
+    file_handle = io.StringIO()
+    write_embed(file_handle, mesh, name, options, sidecar_path)
+    return file_handle.getvalue()
+
+
+def write_mesh(
+    file_handle: BinaryIO, mesh: MeshLike, mesh_format: str = "stl", options: Optional[ConversionOptions] = None
+) -> None:
+    """Write the cleaned mesh as binary STL ('stl') or OFF ('off') file into the binary file handle.
+
+    The mesh is welded and decimated according to the options, and each
+    vertex and face is written only once. Raises ValueError for other formats.
+    """
+    write_sidecar(file_handle, _open_mesh(mesh), options or ConversionOptions(), mesh_format)
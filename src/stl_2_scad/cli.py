@@ -19,11 +19,16 @@ import logging
 import os
 import sys
 
-import coloredlogs
-
+import stl_2_scad.cli_command_batch
+import stl_2_scad.cli_command_build
+import stl_2_scad.cli_command_cache
+import stl_2_scad.cli_command_check
 import stl_2_scad.cli_command_dims
 import stl_2_scad.cli_command_embed
 import stl_2_scad.cli_command_import
+import stl_2_scad.cli_command_serve
+import stl_2_scad.cli_command_watch
+from stl_2_scad.profiling import run_profiled
 from stl_2_scad.settings import STL2SCAD_LOGFORMAT, STL2SCAD_VERSION
 
 # -----------------------------------------------------------------------------
@@ -52,11 +57,46 @@ def get_parser() -> argparse.ArgumentParser:
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         default=default_loglevel,
     )
+    parser.add_argument(
+        "--no-cache",
+        help="Don't use the cache of the mesh metadata. See 'stl2scad cache --help' for details.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print the wall time, CPU time and peak memory of each phase of the subcommand on stderr.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--profile-format",
+        help="Format of the profile report. Default: %(default)s",
+        choices=["table", "json"],
+        default="table",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Write the profile report into this file instead of stderr.",
+        default=None,
+    )
+    parser.add_argument(
+        "--profile-dump",
+        help="Write the cProfile statistics of the subcommand into this file, e.g., to inspect\n"
+        "it using 'python -m pstats' or snakeviz.",
+        default=None,
+    )
 
     subparsers = parser.add_subparsers()
     stl_2_scad.cli_command_dims.add_subcommand(subparsers)
     stl_2_scad.cli_command_import.add_subcommand(subparsers)
     stl_2_scad.cli_command_embed.add_subcommand(subparsers)
+    stl_2_scad.cli_command_check.add_subcommand(subparsers)
+    stl_2_scad.cli_command_batch.add_subcommand(subparsers)
+    stl_2_scad.cli_command_build.add_subcommand(subparsers)
+    stl_2_scad.cli_command_cache.add_subcommand(subparsers)
+    stl_2_scad.cli_command_serve.add_subcommand(subparsers)
+    stl_2_scad.cli_command_watch.add_subcommand(subparsers)
 
     return parser
 
@@ -66,6 +106,12 @@ def get_parser() -> argparse.ArgumentParser:
 # -----------------------------------------------------------------------------
 def main_cli() -> int:
     """The main entry point of the stl2scad command."""
+    server = os.getenv("STL2SCAD_SERVER")
+    if server and "serve" not in sys.argv[1:]:
+        returncode = stl_2_scad.cli_command_serve.forward_to_server(server, sys.argv[1:])
+        if returncode is not None:
+            return returncode
+
     parser = get_parser()
     args = parser.parse_args()
 
@@ -78,6 +124,8 @@ def main_cli() -> int:
         return 1
 
     # Setup logging
+    import coloredlogs  # pylint: disable=import-outside-toplevel
+
     log_level_styles = {
         "debug": {"color": "cyan"},
         "info": {"color": "green"},
@@ -91,4 +139,4 @@ def main_cli() -> int:
     logger.debug("Python executable: %s", sys.executable)
     logger.debug("Called as %s", sys.argv)
 
-    return args.func(args)
+    return run_profiled(args)
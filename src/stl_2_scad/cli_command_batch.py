@@ -0,0 +1,428 @@
+"""
+Module containing the subcommand 'batch' of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import argparse
+import concurrent.futures
+import glob
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from stl_2_scad.cli_command_embed import (
+    BBOX_HELP,
+    BBOX_TYPES,
+    PRECISION_HELP,
+    parse_lod_ratios,
+    parse_precision,
+    parse_tile_count,
+)
+from stl_2_scad.profiling import Profiler, get_profiler, profile_phase, use_profiler
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+DESCRIPTION = """
+stl2scad batch
+==============
+
+Generate the OpenSCAD code of the `import` or `embed` subcommand for many STL
+files at once. The inputs can be STL files, glob patterns (use `**` to match
+subdirectories) or directories, which are searched recursively for files with
+the suffix `.stl`.
+
+The files are converted in parallel using a pool of worker processes. Per
+default, one `.scad` file is written per STL file next to the STL file. Using
+the `--output-dir` option, they are written into the given directory instead.
+Using the `--library` option, the modules of all STL files are written into a
+single library file instead. The library contains the common header only once
+and the modules of the STL files in the order of the inputs, regardless of the
+order in which the workers finish.
+
+The object names are the STL filenames without the suffix, with all characters
+that are not allowed in OpenSCAD identifiers replaced by underscores. If the
+library contains several STL files with the same name, the suffixes `_2`, `_3`
+and so on are appended to the names of the later files.
+
+After all files are converted, a summary of the conversion time of each file
+and all failures is printed.
+
+Example:
+    $ stl2scad batch --mode embed --jobs 4 --library parts.scad "parts/**/*.stl"
+    Generates the file parts.scad containing the modules of all STL files
+    found in the directory parts.
+"""
+
+
+# -----------------------------------------------------------------------------
+# Argument Parser
+# -----------------------------------------------------------------------------
+def add_conversion_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments controlling the conversion of each STL file used by convert_file()."""
+    parser.add_argument(
+        "-m",
+        "--mode",
+        help="Generate the code of the 'import' or 'embed' subcommand. Default: %(default)s",
+        choices=["import", "embed"],
+        default="import",
+    )
+    parser.add_argument(
+        "-r",
+        "--reverse-faces",
+        help="If given, specify the face indices in reverse order (embed mode only).",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-i",
+        "--indexed",
+        help="Weld identical vertices and write each vertex only once (embed mode only).",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        help="Weld all vertices that fall into the same grid cell of the given size (embed mode only).",
+        type=float,
+        default=0.0,
+    )
+    parser.add_argument(
+        "-T",
+        "--target-faces",
+        help="Decimate each mesh to at most this number of faces (embed mode only).",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-e",
+        "--max-error",
+        help="Decimate each mesh by collapsing only edges whose quadric error is at most\n"
+        "this distance (embed mode only).",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "-R",
+        "--repair",
+        help="Remove degenerate and duplicate faces and orient the faces of each shell\n"
+        "consistently outwards (embed mode only).",
+        action="store_true",
+        default=False,
+    )
+    partition_group = parser.add_mutually_exclusive_group()
+    partition_group.add_argument(
+        "-S",
+        "--split",
+        help="Split each mesh into its connected parts and write the modules of each part\n"
+        "in addition to the modules of the whole object (embed mode only).",
+        action="store_true",
+        default=False,
+    )
+    partition_group.add_argument(
+        "-G",
+        "--tile",
+        help="Partition the faces of each mesh into a grid of N x N x N tiles and write a\n"
+        "module for each non-empty tile (embed mode only).",
+        metavar="N",
+        type=parse_tile_count,
+        default=None,
+    )
+    partition_group.add_argument(
+        "--lod",
+        help="Write the full mesh and the given levels of detail of each mesh, e.g., '25%%,5%%',\n"
+        "as ratios of the number of faces (embed mode only).",
+        metavar="RATIOS",
+        type=parse_lod_ratios,
+        default=None,
+    )
+    parser.add_argument(
+        "-p",
+        "--precision",
+        help=PRECISION_HELP,
+        type=parse_precision,
+        default="full",
+    )
+    parser.add_argument(
+        "-b",
+        "--bbox",
+        help=BBOX_HELP,
+        choices=BBOX_TYPES,
+        default="axis",
+    )
+
+
+def add_subcommand(subparsers: Any) -> None:
+    """Add the subcommand 'batch'."""
+    parser = subparsers.add_parser(
+        "batch",
+        help="Generate the OpenSCAD code for many STL files in parallel.",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes. Default: Number of CPUs.",
+        type=int,
+        default=os.cpu_count() or 1,
+    )
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument(
+        "-d",
+        "--output-dir",
+        help="Write the generated .scad files into this directory instead of next to the STL files.",
+        default=None,
+    )
+    output_group.add_argument(
+        "-L",
+        "--library",
+        help="Write the modules of all STL files into this single library file.",
+        default=None,
+    )
+    add_conversion_arguments(parser)
+    parser.add_argument("inputs", nargs="+", help="STL files, glob patterns or directories.")
+    parser.set_defaults(func=stl2scad_batch)
+
+
+# -----------------------------------------------------------------------------
+# Tasks
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class BatchTask:
+    """Conversion of a single STL file."""
+
+    stl: str
+    output: str
+    import_path: str
+    object_name: str
+    write_header: bool
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Result of the conversion of a single STL file."""
+
+    stl: str
+    output: str
+    seconds: float
+    error: Optional[str] = None
+    profile: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def convert_file(task: BatchTask, args) -> BatchResult:
+    """Convert a single STL file. This function is executed by the worker processes."""
+    # pylint: disable=import-outside-toplevel
+    from stl_2_scad.mesh_cache import open_stl
+    from stl_2_scad.scad_generator import get_bounding_box, get_import_module, write_embed_modules
+    from stl_2_scad.scad_writer import write_header
+
+    # The profile is collected per task, so it can be returned by the worker processes
+    profiler = Profiler() if args.profile else None
+    error: Optional[str] = None
+    start = time.perf_counter()
+    with use_profiler(profiler), profile_phase("convert"):
+        try:
+            stl_file = open_stl(task.stl, args)
+            with open(task.output, "w", encoding="utf-8") as file_handle:
+                if args.mode == "embed":
+                    if task.write_header:
+                        write_header(file_handle)
+                    write_embed_modules(file_handle, stl_file, args, task.object_name, Path(task.stl).name)
+                else:
+                    file_handle.write(
+                        get_import_module(
+                            get_bounding_box(stl_file, args), task.object_name, task.import_path, args.precision
+                        )
+                    )
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            error = str(exception)
+    profile = profiler.to_dict() if profiler is not None else None
+    return BatchResult(task.stl, task.output, time.perf_counter() - start, error, profile)
+
+
+def merge_profile(result: BatchResult) -> None:
+    """Add the profile of the result to the profiler of this process, if profiling is enabled."""
+    profiler = get_profiler()
+    if profiler is not None and result.profile is not None:
+        profiler.merge(result.profile)
+
+
+def run_tasks(tasks: List[BatchTask], args) -> List[BatchResult]:
+    """Run the tasks using a pool of args.jobs worker processes and return the results in the order of the tasks."""
+    if args.jobs <= 1 or len(tasks) <= 1:
+        results = [convert_file(task, args) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks))) as executor:
+            futures = [executor.submit(convert_file, task, args) for task in tasks]
+            results = [future.result() for future in futures]
+
+    for result in results:
+        merge_profile(result)
+    return results
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def find_stl_files(inputs: List[str]) -> List[str]:
+    """Find all STL files given as files, glob patterns or directories.
+
+    The files are returned in a deterministic order and without duplicates.
+    """
+    stl_files: List[str] = []
+    known_files = set()
+    for entry in inputs:
+        if os.path.isdir(entry):
+            matches = sorted(str(path) for path in Path(entry).rglob("*") if path.suffix.lower() == ".stl")
+        elif os.path.isfile(entry):
+            matches = [entry]
+        else:
+            matches = sorted(path for path in glob.glob(entry, recursive=True) if os.path.isfile(path))
+        for match in matches:
+            if match not in known_files:
+                known_files.add(match)
+                stl_files.append(match)
+    return stl_files
+
+
+def sanitize_object_name(name: str) -> str:
+    """Turn the name into a valid OpenSCAD identifier by replacing all invalid characters by underscores."""
+    name = re.sub(r"[^A-Za-z0-9_]", "_", name)
+    return f"_{name}" if not name or name[0].isdigit() else name
+
+
+def get_object_names(stl_files: List[str]) -> List[str]:
+    """Get a unique object name for each STL file.
+
+    The object name is the sanitized filename without the suffix. If several
+    STL files result in the same name, the second one gets the suffix _2, the
+    third one _3 and so on, skipping all names that are already taken.
+    """
+    names = [sanitize_object_name(Path(stl_file).stem) for stl_file in stl_files]
+    taken_names = set(names)
+    unique_names: List[str] = []
+    known_names: Set[str] = set()
+    for name in names:
+        unique_name = name
+        counter = 1
+        # Don't use the name of another STL file like part_2.stl as suffixed name.
+        while unique_name in known_names or (unique_name != name and unique_name in taken_names):
+            counter += 1
+            unique_name = f"{name}_{counter}"
+        known_names.add(unique_name)
+        unique_names.append(unique_name)
+    return unique_names
+
+
+def print_summary(results: List[BatchResult], total_seconds: float) -> None:
+    """Print the conversion times and failures."""
+    width = max(len(result.stl) for result in results)
+    print(f"{'STL file':<{width}}  {'Time [s]':>9}  Status")
+    for result in results:
+        status = "OK" if result.error is None else "FAILED"
+        print(f"{result.stl:<{width}}  {result.seconds:>9.3f}  {status}")
+
+    failures = [result for result in results if result.error is not None]
+    print(f"\nConverted {len(results) - len(failures)} of {len(results)} files in {total_seconds:.3f} s.")
+    for result in failures:
+        print(f"Failed to convert {result.stl}: {result.error}")
+
+
+# -----------------------------------------------------------------------------
+# Command
+# -----------------------------------------------------------------------------
+def stl2scad_batch(args) -> int:
+    """Generate the OpenSCAD code for many STL files in parallel."""
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing command stl2scad batch")
+
+    stl_files = find_stl_files(args.inputs)
+    if not stl_files:
+        logger.critical("No STL files found.")
+        return 1
+    logger.debug("Found %d STL files.", len(stl_files))
+
+    start = time.perf_counter()
+    results = convert_library(stl_files, args) if args.library is not None else convert_files(stl_files, args)
+    if results is None:
+        return 1
+
+    print_summary(results, time.perf_counter() - start)
+    return 0 if all(result.error is None for result in results) else 1
+
+
+def convert_files(stl_files: List[str], args) -> Optional[List[BatchResult]]:
+    """Convert each STL file into its own .scad file."""
+    logger = logging.getLogger(__name__)
+    tasks: List[BatchTask] = []
+    stl_of_output: Dict[str, str] = {}
+    for stl_file in stl_files:
+        output_dir = args.output_dir if args.output_dir is not None else os.path.dirname(stl_file)
+        output = os.path.join(output_dir, Path(stl_file).stem + ".scad")
+        if output in stl_of_output:
+            logger.critical(
+                "The STL files %s and %s result in the same output file %s.", stl_of_output[output], stl_file, output
+            )
+            return None
+        stl_of_output[output] = stl_file
+        import_path = Path(os.path.relpath(stl_file, output_dir or ".")).as_posix()
+        tasks.append(
+            BatchTask(stl_file, output, import_path, sanitize_object_name(Path(stl_file).stem), write_header=True)
+        )
+
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+    return run_tasks(tasks, args)
+
+
+def convert_library(stl_files: List[str], args) -> List[BatchResult]:
+    """Convert all STL files into a single library file.
+
+    The modules of each STL file are generated into a temporary file by the
+    workers and concatenated afterwards in the order of the STL files.
+    """
+    from stl_2_scad.scad_writer import write_header  # pylint: disable=import-outside-toplevel
+
+    logger = logging.getLogger(__name__)
+    library_dir = os.path.dirname(args.library) or "."
+    with tempfile.TemporaryDirectory(prefix="stl2scad-") as temp_dir:
+        tasks = [
+            BatchTask(
+                stl_file,
+                os.path.join(temp_dir, f"{index}.scad"),
+                Path(os.path.relpath(stl_file, library_dir)).as_posix(),
+                object_name,
+                write_header=False,
+            )
+            for index, (stl_file, object_name) in enumerate(zip(stl_files, get_object_names(stl_files)))
+        ]
+        results = run_tasks(tasks, args)
+
+        logger.info("Writing library to file %s.", args.library)
+        with open(args.library, "w", encoding="utf-8") as file_handle:
+            write_header(file_handle)
+            for result in results:
+                if result.error is None:
+                    with open(result.output, "r", encoding="utf-8") as module_handle:
+                        shutil.copyfileobj(module_handle, file_handle)
+
+    return [BatchResult(result.stl, args.library, result.seconds, result.error) for result in results]
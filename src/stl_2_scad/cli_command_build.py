@@ -0,0 +1,389 @@
+"""
+Module containing the subcommand 'build' of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from stl_2_scad.cli_command_batch import BatchResult, print_summary
+from stl_2_scad.cli_command_serve import init_worker, run_request
+from stl_2_scad.cli_command_watch import get_content_hash
+from stl_2_scad.settings import STL2SCAD_VERSION
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+DESCRIPTION = """
+stl2scad build
+==============
+
+Generate the OpenSCAD code of the `import` or `embed` subcommand for all
+items of a manifest, regenerating only the outputs that are out of date.
+
+The manifest is a TOML file (reading TOML requires Python 3.11 or the tomli
+package) or a JSON file with the same structure, e.g.:
+
+    [defaults]
+    precision = "float32"
+
+    [[items]]
+    stl = "parts/bracket.stl"
+    output = "scad/bracket.scad"
+    name = "Bracket"
+    reverse-faces = true
+
+    [[items]]
+    stl = "parts/base.stl"
+    mode = "import"
+
+Each item requires the key `stl`. The key `output` defaults to the STL file
+with the suffix `.scad` and the key `mode` to `embed`. All other keys are the
+long options of the `embed` or `import` subcommand: `true` adds the option,
+`false` omits it, lists are joined by commas and all other values are passed
+as its argument. The options of the table `defaults` apply to all items.
+Relative paths are relative to the directory of the manifest.
+
+An output is out of date if it doesn't exist or was modified, if the STL file
+or the options of the item changed or if another version of stl2scad is
+used. The state of the last build is stored in the lock file
+`<manifest>.lock`. The STL files are compared by their size and modification
+time and only hashed if these changed, so checking a manifest without changes
+takes only a few milliseconds per thousand items.
+
+The outputs that are out of date are generated in parallel by a pool of
+worker processes, which keep the recently used STL files loaded like the
+`serve` subcommand. Afterwards, a summary of the generated outputs is printed
+and the lock file is updated.
+
+Example:
+    $ stl2scad build --jobs 4 parts.toml
+    Generates the outputs of all items of parts.toml that are out of date.
+"""
+
+# Format version of the lock file. Lock files of other versions are ignored.
+LOCK_FORMAT_VERSION = 1
+
+# Top-level keys of the manifest.
+MANIFEST_KEYS = ["defaults", "items"]
+
+# Modes of the items, i.e., the subcommands generating the outputs.
+BUILD_MODES = ["embed", "import"]
+
+# Number of STL files kept loaded by each worker process.
+WORKER_MAX_MESHES = 8
+
+
+# -----------------------------------------------------------------------------
+# Argument Parser
+# -----------------------------------------------------------------------------
+def add_subcommand(subparsers: Any) -> None:
+    """Add the subcommand 'build'."""
+    parser = subparsers.add_parser(
+        "build",
+        help="Generate the OpenSCAD code of the items of a manifest that are out of date.",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes. Default: Number of CPUs.",
+        type=int,
+        default=os.cpu_count() or 1,
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        help="Generate all outputs, even if they are up to date.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        help="Only print the outputs that are out of date.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--lock-file",
+        help="Path of the lock file storing the state of the last build. Default: <manifest>.lock",
+        default=None,
+    )
+    parser.add_argument("manifest", help="TOML or JSON manifest.")
+    parser.set_defaults(func=stl2scad_build, local_only=True)
+
+
+# -----------------------------------------------------------------------------
+# Manifest
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class BuildItem:
+    """Item of the manifest. The paths are relative to the directory of the manifest."""
+
+    stl: str
+    output: str
+    mode: str
+    argv: List[str]
+    options_hash: str
+
+
+def load_manifest(filename: str) -> Dict[str, Any]:
+    """Load the TOML or JSON manifest. Raises ValueError if it can't be read."""
+    # pylint: disable=import-outside-toplevel
+    try:
+        if not filename.endswith(".toml"):
+            with open(filename, "r", encoding="utf-8") as file_handle:
+                manifest = json.load(file_handle)
+        else:
+            if sys.version_info >= (3, 11):
+                import tomllib
+            else:
+                try:
+                    import tomli as tomllib
+                except ImportError as exception:
+                    raise ValueError("Reading TOML manifests requires Python 3.11 or the tomli package.") from exception
+            with open(filename, "rb") as binary_handle:
+                manifest = tomllib.load(binary_handle)
+    except (OSError, ValueError) as exception:
+        raise ValueError(f"Can't read the manifest {filename}: {exception}") from exception
+
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("items"), list):
+        raise ValueError(f"The manifest {filename} must contain a list of items.")
+    if not isinstance(manifest.get("defaults", {}), dict):
+        raise ValueError(f"The defaults of the manifest {filename} must be a table of options.")
+    unknown_keys = sorted(set(manifest) - set(MANIFEST_KEYS))
+    if unknown_keys:
+        raise ValueError(f"Unknown keys {', '.join(unknown_keys)} in the manifest {filename}.")
+    return manifest
+
+
+def get_option_argv(options: Dict[str, Any]) -> List[str]:
+    """Get the command line options of the given options in the order of their names."""
+    argv = []
+    for key, value in sorted(options.items()):
+        option = "--" + key.replace("_", "-")
+        if value is True:
+            argv.append(option)
+        elif isinstance(value, list):
+            argv += [option, ",".join(str(entry) for entry in value)]
+        elif value is not False and value is not None:
+            argv += [option, str(value)]
+    return argv
+
+
+def get_items(manifest: Dict[str, Any], base_dir: str) -> List[BuildItem]:
+    """Get the items of the manifest in the directory base_dir. Raises ValueError for invalid items."""
+    defaults = manifest.get("defaults", {})
+    items: List[BuildItem] = []
+    outputs = set()
+    for index, entry in enumerate(manifest["items"], start=1):
+        if not isinstance(entry, dict) or not isinstance(entry.get("stl"), str):
+            raise ValueError(f"Item {index} of the manifest has no STL file.")
+        options = {**defaults, **entry}
+        stl = options.pop("stl")
+        output = os.path.normpath(str(options.pop("output", os.path.splitext(stl)[0] + ".scad")))
+        mode = options.pop("mode", "embed")
+        if mode not in BUILD_MODES:
+            raise ValueError(f"Invalid mode {mode!r} of item {index}, use one of {', '.join(BUILD_MODES)}.")
+        if output in outputs:
+            raise ValueError(f"The output {output} is generated by several items.")
+        outputs.add(output)
+
+        # The subcommands are executed in the directory of the output, so the path of the STL
+        # file in the code of the import subcommand is relative to the output. This subcommand
+        # writes to stdout, so its output is written by build_item().
+        stl_arg = (
+            stl
+            if os.path.isabs(stl)
+            else os.path.relpath(os.path.join(base_dir, stl), os.path.join(base_dir, os.path.dirname(output)))
+        )
+        output_argv = ["--output", os.path.basename(output)] if mode == "embed" else []
+        argv = [mode, *get_option_argv(options), *output_argv, stl_arg]
+        options_hash = hashlib.blake2b(json.dumps(argv).encode("utf-8"), digest_size=16).hexdigest()
+        items.append(BuildItem(stl, output, mode, argv, options_hash))
+    return items
+
+
+# -----------------------------------------------------------------------------
+# Lock File
+# -----------------------------------------------------------------------------
+def get_file_stat(filename: str) -> Optional[List[int]]:
+    """Get the size and modification time of the file or None if it doesn't exist."""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_lock_file(filename: str) -> Dict[str, Dict[str, Any]]:
+    """Load the state of the outputs of the last build. Returns an empty state if it was built by another version."""
+    try:
+        with open(filename, "r", encoding="utf-8") as file_handle:
+            lock = json.load(file_handle)
+    except (OSError, ValueError):
+        return {}
+    if lock.get("format") != LOCK_FORMAT_VERSION or lock.get("version") != STL2SCAD_VERSION:
+        return {}
+    return dict(lock.get("outputs", {}))
+
+
+def write_lock_file(filename: str, outputs: Dict[str, Dict[str, Any]]) -> None:
+    """Write the state of the outputs atomically."""
+    temp_name = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_name, "w", encoding="utf-8") as file_handle:
+        json.dump(
+            {"format": LOCK_FORMAT_VERSION, "version": STL2SCAD_VERSION, "outputs": outputs},
+            file_handle,
+            indent=1,
+            sort_keys=True,
+        )
+        file_handle.write("\n")
+    os.replace(temp_name, filename)
+
+
+def get_up_to_date_state(item: BuildItem, state: Optional[Dict[str, Any]], base_dir: str) -> Optional[Dict[str, Any]]:
+    """Get the state of the output of the item if it is up to date according to its state of the last build.
+
+    The STL file is only hashed if its size or modification time changed. If
+    the content is still the same, the state with the new values is returned.
+    Returns None if the output is out of date.
+    """
+    if state is None or state.get("options") != item.options_hash:
+        return None
+    if get_file_stat(os.path.join(base_dir, item.output)) != state.get("output_stat"):
+        return None
+
+    stl_path = os.path.join(base_dir, item.stl)
+    stl_stat = get_file_stat(stl_path)
+    if stl_stat is None:
+        return None
+    if stl_stat != state.get("stl_stat"):
+        if get_content_hash(stl_path).hex() != state.get("stl_hash"):
+            return None
+        return {**state, "stl_stat": stl_stat}
+    return state
+
+
+# -----------------------------------------------------------------------------
+# Build
+# -----------------------------------------------------------------------------
+def build_item(item: BuildItem, global_argv: List[str], base_dir: str) -> Tuple[BatchResult, Optional[Dict[str, Any]]]:
+    """Generate the output of the item. This function is executed by the worker processes.
+
+    Returns the result and the new state of the output, which is None if the
+    generation failed.
+    """
+    start = time.perf_counter()
+    stl_path = os.path.join(base_dir, item.stl)
+    stl_stat = get_file_stat(stl_path)
+    if stl_stat is None:
+        return BatchResult(item.stl, item.output, time.perf_counter() - start, "File not found."), None
+    # The STL file is hashed before the conversion, so changes during the conversion trigger another build
+    stl_hash = get_content_hash(stl_path).hex()
+
+    output_path = os.path.join(base_dir, item.output)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    response = run_request(global_argv + item.argv, os.path.dirname(output_path))
+    if response["returncode"] != 0:
+        messages = response["stderr"].strip().splitlines()
+        error = messages[-1] if messages else f"Return code {response['returncode']}."
+        return BatchResult(item.stl, item.output, time.perf_counter() - start, error), None
+    if item.mode == "import":
+        with open(output_path, "w", encoding="utf-8") as file_handle:
+            file_handle.write(response["stdout"])
+
+    state = {
+        "stl": item.stl,
+        "options": item.options_hash,
+        "stl_stat": stl_stat,
+        "stl_hash": stl_hash,
+        "output_stat": get_file_stat(output_path),
+    }
+    return BatchResult(item.stl, item.output, time.perf_counter() - start), state
+
+
+def build_items(
+    items: List[BuildItem], global_argv: List[str], base_dir: str, jobs: int
+) -> List[Tuple[BatchResult, Optional[Dict[str, Any]]]]:
+    """Generate the outputs of the items using a pool of worker processes and return the results in their order."""
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max(min(jobs, len(items)), 1), initializer=init_worker, initargs=(WORKER_MAX_MESHES,)
+    ) as executor:
+        futures = [executor.submit(build_item, item, global_argv, base_dir) for item in items]
+        return [future.result() for future in futures]
+
+
+# -----------------------------------------------------------------------------
+# Command
+# -----------------------------------------------------------------------------
+def stl2scad_build(args) -> int:
+    """Generate the OpenSCAD code of the items of the manifest that are out of date."""
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing command stl2scad build")
+
+    start = time.perf_counter()
+    base_dir = os.path.dirname(os.path.abspath(args.manifest))
+    try:
+        items = get_items(load_manifest(args.manifest), base_dir)
+    except ValueError as exception:
+        logger.critical("%s", exception)
+        return 1
+
+    lock_file = args.lock_file if args.lock_file is not None else f"{args.manifest}.lock"
+    old_outputs = {} if args.force else load_lock_file(lock_file)
+    outputs: Dict[str, Dict[str, Any]] = {}
+    stale_items: List[BuildItem] = []
+    for item in items:
+        state = get_up_to_date_state(item, old_outputs.get(item.output), base_dir)
+        if state is not None:
+            outputs[item.output] = state
+        else:
+            stale_items.append(item)
+    logger.info(
+        "Checked %d items in %.3f s, %d outputs are out of date.",
+        len(items),
+        time.perf_counter() - start,
+        len(stale_items),
+    )
+
+    if args.dry_run:
+        for item in stale_items:
+            print(item.output)
+        return 0
+
+    results: List[BatchResult] = []
+    if stale_items:
+        global_argv = ["--loglevel", args.loglevel] + (["--no-cache"] if args.no_cache else [])
+        for result, state in build_items(stale_items, global_argv, base_dir, args.jobs):
+            results.append(result)
+            if state is not None:
+                outputs[result.output] = state
+        print_summary(results, time.perf_counter() - start)
+    else:
+        print(f"All {len(items)} outputs are up to date.")
+
+    if outputs != old_outputs:
+        write_lock_file(lock_file, outputs)
+    return 0 if all(result.error is None for result in results) else 1
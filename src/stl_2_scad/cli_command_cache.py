@@ -0,0 +1,85 @@
+"""
+Module containing the subcommand 'cache' of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import argparse
+import logging
+from typing import Any
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+DESCRIPTION = """
+stl2scad cache
+==============
+
+Manage the cache of the mesh metadata. The cache stores the bounding box,
+the number of triangles and the welded vertices and faces of each STL file,
+so unchanged STL files don't have to be parsed again. The entries are
+identified by the path, size and modification time of the STL file.
+
+The cache is stored in the directory given by the environment variable
+STL2SCAD_CACHE_DIR (default: ~/.cache/stl2scad). Its size is limited to
+STL2SCAD_CACHE_SIZE_MB megabytes (default: 1024). If the limit is exceeded,
+the least recently used entries are removed.
+
+To disable the cache for a single call, use the `--no-cache` option.
+
+Actions:
+    info   Print the location, number of entries and size of the cache.
+    clear  Remove all entries of the cache.
+
+Example:
+    $ stl2scad cache clear
+"""
+
+
+# -----------------------------------------------------------------------------
+# Argument Parser
+# -----------------------------------------------------------------------------
+def add_subcommand(subparsers: Any) -> None:
+    """Add the subcommand 'cache'."""
+    parser = subparsers.add_parser(
+        "cache",
+        help="Manage the cache of the mesh metadata.",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("action", help="Action to perform.", choices=["info", "clear"])
+    parser.set_defaults(func=stl2scad_cache)
+
+
+# -----------------------------------------------------------------------------
+# Command
+# -----------------------------------------------------------------------------
+def stl2scad_cache(args) -> int:
+    """Manage the cache of the mesh metadata."""
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing command stl2scad cache")
+
+    from stl_2_scad.mesh_cache import MeshCache  # pylint: disable=import-outside-toplevel
+
+    cache = MeshCache()
+    if args.action == "clear":
+        num_entries = cache.clear()
+        print(f"Removed {num_entries} entries from the cache {cache.directory}.")
+    else:
+        entries = cache.get_entries()
+        total_size = sum(size for _, size in entries)
+        print(f"Cache directory: {cache.directory}")
+        print(f"Entries:         {len(entries)}")
+        print(f"Size:            {total_size / (1 << 20):.1f} MB of {cache.max_size / (1 << 20):.1f} MB")
+
+    return 0
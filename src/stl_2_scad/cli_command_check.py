@@ -0,0 +1,125 @@
+"""
+Module containing the subcommand 'check' of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import argparse
+import dataclasses
+import logging
+import time
+from typing import Any
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+DESCRIPTION = """
+stl2scad check
+==============
+
+Check STL files for defects that make the rendering of OpenSCAD fail or slow.
+The identical vertices of each STL file are welded, or all vertices in the
+same grid cell if the `--tolerance` option is given, and the following
+defects are counted:
+
+  - Degenerate faces:      Faces with (almost) zero area.
+  - Duplicate faces:       Faces using the same vertices as another face.
+  - Inconsistent edges:    Edges of two faces with different winding order.
+  - Boundary edges:        Edges of only one face, i.e., the edges of holes.
+  - Non-manifold edges:    Edges of more than two faces.
+  - Inverted shells:       Closed shells oriented inwards (or cavities
+                           oriented outwards).
+  - Non-orientable shells: Shells without a consistent winding order, e.g.,
+                           Moebius strips.
+
+The shells are the sets of faces connected by edges of exactly two faces.
+All defects except the boundary edges, non-manifold edges and non-orientable
+shells are fixed by the `--repair` option of the `embed` subcommand.
+
+The command returns 1 if any STL file has defects.
+
+Example:
+    $ stl2scad check test/data/example_cube.stl
+    test/data/example_cube.stl:
+        Vertices:              8
+        Faces:                 12
+        Degenerate faces:      0
+        Duplicate faces:       0
+        Inconsistent edges:    0
+        Boundary edges:        0
+        Non-manifold edges:    0
+        Shells:                1
+        Inverted shells:       0
+        Non-orientable shells: 0
+"""
+
+
+# -----------------------------------------------------------------------------
+# Argument Parser
+# -----------------------------------------------------------------------------
+def add_subcommand(subparsers: Any) -> None:
+    """Add the subcommand 'check'."""
+    parser = subparsers.add_parser(
+        "check",
+        help="Check STL files for defects like holes and inconsistent winding order.",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        help="Weld all vertices that fall into the same grid cell of the given size.\n"
+        "Default: Weld only identical vertices.",
+        type=float,
+        default=0.0,
+    )
+    parser.add_argument("stl", nargs="+", help="STL files.")
+    parser.set_defaults(func=stl2scad_check)
+
+
+# -----------------------------------------------------------------------------
+# Command
+# -----------------------------------------------------------------------------
+def stl2scad_check(args) -> int:
+    """Check the STL files for defects and print the number of defects of each file."""
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing command stl2scad check")
+
+    # pylint: disable=import-outside-toplevel
+    from stl_2_scad.mesh_cache import open_stl
+    from stl_2_scad.mesh_repair import check_mesh
+    from stl_2_scad.profiling import profile_phase
+
+    returncode = 0
+    for filename in args.stl:
+        try:
+            stl_file = open_stl(filename, args)
+        except FileNotFoundError:
+            logger.critical("File %s not found.", filename)
+            returncode = 1
+            continue
+
+        vertices, faces = stl_file.get_welded(args.tolerance)
+        start = time.perf_counter()
+        with profile_phase("check"):
+            defects = check_mesh(vertices, faces)
+        logger.info("Checked file %s in %.3f s.", filename, time.perf_counter() - start)
+
+        print(f"{filename}:")
+        for field in dataclasses.fields(defects):
+            label = field.name.replace("non_", "non-").replace("_", " ").capitalize() + ":"
+            print(f"    {label:<22} {getattr(defects, field.name)}")
+        if defects.has_defects():
+            returncode = 1
+
+    return returncode
@@ -18,10 +18,6 @@ import argparse
 import logging
 from typing import Any
 
-import stl
-
-from stl_2_scad.stl_helpers import get_stl_bounding_box
-
 # -----------------------------------------------------------------------------
 # Module Variables
 # -----------------------------------------------------------------------------
@@ -62,16 +58,18 @@ def stl2scad_dims(args) -> int:
     logger = logging.getLogger(__name__)
     logger.debug("Executing command stl2scad dims")
 
-    logger.debug("Loading file %s", args.stl)
+    # pylint: disable=import-outside-toplevel
+    from stl_2_scad.mesh_cache import open_stl
+
     try:
-        mesh = stl.mesh.Mesh.from_file(args.stl)
+        stl_file = open_stl(args.stl, args)
     except FileNotFoundError:
         logger.critical("File %s not found.", args.stl)
         return 1
 
-    bbox = get_stl_bounding_box(mesh)
-    print(f"X: {bbox[0]} - {bbox[3]}")
-    print(f"Y: {bbox[1]} - {bbox[4]}")
-    print(f"Z: {bbox[2]} - {bbox[5]}")
+    bbox = stl_file.get_bounding_box()
+    print(f"X: {bbox.min_point[0]} - {bbox.max_point[0]}")
+    print(f"Y: {bbox.min_point[1]} - {bbox.max_point[1]}")
+    print(f"Z: {bbox.min_point[2]} - {bbox.max_point[2]}")
 
     return 0
@@ -16,13 +16,9 @@ Copyright:
 # -----------------------------------------------------------------------------
 import argparse
 import logging
+import os
 from pathlib import Path
-from typing import Any
-
-import stl
-
-from stl_2_scad.settings import STL2SCAD_VERSION
-from stl_2_scad.stl_helpers import get_stl_bounding_box
+from typing import Any, List, Optional, Union
 
 # -----------------------------------------------------------------------------
 # Module Variables
@@ -39,8 +35,73 @@ specify an anchor called `<object>`.
 The name of the object is the STL filename without the suffix, but it can be
 overwritten using the `--name` option.
 
+Per default, each triangle is written with its own three vertices. Using the
+`--indexed` option, identical vertices are welded and written only once,
+which reduces the size of the generated code to about a third. Vertices that
+differ only slightly can be welded using the `--tolerance` option.
+
+The coordinates are written with their exact value per default. Using the
+`--precision` option, they are written as the shortest number that gives the
+same float32 value, or rounded to the given number of decimals, which reduces
+the size of the generated code considerably.
+
+The module `<object>` places the STL object using its axis aligned bounding
+box per default. Using the `--bbox oriented` option, the oriented bounding box
+with approximately the minimum volume is used instead, and the STL object is
+rotated into the frame of this box.
+
+Meshes with defects can make the rendering of OpenSCAD fail or slow. The
+`--repair` option removes degenerate faces and faces using the same vertices
+as another face, makes the winding order of the faces consistent within each
+shell and orients each closed shell outwards, or inwards for cavities. Holes
+and non-manifold edges are only reported. See `stl2scad check --help` for
+checking meshes without converting them.
+
+Large meshes can be simplified before they are embedded using the
+`--target-faces` and `--max-error` options. The welded mesh is decimated by
+collapsing the edges with the smallest quadric error until the number of
+faces reaches the given target or the error of the next collapse exceeds the
+given maximum distance. Both options imply `--indexed`.
+
+Meshes consisting of several separate parts, e.g., ASCII STL files with
+several solids, can be split into their connected parts using the `--split`
+option. Each part i gets the modules `polyhedron_<object>_part<i>` and
+`<object>_part<i>`, which places the part using its own bounding box. The
+module `polyhedron_<object>` combines all parts and `<object>` places them
+using the bounding box of the whole mesh as usual.
+
+Huge meshes can be partitioned into a grid of N x N x N tiles using the
+`--tile N` option. Each face is assigned to the tile containing its centroid,
+and each non-empty tile (x, y, z) gets the module
+`polyhedron_<object>_tile_<x>_<y>_<z>`. The modules `polyhedron_<object>` and
+`<object>` accept the optional argument `clip = [min_point, max_point]`,
+given in the coordinates of the STL file, to instantiate only the tiles
+whose bounds overlap this box, e.g., to intersect the object with a small
+region without rendering the whole mesh. The tiles are open surfaces, so
+they are meant for previews and such intersections.
+
+Previews and renderings often need very different numbers of faces. Using
+the `--lod` option, e.g., `--lod 25%,5%`, the full mesh and the given levels
+of detail are written as the modules `polyhedron_<object>_lod<i>`, where
+level 0 is the full mesh. Each level is decimated from the full mesh like
+with the `--target-faces` option, in parallel by worker processes sharing the
+mesh in shared memory. The modules `polyhedron_<object>` and `<object>`
+accept the optional argument `lod` to select the level, which defaults to
+the coarsest level for previews and to the full mesh for renderings.
+
 The OpenSCAD code is printed on stdout per default, unless the `--output`
-option is used to write it into a file instead.
+option is used to write it into a file instead. The code is written by a
+separate thread, so the formatting overlaps with slow file systems, and the
+throughput is logged. Using the `--archive` option, the code is written
+compressed into a .gz file, or .zst file if the zstandard package is
+installed, as well, e.g., to archive the generated code.
+
+For big meshes, OpenSCAD parses a polyhedron much slower than a binary mesh
+file. Using the `--format` option, the welded mesh without duplicate faces is
+written into a binary STL or OFF sidecar file instead, and the module
+`polyhedron_<object>` imports this file. The sidecar file is written next to
+the output file as `<object>_embedded.<format>` unless the `--sidecar` option
+specifies another path.
 
 Example:
     $ stl2scad embed --name MyCube --output mycube.scad test/data/example_cube.stl
@@ -48,6 +109,29 @@ Example:
     `polyhedron_MyCube()` and `MyCube()`.
 """
 
+# Formats of the sidecar files supported by the mesh writer.
+MESH_FORMATS = ["stl", "off"]
+
+# Types of the bounding box used to place the object and the help text of the
+# --bbox option shared by the subcommands.
+BBOX_TYPES = ["axis", "oriented"]
+BBOX_HELP = (
+    "Place the object using its axis aligned bounding box ('axis') or its oriented\n"
+    "bounding box ('oriented'). The oriented bounding box is calculated from the\n"
+    "convex hull and the object is rotated into its frame. For meshes with more than\n"
+    "4096 vertices, the orientation is taken from the hull of one vertex per cell of a\n"
+    "24x24x24 grid, so it is an approximation, but the box always encloses all vertices.\n"
+    "Default: %(default)s"
+)
+
+# Help text of the --precision option shared by the subcommands.
+PRECISION_HELP = (
+    "Precision of the coordinates: 'full' writes the exact value of each coordinate,\n"
+    "'float32' the shortest number that is read back as the same float32 value and\n"
+    "an integer N the coordinate rounded to N decimals. Except for 'full', trailing\n"
+    "zeros are dropped. Default: %(default)s"
+)
+
 
 # -----------------------------------------------------------------------------
 # Argument Parser
@@ -67,6 +151,71 @@ def add_subcommand(subparsers: Any) -> None:
         action="store_true",
         default=False,
     )
+    parser.add_argument(
+        "-i",
+        "--indexed",
+        help="Weld identical vertices and write each vertex only once. This reduces the size\n"
+        "of the generated code to about a third.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        help="Weld all vertices that fall into the same grid cell of the given size.\n"
+        "Implies --indexed. Default: Weld only identical vertices.",
+        type=float,
+        default=0.0,
+    )
+    parser.add_argument(
+        "-T",
+        "--target-faces",
+        help="Decimate the mesh to at most this number of faces. Implies --indexed.",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-e",
+        "--max-error",
+        help="Decimate the mesh by collapsing only edges whose quadric error, given as a\n"
+        "distance, is at most this value. Implies --indexed.",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "-R",
+        "--repair",
+        help="Remove degenerate and duplicate faces and orient the faces of each shell\n"
+        "consistently outwards. Implies --indexed.",
+        action="store_true",
+        default=False,
+    )
+    partition_group = parser.add_mutually_exclusive_group()
+    partition_group.add_argument(
+        "-S",
+        "--split",
+        help="Split the mesh into its connected parts and write the modules of each part in\n"
+        "addition to the modules of the whole object. Implies --indexed.",
+        action="store_true",
+        default=False,
+    )
+    partition_group.add_argument(
+        "-G",
+        "--tile",
+        help="Partition the faces into a grid of N x N x N tiles and write a module for each\n"
+        "non-empty tile. Implies --indexed.",
+        metavar="N",
+        type=parse_tile_count,
+        default=None,
+    )
+    partition_group.add_argument(
+        "--lod",
+        help="Write the full mesh and the given levels of detail, e.g., '25%%,5%%' or '0.25,0.05',\n"
+        "as ratios of the number of faces. Implies --indexed.",
+        metavar="RATIOS",
+        type=parse_lod_ratios,
+        default=None,
+    )
     parser.add_argument(
         "-n",
         "--name",
@@ -79,88 +228,134 @@ def add_subcommand(subparsers: Any) -> None:
         help="Write the generated OpenSCAD code into the specified file instead of printing it on stdout.",
         default=None,
     )
+    parser.add_argument(
+        "-a",
+        "--archive",
+        help="Write the generated OpenSCAD code compressed into the specified .gz or .zst file\n"
+        "in addition to the output. Writing .zst files requires the zstandard package.",
+        default=None,
+    )
+    parser.add_argument(
+        "-p",
+        "--precision",
+        help=PRECISION_HELP,
+        type=parse_precision,
+        default="full",
+    )
+    parser.add_argument(
+        "-b",
+        "--bbox",
+        help=BBOX_HELP,
+        choices=BBOX_TYPES,
+        default="axis",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="Embed the mesh as polyhedron ('scad') or write it into a sidecar file of the given\n"
+        "format that is imported by the generated code. Default: %(default)s",
+        choices=["scad"] + MESH_FORMATS,
+        default="scad",
+    )
+    parser.add_argument(
+        "-s",
+        "--sidecar",
+        help="Path of the sidecar file. Default: <object>_embedded.<format> next to the output file.",
+        default=None,
+    )
     parser.add_argument("stl", help="STL file.")
     parser.set_defaults(func=stl2scad_embed)
 
 
+def parse_precision(value: str) -> Union[str, int]:
+    """Parse the argument of the --precision option."""
+    if value in ("full", "float32"):
+        return value
+    try:
+        decimals = int(value)
+    except ValueError:
+        decimals = -1
+    if not 0 <= decimals <= 15:
+        raise argparse.ArgumentTypeError(f"invalid precision {value!r}, use 'full', 'float32' or 0 to 15 decimals")
+    return decimals
+
+
+def parse_tile_count(value: str) -> int:
+    """Parse the argument of the --tile option."""
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"invalid number of tiles {value!r}, use a positive integer")
+    return count
+
+
+def parse_lod_ratios(value: str) -> List[float]:
+    """Parse the argument of the --lod option."""
+    ratios = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        try:
+            ratio = float(entry[:-1]) / 100 if entry.endswith("%") else float(entry)
+        except ValueError:
+            ratio = 0.0
+        if not 0.0 < ratio < 1.0:
+            raise argparse.ArgumentTypeError(f"invalid level of detail {entry!r}, use a ratio between 0 and 1 or 100%")
+        ratios.append(ratio)
+    return ratios
+
+
 # -----------------------------------------------------------------------------
 # Command
 # -----------------------------------------------------------------------------
 def stl2scad_embed(args) -> int:
     """Generate an OpenSCAD module that embeds the given STL object."""
+    # pylint: disable=too-many-locals
     logger = logging.getLogger(__name__)
     logger.debug("Executing command stl2scad embed")
 
-    logger.debug("Loading file %s", args.stl)
+    # pylint: disable=import-outside-toplevel
+    from stl_2_scad.api import ConversionOptions, write_embed, write_mesh
+    from stl_2_scad.mesh_cache import open_stl
+    from stl_2_scad.output_writer import check_archive, open_output
+
+    if args.archive is not None:
+        try:
+            check_archive(args.archive)
+        except ValueError as exception:
+            logger.critical("%s", exception)
+            return 1
+
     try:
-        mesh = stl.mesh.Mesh.from_file(args.stl)
+        stl_file = open_stl(args.stl, args)
     except FileNotFoundError:
         logger.critical("File %s not found.", args.stl)
         return 1
 
     object_name = args.name if args.name is not None else Path(args.stl).stem
+    options = ConversionOptions.from_args(args)
 
-    bbox = get_stl_bounding_box(mesh)
-    half_dims = [float(bbox[3] - bbox[0]) / 2, float(bbox[4] - bbox[1]) / 2, float(bbox[5] - bbox[2]) / 2]
-    center = [
-        float((bbox[3] + bbox[0]) / 2),
-        float((bbox[4] + bbox[1]) / 2),
-        float((bbox[5] + bbox[2]) / 2),
-    ]
-
-    vertices = []
-    faces = []
-    # pylint: disable=consider-using-enumerate
-    for i in range(len(mesh.v0)):
-        vertices.append([float(mesh.v0[i][0]), float(mesh.v0[i][1]), float(mesh.v0[i][2])])
-        vertices.append([float(mesh.v1[i][0]), float(mesh.v1[i][1]), float(mesh.v1[i][2])])
-        vertices.append([float(mesh.v2[i][0]), float(mesh.v2[i][1]), float(mesh.v2[i][2])])
-        if args.reverse_faces:
-            faces.append([i * 3, i * 3 + 1, i * 3 + 2])
-        else:
-            faces.append([i * 3 + 2, i * 3 + 1, i * 3])
-
-    header = f"""/*
- * Generated code by stl2scad v{STL2SCAD_VERSION} (https://github.com/seeraven/stl2scad)
- */
-"""
-
-    module_polyhedron = f"""
-/*
- * Embedded STL object {object_name} from file {Path(args.stl).name}.
- */
-module polyhedron_{object_name}(convexity = 1) {{
-    vertices = {vertices};
-    faces = {faces};
-    polyhedron(points = vertices, faces = faces, convexity = convexity);
-}}
-"""
-
-    module_object = f"""
-/*
- * Place the embedded STL object {object_name} into the scene taking the
- * given anchor into account.
- */
-module {object_name}(anchor = [0, 0, 0]) {{
-    center = {center};
-    displacement = [anchor.x * {half_dims[0]},
-                    anchor.y * {half_dims[1]},
-                    anchor.z * {half_dims[2]}];
-
-    translate(-center - displacement)
-    polyhedron_{object_name}();
-}}
-"""
+    sidecar_path: Optional[str] = None
+    if args.format != "scad":
+        if args.split or args.tile is not None or args.lod is not None:
+            logger.critical("The --split, --tile and --lod options can't be used with sidecar files.")
+            return 1
+        output_dir = os.path.dirname(args.output) if args.output is not None else ""
+        sidecar = args.sidecar or os.path.join(output_dir, f"{object_name}_embedded.{args.format}")
+        if os.path.exists(sidecar) and os.path.samefile(sidecar, args.stl):
+            logger.critical("The sidecar file %s would overwrite the STL file.", sidecar)
+            return 1
+        logger.info("Writing sidecar file %s.", sidecar)
+        with open(sidecar, "wb") as binary_handle:
+            write_mesh(binary_handle, stl_file, args.format, options)
+        sidecar_path = Path(os.path.relpath(sidecar, output_dir or ".")).as_posix()
 
-    if args.output is None:
-        print(header)
-        print(module_polyhedron)
-        print(module_object)
-    else:
+    if args.output is not None:
         logger.info("Writing output to file %s.", args.output)
-        with open(args.output, "w", encoding="utf-8") as file_handle:
-            file_handle.write(header)
-            file_handle.write(module_polyhedron)
-            file_handle.write(module_object)
+    if args.archive is not None:
+        logger.info("Writing compressed output to file %s.", args.archive)
+    with open_output(args.output, args.archive) as file_handle:
+        write_embed(file_handle, stl_file, object_name, options, sidecar_path)
 
     return 0
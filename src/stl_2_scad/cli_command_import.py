@@ -16,12 +16,9 @@ Copyright:
 # -----------------------------------------------------------------------------
 import argparse
 import logging
-from pathlib import Path
 from typing import Any
 
-import stl
-
-from stl_2_scad.stl_helpers import get_stl_bounding_box
+from stl_2_scad.cli_command_embed import BBOX_HELP, BBOX_TYPES, PRECISION_HELP, parse_precision
 
 # -----------------------------------------------------------------------------
 # Module Variables
@@ -50,6 +47,12 @@ Example:
         translate(-center - displacement)
         import("test/data/example_cube.stl");
     }
+
+Using the `--bbox oriented` option, the anchor refers to the oriented
+bounding box of the STL object with approximately the minimum volume instead
+of the axis aligned bounding box. The STL object is rotated into the frame of
+the oriented bounding box, i.e., each axis of the box becomes aligned with
+the coordinate axis it is closest to.
 """
 
 
@@ -64,6 +67,20 @@ def add_subcommand(subparsers: Any) -> None:
         description=DESCRIPTION,
         formatter_class=argparse.RawTextHelpFormatter,
     )
+    parser.add_argument(
+        "-p",
+        "--precision",
+        help=PRECISION_HELP,
+        type=parse_precision,
+        default="full",
+    )
+    parser.add_argument(
+        "-b",
+        "--bbox",
+        help=BBOX_HELP,
+        choices=BBOX_TYPES,
+        default="axis",
+    )
     parser.add_argument("stl", help="STL file.")
     parser.set_defaults(func=stl2scad_import)
 
@@ -76,33 +93,15 @@ def stl2scad_import(args) -> int:
     logger = logging.getLogger(__name__)
     logger.debug("Executing command stl2scad import")
 
-    logger.debug("Loading file %s", args.stl)
+    # pylint: disable=import-outside-toplevel
+    from stl_2_scad.api import ConversionOptions, generate_import
+    from stl_2_scad.mesh_cache import open_stl
+
     try:
-        mesh = stl.mesh.Mesh.from_file(args.stl)
+        stl_file = open_stl(args.stl, args)
     except FileNotFoundError:
         logger.critical("File %s not found.", args.stl)
         return 1
 
-    bbox = get_stl_bounding_box(mesh)
-    half_dims = [float(bbox[3] - bbox[0]) / 2, float(bbox[4] - bbox[1]) / 2, float(bbox[5] - bbox[2]) / 2]
-    center = [
-        float((bbox[3] + bbox[0]) / 2),
-        float((bbox[4] + bbox[1]) / 2),
-        float((bbox[5] + bbox[2]) / 2),
-    ]
-
-    print(f"""
-/*
- * Import the file {Path(args.stl).name}.
- */
-module {Path(args.stl).stem}(anchor = [0, 0, 0]) {{
-    center = {center};
-    displacement = [anchor.x * {half_dims[0]},
-                    anchor.y * {half_dims[1]},
-                    anchor.z * {half_dims[2]}];
-
-    translate(-center - displacement)
-    import("{args.stl}");
-}}
-""")
+    print(generate_import(stl_file, options=ConversionOptions.from_args(args)))
     return 0
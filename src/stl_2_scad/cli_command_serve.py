@@ -0,0 +1,305 @@
+"""
+Module containing the subcommand 'serve' of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import argparse
+import concurrent.futures
+import contextlib
+import functools
+import importlib
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+from stl_2_scad.profiling import run_profiled
+from stl_2_scad.settings import STL2SCAD_LOGFORMAT, STL2SCAD_VERSION
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+DESCRIPTION = """
+stl2scad serve
+==============
+
+Run stl2scad as a long running server that executes the subcommands of many
+calls. The server keeps a pool of worker processes with all dependencies
+already imported and the recently used STL files loaded, so repeated calls
+on the same files skip the startup, loading and parsing entirely.
+
+Each request is a single line containing a JSON object with the command line
+arguments `argv` (without the program name), the working directory `cwd` and
+an optional `id`. Each response is a single line containing a JSON object with
+the `id` of the request, the `returncode` and the `stdout` and `stderr`
+output of the call.
+
+Per default, the requests are read from stdin and the responses are written
+to stdout as soon as they are available, so they might be in a different
+order than the requests. Using the `--socket` option, the server listens on
+the given Unix domain socket instead.
+
+If the environment variable STL2SCAD_SERVER is set to the path of the socket,
+the stl2scad command forwards its arguments to the server instead of
+executing them itself. If the server is not reachable, the command is
+executed locally as usual.
+
+Example:
+    $ stl2scad serve --socket /tmp/stl2scad.sock &
+    $ STL2SCAD_SERVER=/tmp/stl2scad.sock stl2scad dims test/data/example_cube.stl
+"""
+
+# Size of the blocks read from the socket by the client.
+RECEIVE_SIZE = 1 << 16
+
+# Modules imported by each worker process on startup, so the first call
+# doesn't have to import them.
+WARM_MODULES = ["stl_2_scad.cli", "stl_2_scad.mesh_cache", "stl_2_scad.scad_generator", "stl"]
+
+
+# -----------------------------------------------------------------------------
+# Argument Parser
+# -----------------------------------------------------------------------------
+def add_subcommand(subparsers: Any) -> None:
+    """Add the subcommand 'serve'."""
+    parser = subparsers.add_parser(
+        "serve",
+        help="Run stl2scad as a server executing the subcommands of many calls.",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        help="Listen on this Unix domain socket instead of reading the requests from stdin.",
+        default=None,
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of worker processes. Default: Number of CPUs.",
+        type=int,
+        default=os.cpu_count() or 1,
+    )
+    parser.add_argument(
+        "-m",
+        "--max-meshes",
+        help="Number of STL files kept loaded by each worker process. Default: %(default)s",
+        type=int,
+        default=8,
+    )
+    parser.set_defaults(func=stl2scad_serve, local_only=True)
+
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+def send_request(socket_path: str, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send the request to the server listening on the given socket and return its response.
+
+    Returns None if the server is not reachable.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            data = bytearray()
+            while not data.endswith(b"\n"):
+                block = client.recv(RECEIVE_SIZE)
+                if not block:
+                    return None
+                data += block
+    except OSError:
+        return None
+    return json.loads(data)
+
+
+def forward_to_server(socket_path: str, argv: List[str]) -> Optional[int]:
+    """Execute the call by the server listening on the given socket.
+
+    Returns the return code of the call or None if the server is not
+    reachable, so the call has to be executed locally.
+    """
+    response = send_request(socket_path, {"argv": argv, "cwd": os.getcwd()})
+    if response is None:
+        return None
+    sys.stderr.write(response["stderr"])
+    sys.stdout.write(response["stdout"])
+    return int(response["returncode"])
+
+
+# -----------------------------------------------------------------------------
+# Worker
+# -----------------------------------------------------------------------------
+def init_worker(max_meshes: int) -> None:
+    """Import the dependencies and enable the in-memory cache of the loaded STL files in a worker process."""
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+    # The log output of each call is captured by run_request(), so drop the
+    # handlers inherited from the server process.
+    logging.getLogger().handlers.clear()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    importlib.import_module("stl_2_scad.mesh_cache").enable_memory_cache(max_meshes)
+
+
+def run_request(argv: List[str], cwd: str) -> Dict[str, Any]:
+    """Execute a single call in a worker process and return its return code and output."""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    handler = logging.StreamHandler(stderr)
+    handler.setFormatter(logging.Formatter(STL2SCAD_LOGFORMAT))
+    root_logger = logging.getLogger()
+    logger = logging.getLogger(__name__)
+    returncode = 1
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            os.chdir(cwd)
+            # The cli module imports this module, so it is imported at runtime.
+            parser = importlib.import_module("stl_2_scad.cli").get_parser()
+            args = parser.parse_args(argv)
+            root_logger.setLevel(args.loglevel)
+            root_logger.addHandler(handler)
+            if args.version:
+                print(f"stl2scad v{STL2SCAD_VERSION}")
+                returncode = 0
+            elif not hasattr(args, "func"):
+                parser.error("Please specify a subcommand.")
+            elif getattr(args, "local_only", False):
+                logger.critical("This subcommand can't be executed by the server.")
+            else:
+                returncode = run_profiled(args)
+        except SystemExit as exception:
+            returncode = exception.code if isinstance(exception.code, int) else int(exception.code is not None)
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.critical("Call failed: %s", exception)
+        finally:
+            root_logger.removeHandler(handler)
+
+    return {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def execute(executor: concurrent.futures.Executor, request: Dict[str, Any]) -> "concurrent.futures.Future[Any]":
+    """Submit the request to the worker pool. Invalid requests are answered directly."""
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+        future.set_result(
+            {"returncode": 2, "stdout": "", "stderr": "Invalid request: argv must be a list of strings.\n"}
+        )
+        return future
+    return executor.submit(run_request, argv, str(request.get("cwd", os.getcwd())))
+
+
+def parse_request(line: str) -> Dict[str, Any]:
+    """Parse a request line. Malformed requests result in a request without argv."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return {}
+    return request if isinstance(request, dict) else {}
+
+
+# -----------------------------------------------------------------------------
+# Servers
+# -----------------------------------------------------------------------------
+def serve_stdin(executor: concurrent.futures.Executor) -> None:
+    """Read the requests from stdin and write the responses to stdout as soon as they are available."""
+    lock = threading.Lock()
+    futures: List["concurrent.futures.Future[Any]"] = []
+
+    def respond(request_id: Any, future: "concurrent.futures.Future[Any]") -> None:
+        response = dict(future.result(), id=request_id)
+        with lock:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = parse_request(line)
+        future = execute(executor, request)
+        future.add_done_callback(functools.partial(respond, request.get("id")))
+        futures.append(future)
+        futures = [future for future in futures if not future.done()]
+
+    concurrent.futures.wait(futures)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handler of a single connection to the server. Each line is a request."""
+
+    def handle(self) -> None:
+        """Answer all requests of the connection in order."""
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            request = parse_request(line.decode("utf-8"))
+            response = dict(execute(self.server.executor, request).result(), id=request.get("id"))  # type: ignore
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def serve_socket(executor: concurrent.futures.Executor, socket_path: str) -> int:
+    """Answer the requests received on the Unix domain socket until the server is terminated."""
+    logger = logging.getLogger(__name__)
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        logger.critical("Unix domain sockets are not supported on this platform.")
+        return 1
+
+    if os.path.exists(socket_path):
+        if send_request(socket_path, {"argv": ["--version"], "cwd": os.getcwd()}) is not None:
+            logger.critical("Another server is already listening on %s.", socket_path)
+            return 1
+        os.remove(socket_path)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler) as server:
+        server.daemon_threads = True
+        server.executor = executor  # type: ignore
+        logger.info("Listening on %s.", socket_path)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+    return 0
+
+
+# -----------------------------------------------------------------------------
+# Command
+# -----------------------------------------------------------------------------
+def stl2scad_serve(args) -> int:
+    """Run stl2scad as a server executing the subcommands of many calls."""
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing command stl2scad serve")
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max(1, args.workers), initializer=init_worker, initargs=(args.max_meshes,)
+    ) as executor:
+        if args.socket is None:
+            serve_stdin(executor)
+            return 0
+        return serve_socket(executor, args.socket)
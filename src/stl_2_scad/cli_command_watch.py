@@ -0,0 +1,374 @@
+"""
+Module containing the subcommand 'watch' of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import signal
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from stl_2_scad.cli_command_batch import (
+    BatchTask,
+    add_conversion_arguments,
+    convert_file,
+    merge_profile,
+    sanitize_object_name,
+)
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+DESCRIPTION = """
+stl2scad watch
+==============
+
+Watch STL files and directories and regenerate the OpenSCAD code of the
+`import` or `embed` subcommand whenever an STL file changes. Directories are
+watched recursively, so new STL files are converted as well.
+
+On startup, all STL files are converted. Afterwards, a file is converted
+again when it was not modified for the debounce time and its content
+actually changed. The generated code is written into a temporary file that
+is renamed to the `.scad` file, so OpenSCAD never reads a half-written file.
+
+On Linux, the changes are detected using inotify. On other platforms or
+using the `--polling` option, the files are checked periodically instead.
+
+Example:
+    $ stl2scad watch --mode embed --indexed parts
+    Regenerates the `.scad` file next to each STL file in the directory
+    parts whenever the STL file changes.
+"""
+
+# Flags and events of inotify (see inotify(7)).
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# Header of an inotify event: watch descriptor, mask, cookie and name length.
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# Size of the buffer used to read inotify events and the blocks used to hash
+# the STL files.
+READ_SIZE = 1 << 16
+HASH_BLOCK_SIZE = 1 << 20
+
+
+# -----------------------------------------------------------------------------
+# Argument Parser
+# -----------------------------------------------------------------------------
+def add_subcommand(subparsers: Any) -> None:
+    """Add the subcommand 'watch'."""
+    parser = subparsers.add_parser(
+        "watch",
+        help="Regenerate the OpenSCAD code of STL files whenever they change.",
+        description=DESCRIPTION,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "-d",
+        "--output-dir",
+        help="Write the generated .scad files into this directory instead of next to the STL files.",
+        default=None,
+    )
+    parser.add_argument(
+        "-D",
+        "--debounce",
+        help="Convert a file only if it was not modified for this number of seconds. Default: %(default)s",
+        type=float,
+        default=0.5,
+    )
+    parser.add_argument(
+        "-P",
+        "--polling",
+        help="Check the files periodically instead of using inotify.",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-I",
+        "--interval",
+        help="Interval in seconds between two checks of the files in polling mode. Default: %(default)s",
+        type=float,
+        default=1.0,
+    )
+    add_conversion_arguments(parser)
+    parser.add_argument("inputs", nargs="+", help="STL files or directories.")
+    parser.set_defaults(func=stl2scad_watch, local_only=True)
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def is_stl_file(path: str) -> bool:
+    """Check if the path has the suffix .stl."""
+    return Path(path).suffix.lower() == ".stl"
+
+
+def find_watched_files(inputs: List[str]) -> Set[str]:
+    """Get the absolute paths of all STL files given as files or found in the directories."""
+    stl_files: Set[str] = set()
+    for entry in inputs:
+        if os.path.isdir(entry):
+            stl_files.update(str(path.absolute()) for path in Path(entry).rglob("*") if is_stl_file(str(path)))
+        else:
+            stl_files.add(os.path.abspath(entry))
+    return stl_files
+
+
+def get_content_hash(filename: str) -> bytes:
+    """Get the hash of the content of the file."""
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as file_handle:
+        for block in iter(lambda: file_handle.read(HASH_BLOCK_SIZE), b""):
+            content_hash.update(block)
+    return content_hash.digest()
+
+
+# -----------------------------------------------------------------------------
+# Watchers
+# -----------------------------------------------------------------------------
+class PollingWatcher:
+    """Detect changed STL files by checking the size and modification time of all files periodically."""
+
+    name = "polling"
+
+    def __init__(self, inputs: List[str], interval: float) -> None:
+        """Remember the current state of the files."""
+        self._inputs = inputs
+        self._interval = interval
+        self._states = self._get_states()
+
+    def _get_states(self) -> Dict[str, Tuple[int, int]]:
+        """Get the size and modification time of all watched files."""
+        states = {}
+        for filename in find_watched_files(self._inputs):
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            states[filename] = (stat.st_size, stat.st_mtime_ns)
+        return states
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds (at most the polling interval) and return the changed files."""
+        time.sleep(self._interval if timeout is None else min(timeout, self._interval))
+        states = self._get_states()
+        changed = {filename for filename, state in states.items() if self._states.get(filename) != state}
+        self._states = states
+        return changed
+
+    def close(self) -> None:
+        """Nothing to release in polling mode."""
+
+
+class InotifyWatcher:
+    """Detect changed STL files using inotify.
+
+    The directories containing the watched files and all subdirectories of
+    watched directories are watched, so files replaced by a rename and new
+    files are detected as well.
+    """
+
+    name = "inotify"
+
+    def __init__(self, inputs: List[str]) -> None:
+        """Initialize inotify and watch all directories. Raises OSError if inotify is not available."""
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._inputs = inputs
+        self._directories: Dict[int, str] = {}
+        self._files = {os.path.abspath(entry) for entry in inputs if not os.path.isdir(entry)}
+        self._recursive: Set[str] = set()
+        for entry in inputs:
+            if os.path.isdir(entry):
+                self._add_recursive(os.path.abspath(entry))
+            else:
+                self._add_directory(os.path.dirname(os.path.abspath(entry)))
+
+    def _add_directory(self, directory: str) -> None:
+        """Watch a single directory."""
+        watch = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if watch < 0:
+            raise OSError(ctypes.get_errno(), f"Can't watch directory {directory}")
+        self._directories[watch] = directory
+
+    def _add_recursive(self, directory: str) -> None:
+        """Watch the directory and all its subdirectories."""
+        self._recursive.add(directory)
+        self._add_directory(directory)
+        for root, subdirectories, _ in os.walk(directory):
+            for subdirectory in subdirectories:
+                self._recursive.add(os.path.join(root, subdirectory))
+                self._add_directory(os.path.join(root, subdirectory))
+
+    def _is_watched(self, filename: str) -> bool:
+        """Check if the file is a watched STL file."""
+        return filename in self._files or (is_stl_file(filename) and os.path.dirname(filename) in self._recursive)
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds for events and return the changed files."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        data = os.read(self._fd, READ_SIZE)
+        offset = 0
+        while offset < len(data):
+            watch, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + INOTIFY_EVENT.size : offset + INOTIFY_EVENT.size + length].rstrip(b"\0"))
+            offset += INOTIFY_EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                changed.update(find_watched_files(self._inputs))
+                continue
+            path = os.path.join(self._directories.get(watch, ""), name)
+            if mask & IN_ISDIR:
+                if os.path.dirname(path) in self._recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_recursive(path)
+                    changed.update(find_watched_files([path]))
+            elif self._is_watched(path):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        os.close(self._fd)
+
+
+def create_watcher(args) -> Any:
+    """Create the inotify watcher or the polling watcher if inotify is not available or polling is requested."""
+    logger = logging.getLogger(__name__)
+    if not args.polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(args.inputs)
+        except (OSError, AttributeError) as exception:
+            logger.warning("Can't use inotify (%s), falling back to polling.", exception)
+    return PollingWatcher(args.inputs, args.interval)
+
+
+# -----------------------------------------------------------------------------
+# Conversion
+# -----------------------------------------------------------------------------
+def regenerate(stl_file: str, args) -> Optional[str]:
+    """Convert the STL file into its .scad file atomically. Returns the error message or None on success."""
+    output_dir = args.output_dir if args.output_dir is not None else os.path.dirname(stl_file)
+    output = os.path.join(output_dir, Path(stl_file).stem + ".scad")
+    temp_output = f"{output}.{os.getpid()}.tmp"
+    import_path = Path(os.path.relpath(stl_file, output_dir)).as_posix()
+
+    object_name = sanitize_object_name(Path(stl_file).stem)
+    result = convert_file(BatchTask(stl_file, temp_output, import_path, object_name, write_header=True), args)
+    merge_profile(result)
+    if result.error is not None:
+        if os.path.exists(temp_output):
+            os.remove(temp_output)
+        return result.error
+    os.replace(temp_output, output)
+    return None
+
+
+def process_file(stl_file: str, hashes: Dict[str, bytes], args, latency_start: float, queue_depth: int) -> None:
+    """Convert the STL file if its content differs from the known hash and log the latency since the first change."""
+    logger = logging.getLogger(__name__)
+    display_name = os.path.relpath(stl_file)
+    try:
+        content_hash = get_content_hash(stl_file)
+    except OSError:
+        logger.debug("File %s was removed.", display_name)
+        hashes.pop(stl_file, None)
+        return
+    if hashes.get(stl_file) == content_hash:
+        logger.debug("Content of file %s is unchanged.", display_name)
+        return
+
+    start = time.perf_counter()
+    error = regenerate(stl_file, args)
+    if error is not None:
+        logger.error("Failed to convert %s: %s", display_name, error)
+        return
+    hashes[stl_file] = content_hash
+    now = time.perf_counter()
+    logger.info(
+        "Regenerated %s in %.3f s (latency %.3f s, %d files queued).",
+        display_name,
+        now - start,
+        now - latency_start,
+        queue_depth,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Command
+# -----------------------------------------------------------------------------
+def stl2scad_watch(args) -> int:
+    """Regenerate the OpenSCAD code of STL files whenever they change."""
+    logger = logging.getLogger(__name__)
+    logger.debug("Executing command stl2scad watch")
+
+    missing = [entry for entry in args.inputs if not os.path.exists(entry)]
+    if missing:
+        logger.critical("File %s not found.", missing[0])
+        return 1
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    watcher = create_watcher(args)
+    hashes: Dict[str, bytes] = {}
+    stl_files = sorted(find_watched_files(args.inputs))
+    logger.info("Watching %d STL files using %s.", len(stl_files), watcher.name)
+    for index, stl_file in enumerate(stl_files):
+        process_file(stl_file, hashes, args, time.perf_counter(), len(stl_files) - index - 1)
+
+    # Changed files with the time of their first and last change
+    pending: Dict[str, Tuple[float, float]] = {}
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            now = time.perf_counter()
+            timeout = None if not pending else max(0.0, min(last for _, last in pending.values()) + args.debounce - now)
+            changed = watcher.wait(timeout)
+            now = time.perf_counter()
+            for stl_file in changed:
+                pending[stl_file] = (pending.get(stl_file, (now, now))[0], now)
+
+            ready = sorted(stl_file for stl_file, (_, last) in pending.items() if now - last >= args.debounce)
+            for stl_file in ready:
+                first, _ = pending.pop(stl_file)
+                process_file(stl_file, hashes, args, first, len(pending))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
@@ -0,0 +1,535 @@
+"""
+Module containing the convex hull and the oriented bounding box of meshes for stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Distance relative to the size of the point set below which a point is
+# considered to lie on a face of the hull.
+HULL_EPSILON = 1e-9
+
+# Numbers of directions used to find the extreme points that span each of
+# the polytopes inside the hull used to drop points that can't be vertices of
+# the hull.
+HULL_DIRECTIONS = [16, 64, 256]
+
+# Number of points of the sample used to find the extreme points.
+HULL_SAMPLE_SIZE = 1 << 16
+
+# Number of entries along the first axis of the point array processed at
+# once when reducing the points to the candidates of hull vertices.
+HULL_BLOCK_SIZE = 1 << 15
+
+# Inputs up to this number of points are passed to the quickhull algorithm
+# without reducing them first.
+HULL_REDUCE_MIN_POINTS = 1 << 12
+
+# Maximum number of points of an approximate hull passed on as they are. Of
+# larger point sets, e.g., finely tessellated round objects whose vertices all
+# lie on the hull, only the point farthest from the center of each cell of a
+# grid of HULL_GRID_CELLS cells per axis is kept, as the quickhull algorithm
+# adds the vertices of the hull one by one.
+HULL_MAX_CANDIDATES = 1 << 12
+HULL_GRID_CELLS = 24
+
+# Maximum number of face normals of the hull tried as axis of the oriented
+# bounding box. The faces are tried in the order of decreasing area.
+OBB_MAX_DIRECTIONS = 1024
+
+
+# -----------------------------------------------------------------------------
+# Oriented Bounding Box
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class OrientedBoundingBox:
+    """Oriented bounding box of an STL object.
+
+    The rows of the rotation are the axes of the box, so the rotation maps a
+    point of the STL object into the frame of the box. The center is given in
+    the coordinates of the STL object and the half extents along the axes of
+    the box. Like the BoundingBox, all values are python floats.
+    """
+
+    center: List[float]
+    rotation: List[List[float]]
+    half_extents: List[float]
+
+
+# -----------------------------------------------------------------------------
+# Convex Hull
+# -----------------------------------------------------------------------------
+def _cross(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Get the cross products of the vectors of shape (n, 3). This is faster than np.cross() for small arrays."""
+    return np.stack(
+        [
+            first[:, 1] * second[:, 2] - first[:, 2] * second[:, 1],
+            first[:, 2] * second[:, 0] - first[:, 0] * second[:, 2],
+            first[:, 0] * second[:, 1] - first[:, 1] * second[:, 0],
+        ],
+        axis=1,
+    )
+
+
+def _get_face_planes(points: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the unit normals and the offsets of the plane of each face."""
+    first, second, third = points[faces[:, 0]], points[faces[:, 1]], points[faces[:, 2]]
+    normals = _cross(second - first, third - first)
+    normals /= np.sqrt((normals * normals).sum(axis=1))[:, None]
+    return normals, (normals * first).sum(axis=1)
+
+
+def _get_initial_simplex(points: np.ndarray, epsilon: float) -> List[Tuple[int, int, int]]:
+    """Get the four outward oriented faces of the initial tetrahedron. Raises ValueError if the points are flat."""
+    axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+    first = int(np.argmin(points[:, axis]))
+    second = int(np.argmax(points[:, axis]))
+    line = points[second] - points[first]
+    line_distances = np.linalg.norm(np.cross(points - points[first], line), axis=1)
+    third = int(np.argmax(line_distances))
+    if line_distances[third] <= epsilon * np.linalg.norm(line):
+        raise ValueError("The points are collinear.")
+
+    normal = np.cross(line, points[third] - points[first])
+    plane_distances = (points - points[first]) @ (normal / np.linalg.norm(normal))
+    fourth = int(np.argmax(np.abs(plane_distances)))
+    if abs(plane_distances[fourth]) <= epsilon:
+        raise ValueError("The points are coplanar.")
+
+    center = points[[first, second, third, fourth]].mean(axis=0)
+    faces = []
+    for face in [(first, second, third), (first, fourth, second), (second, fourth, third), (third, fourth, first)]:
+        corners = points[list(face)]
+        if np.cross(corners[1] - corners[0], corners[2] - corners[0]) @ (center - corners[0]) > 0.0:
+            face = (face[0], face[2], face[1])
+        faces.append(face)
+    return faces
+
+
+class _Quickhull:
+    """State of the quickhull algorithm.
+
+    The faces are stored as python lists, as each step only touches a few
+    faces. Each face stores the neighbor across each of its edges, where edge
+    k goes from vertex k to vertex k + 1, and the points above the face that
+    are assigned to it. The assignment of the points is vectorized.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-few-public-methods
+
+    def __init__(self, points: np.ndarray, epsilon: float) -> None:
+        """Create the initial tetrahedron and assign all points to its faces."""
+        self.points = points
+        self.epsilon = epsilon
+        self.vertices: List[Tuple[int, int, int]] = []
+        self.normals: List[Tuple[float, float, float]] = []
+        self.offsets: List[float] = []
+        self.neighbors: List[List[int]] = []
+        self.alive: List[bool] = []
+        self.outside: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+        faces = self._add_faces(_get_initial_simplex(points, epsilon))
+        edges: Dict[Tuple[int, int], int] = {}
+        for face in faces:
+            for k in range(3):
+                edges[(self.vertices[face][k], self.vertices[face][(k + 1) % 3])] = face
+        for face in faces:
+            vertices = self.vertices[face]
+            self.neighbors[face] = [edges[(vertices[(k + 1) % 3], vertices[k])] for k in range(3)]
+        self._assign(np.arange(len(points)), faces)
+
+    def _add_faces(self, faces: List[Tuple[int, int, int]]) -> List[int]:
+        """Add the faces and return their indices."""
+        normals, offsets = _get_face_planes(self.points, np.array(faces))
+        first = len(self.vertices)
+        self.vertices.extend(faces)
+        self.normals.extend(map(tuple, normals.tolist()))
+        self.offsets.extend(offsets.tolist())
+        self.neighbors.extend([-1, -1, -1] for _ in faces)
+        self.alive.extend(True for _ in faces)
+        return list(range(first, len(self.vertices)))
+
+    def _assign(self, indices: np.ndarray, faces: List[int]) -> None:
+        """Assign each point to the face it is farthest above. Points below all faces are dropped."""
+        if len(indices) == 0:
+            return
+        normals = np.array([self.normals[face] for face in faces])
+        offsets = np.array([self.offsets[face] for face in faces])
+        distances = self.points[indices] @ normals.T - offsets
+        best = np.argmax(distances, axis=1)
+        best_distances = distances[np.arange(len(indices)), best]
+        above = best_distances > self.epsilon
+        indices, best, best_distances = indices[above], best[above], best_distances[above]
+        order = np.argsort(best, kind="stable")
+        bounds = np.searchsorted(best[order], np.arange(len(faces) + 1))
+        for position, face in enumerate(faces):
+            selected = order[bounds[position] : bounds[position + 1]]
+            if len(selected):
+                self.outside[face] = (indices[selected], best_distances[selected])
+
+    def _get_visible_faces(self, start: int, point: Tuple[float, float, float]) -> Tuple[List[int], List[int]]:
+        """Get the faces visible from the point and the horizon edges as face * 3 + edge."""
+        point_x, point_y, point_z = point
+        visible = {start}
+        stack = [start]
+        horizon = []
+        while stack:
+            face = stack.pop()
+            for edge, neighbor in enumerate(self.neighbors[face]):
+                if neighbor in visible:
+                    continue
+                normal_x, normal_y, normal_z = self.normals[neighbor]
+                if normal_x * point_x + normal_y * point_y + normal_z * point_z - self.offsets[neighbor] > self.epsilon:
+                    visible.add(neighbor)
+                    stack.append(neighbor)
+                else:
+                    horizon.append(face * 3 + edge)
+        return list(visible), horizon
+
+    def _add_point(self, face: int) -> None:
+        """Add the farthest point above the face to the hull."""
+        # pylint: disable=too-many-locals
+        indices, distances = self.outside[face]
+        apex = int(indices[np.argmax(distances)])
+        visible, horizon = self._get_visible_faces(face, tuple(self.points[apex].tolist()))
+
+        new_faces = []
+        outer_faces = []
+        for horizon_edge in horizon:
+            old_face, edge = divmod(horizon_edge, 3)
+            vertices = self.vertices[old_face]
+            new_faces.append((vertices[edge], vertices[(edge + 1) % 3], apex))
+            outer_faces.append(self.neighbors[old_face][edge])
+        faces = self._add_faces(new_faces)
+
+        # Link the new faces with each other and with the faces behind the horizon
+        by_start = {self.vertices[new_face][0]: new_face for new_face in faces}
+        by_end = {self.vertices[new_face][1]: new_face for new_face in faces}
+        for new_face, outer_face in zip(faces, outer_faces):
+            start, end, _ = self.vertices[new_face]
+            self.neighbors[new_face] = [outer_face, by_start.get(end, -1), by_end.get(start, -1)]
+            outer_vertices = self.vertices[outer_face]
+            for edge in range(3):
+                if outer_vertices[edge] == end and outer_vertices[(edge + 1) % 3] == start:
+                    self.neighbors[outer_face][edge] = new_face
+
+        orphans = []
+        for old_face in visible:
+            self.alive[old_face] = False
+            if old_face in self.outside:
+                orphans.append(self.outside.pop(old_face)[0])
+        orphaned = np.concatenate(orphans)
+        self._assign(orphaned[orphaned != apex], faces)
+
+    def run(self) -> np.ndarray:
+        """Add points until no point is outside of the hull and return the faces of the hull."""
+        while self.outside:
+            face = next(iter(self.outside))
+            self._add_point(face)
+        return np.array([vertices for vertices, alive in zip(self.vertices, self.alive) if alive], dtype=np.int64)
+
+
+def _get_epsilon(points: np.ndarray) -> float:
+    """Get the distance below which a point is considered to lie on a face."""
+    return HULL_EPSILON * max(float(np.abs(points).max()), 1.0)
+
+
+def _get_directions(count: int) -> np.ndarray:
+    """Get about evenly distributed unit directions on the sphere using a Fibonacci lattice."""
+    index = np.arange(count) + 0.5
+    height = 1.0 - 2.0 * index / count
+    radius = np.sqrt(1.0 - height**2)
+    angle = np.pi * (1.0 + np.sqrt(5.0)) * index
+    return np.stack([radius * np.cos(angle), radius * np.sin(angle), height], axis=1)
+
+
+def _unique_points(points: np.ndarray) -> np.ndarray:
+    """Get the unique rows of the float64 array of shape (n, 3).
+
+    This is much faster than np.unique(points, axis=0), which sorts the rows
+    as opaque byte strings.
+    """
+    points = points + 0.0  # Normalize -0.0 to 0.0
+    order = np.lexsort((points[:, 2], points[:, 1], points[:, 0]))
+    points = points[order]
+    different = np.ones(len(points), dtype=bool)
+    different[1:] = (points[1:] != points[:-1]).any(axis=1)
+    return points[different]
+
+
+def _get_polytopes(points: np.ndarray) -> Optional[List[Tuple[np.ndarray, np.ndarray]]]:
+    """Get the planes of polytopes inside the hull of the points or None if the points are flat.
+
+    Each polytope is the hull of the extreme points of a sample of at most
+    HULL_SAMPLE_SIZE points along one of the numbers of directions given by
+    HULL_DIRECTIONS. The planes are given as float32 unit normals and offsets,
+    which are moved inwards by a small margin to account for the float32
+    precision of the projections.
+    """
+    # pylint: disable=too-many-locals
+    directions = np.concatenate([_get_directions(count) for count in HULL_DIRECTIONS]).astype(np.float32)
+    sample = points[:: max(1, len(points) // HULL_SAMPLE_SIZE)]
+    extreme_values = np.full(len(directions), -np.inf, dtype=np.float32)
+    extreme_points = np.zeros((len(directions), 3), dtype=np.float32)
+    for start in range(0, len(sample), HULL_BLOCK_SIZE // 8):
+        block = sample[start : start + HULL_BLOCK_SIZE // 8].reshape(-1, 3)
+        projections = directions @ block.T
+        best = np.argmax(projections, axis=1)
+        values = projections[np.arange(len(directions)), best]
+        better = values > extreme_values
+        extreme_values[better] = values[better]
+        extreme_points[better] = block[best[better]]
+
+    polytopes = []
+    margin = 1e-5 * max(float(np.abs(extreme_points).max()), 1.0)
+    for end in np.cumsum(HULL_DIRECTIONS):
+        extremes = _unique_points(extreme_points[:end].astype(np.float64))
+        try:
+            faces = _Quickhull(extremes, _get_epsilon(extremes)).run()
+        except ValueError:
+            return None
+        normals, offsets = _get_face_planes(extremes, faces)
+        polytopes.append((normals.astype(np.float32), (offsets - margin).astype(np.float32)))
+    return polytopes
+
+
+def _reduce_points(points: np.ndarray) -> np.ndarray:
+    """Reduce the points of shape (n, ..., 3) to the candidates of hull vertices as float64 array of shape (m, 3).
+
+    The extreme points of a sample span polytopes inside the hull, and all
+    points inside a polytope can't be vertices of the hull. The points are
+    tested against a cascade of polytopes with an increasing number of faces,
+    so most points are dropped by the cheap tests against the first ones.
+
+    The array is processed in blocks of HULL_BLOCK_SIZE entries along the
+    first axis, so the memory usage doesn't depend on the number of points.
+    """
+    polytopes = _get_polytopes(points)
+    if polytopes is None:
+        # Flat point sets are passed as they are and rejected by the quickhull algorithm
+        return _unique_points(points.reshape(-1, 3).astype(np.float64))
+
+    candidates = []
+    for start in range(0, len(points), HULL_BLOCK_SIZE):
+        remaining = points[start : start + HULL_BLOCK_SIZE].reshape(-1, 3)
+        for normals, offsets in polytopes:
+            remaining = remaining[(remaining @ normals.T > offsets).any(axis=1)]
+        candidates.append(remaining.astype(np.float64))
+    return _unique_points(np.concatenate(candidates))
+
+
+def _get_farthest_in_cells(
+    points: np.ndarray, min_point: np.ndarray, max_point: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the point farthest from the center of the bounding box in each occupied cell of the grid and its cell."""
+    cells = np.floor((points - min_point) / np.maximum(max_point - min_point, 1e-300) * HULL_GRID_CELLS)
+    cells = np.clip(cells, 0, HULL_GRID_CELLS - 1).astype(np.int64)
+    keys = (cells[:, 0] * HULL_GRID_CELLS + cells[:, 1]) * HULL_GRID_CELLS + cells[:, 2]
+    offsets = points - (min_point + max_point) / 2
+    order = np.lexsort((-(offsets * offsets).sum(axis=1), keys))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = keys[order[1:]] != keys[order[:-1]]
+    return points[order[first]], keys[order[first]]
+
+
+def _thin_points(points: np.ndarray) -> np.ndarray:
+    """Thin the points of shape (n, ..., 3) to the point farthest from the center of each cell of a coarse grid.
+
+    The grid has HULL_GRID_CELLS cells per axis spanning the bounding box.
+    The array is processed in blocks of HULL_BLOCK_SIZE entries along the
+    first axis, so the memory usage doesn't depend on the number of points.
+    """
+    flat = points.reshape(-1, 3)
+    min_point, max_point = flat.min(axis=0).astype(np.float64), flat.max(axis=0).astype(np.float64)
+    selected = []
+    for start in range(0, len(points), HULL_BLOCK_SIZE):
+        block = points[start : start + HULL_BLOCK_SIZE].reshape(-1, 3).astype(np.float64)
+        selected.append(_get_farthest_in_cells(block, min_point, max_point)[0])
+    return _get_farthest_in_cells(np.concatenate(selected), min_point, max_point)[0]
+
+
+def get_convex_hull(points: np.ndarray, approximate: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the convex hull of the points of shape (..., 3) as float64 vertices and outward oriented faces.
+
+    Large point sets are first reduced to the points outside of a polytope
+    spanned by extreme points, which are then passed to the quickhull
+    algorithm. Its time grows with the number of vertices of the hull, about
+    0.4 ms per vertex. If approximate is True and there are more than
+    HULL_MAX_CANDIDATES points, they are first thinned to one point per cell
+    of a coarse grid, so the result is the hull of a subset of the points
+    whose faces are at most about one cell inside the exact hull. Raises
+    ValueError if the points are empty, collinear or coplanar.
+    """
+    if points.size == 0:
+        raise ValueError("Can't determine the convex hull of an empty mesh.")
+    if approximate and points.size // 3 > HULL_MAX_CANDIDATES:
+        points = _thin_points(points)
+    if points.size // 3 > HULL_REDUCE_MIN_POINTS:
+        candidates = _reduce_points(points)
+    else:
+        candidates = _unique_points(points.reshape(-1, 3).astype(np.float64))
+
+    faces = _Quickhull(candidates, _get_epsilon(candidates)).run()
+    used, faces = np.unique(faces, return_inverse=True)
+    logging.getLogger(__name__).debug(
+        "Convex hull of %d candidate points has %d vertices and %d faces.", len(candidates), len(used), len(faces)
+    )
+    return candidates[used], faces.reshape(-1, 3)
+
+
+# -----------------------------------------------------------------------------
+# Oriented Bounding Box
+# -----------------------------------------------------------------------------
+def _get_hull_edges(faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the vertices of each edge of the hull and the two faces adjacent to it."""
+    starts = faces.reshape(-1)
+    ends = faces[:, [1, 2, 0]].reshape(-1)
+    edge_faces = np.repeat(np.arange(len(faces)), 3)
+    keys = np.minimum(starts, ends) * (int(faces.max()) + 1) + np.maximum(starts, ends)
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    # Each edge of the closed hull is shared by exactly two faces
+    first = order[:-1][keys[:-1] == keys[1:]]
+    second = order[1:][keys[:-1] == keys[1:]]
+    return np.stack([starts[first], ends[first]], axis=1), edge_faces[first], edge_faces[second]
+
+
+def _get_perpendicular(axis: np.ndarray) -> np.ndarray:
+    """Get a unit vector perpendicular to the unit axis."""
+    helper = np.eye(3)[int(np.argmin(np.abs(axis)))]
+    perpendicular = np.cross(axis, helper)
+    return perpendicular / np.linalg.norm(perpendicular)
+
+
+def _get_min_area_rectangle(
+    vertices: np.ndarray,
+    edges: np.ndarray,
+    normals: np.ndarray,
+    adjacent: Tuple[np.ndarray, np.ndarray],
+    axis: np.ndarray,
+) -> Optional[Tuple[float, np.ndarray]]:
+    """Get the minimum area of a rectangle enclosing the projection of the hull along the axis and its first axis.
+
+    The rectangle of minimum area has a side collinear with an edge of the
+    projected hull (rotating calipers). The edges of the projected hull are
+    the silhouette edges of the hull, i.e., the edges between a face facing
+    along the axis and a face not facing along the axis.
+    """
+    # pylint: disable=too-many-locals
+    facing = normals @ axis > 1e-9
+    silhouette = edges[facing[adjacent[0]] != facing[adjacent[1]]]
+    if len(silhouette) == 0:
+        return None
+
+    first_axis = _get_perpendicular(axis)
+    basis = np.stack([first_axis, np.cross(axis, first_axis)], axis=1)
+    directions = (vertices[silhouette[:, 1]] - vertices[silhouette[:, 0]]) @ basis
+    lengths = np.linalg.norm(directions, axis=1)
+    angles = np.arctan2(directions[lengths > 0.0, 1], directions[lengths > 0.0, 0]) % (np.pi / 2)
+    angles = np.unique(np.round(angles, 12))
+    if len(angles) == 0:
+        return None
+
+    projected = vertices[np.unique(silhouette)] @ basis
+    cosines, sines = np.cos(angles), np.sin(angles)
+    along = projected @ np.stack([cosines, sines])
+    across = projected @ np.stack([-sines, cosines])
+    areas = np.ptp(along, axis=0) * np.ptp(across, axis=0)
+    best = int(np.argmin(areas))
+    return float(areas[best]), basis @ np.array([cosines[best], sines[best]])
+
+
+def _get_closest_rotation(axes: np.ndarray) -> np.ndarray:
+    """Reorder and flip the axes of the box so that its rotation is as close as possible to the identity."""
+    rotation = np.zeros((3, 3))
+    remaining = [0, 1, 2]
+    for world_axis in np.argsort(-np.abs(axes).max(axis=0)):
+        best = remaining[int(np.argmax(np.abs(axes[remaining, world_axis])))]
+        remaining.remove(best)
+        rotation[world_axis] = axes[best] if axes[best, world_axis] >= 0.0 else -axes[best]
+    if np.linalg.det(rotation) < 0.0:
+        weakest = int(np.argmin(np.abs(np.diag(rotation))))
+        rotation[weakest] = -rotation[weakest]
+    return rotation
+
+
+def _get_extents(points: np.ndarray, rotation: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the minimum and maximum of the points of shape (n, ..., 3) in the frame of the rotation."""
+    min_point = np.full(3, np.inf)
+    max_point = np.full(3, -np.inf)
+    for start in range(0, len(points), HULL_BLOCK_SIZE):
+        local = points[start : start + HULL_BLOCK_SIZE].reshape(-1, 3).astype(np.float64) @ rotation.T
+        min_point = np.minimum(min_point, local.min(axis=0))
+        max_point = np.maximum(max_point, local.max(axis=0))
+    return min_point, max_point
+
+
+def get_oriented_bounding_box(points: np.ndarray) -> OrientedBoundingBox:
+    """Get the oriented bounding box of the points of shape (..., 3) with approximately the minimum volume.
+
+    The box is searched among the boxes with a face flush with a face of the
+    convex hull, trying the OBB_MAX_DIRECTIONS largest faces and the world
+    axes. For each direction, the rotating calipers give the rectangle of
+    minimum area enclosing the projection of the hull. The minimum volume box
+    of most real objects is flush with a hull face, otherwise the result is a
+    close approximation.
+
+    The directions are taken from an approximate hull for large point sets,
+    see get_convex_hull(), but the extents of the box are always those of
+    all points, so the box encloses the object exactly.
+
+    Flat point sets get the axis aligned bounding box.
+    """
+    # pylint: disable=too-many-locals
+    try:
+        vertices, faces = get_convex_hull(points, approximate=True)
+    except ValueError:
+        if points.size == 0:
+            raise
+        vertices, faces = _unique_points(points.reshape(-1, 3).astype(np.float64)), None
+
+    best_axes = np.eye(3)
+    best_volume = float(np.prod(np.ptp(vertices, axis=0)))
+    if faces is not None:
+        normals, _ = _get_face_planes(vertices, faces)
+        corners = vertices[faces]
+        areas = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+        sorted_normals = normals[np.argsort(-areas)]
+        _, unique_normals = np.unique(np.round(sorted_normals, 9), axis=0, return_index=True)
+        candidates = sorted_normals[np.sort(unique_normals)[:OBB_MAX_DIRECTIONS]]
+
+        edges, first_faces, second_faces = _get_hull_edges(faces)
+        for axis in np.concatenate([np.eye(3), candidates]):
+            rectangle = _get_min_area_rectangle(vertices, edges, normals, (first_faces, second_faces), axis)
+            if rectangle is None:
+                continue
+            volume = rectangle[0] * float(np.ptp(vertices @ axis))
+            if volume < best_volume * (1.0 - 1e-9):
+                best_volume = volume
+                best_axes = np.stack([rectangle[1], np.cross(axis, rectangle[1]), axis])
+
+    rotation = _get_closest_rotation(best_axes)
+    min_point, max_point = _get_extents(points, rotation)
+    return OrientedBoundingBox(
+        center=[float(value) for value in rotation.T @ ((min_point + max_point) / 2)],
+        rotation=(rotation + 0.0).tolist(),  # Normalize -0.0 to 0.0
+        half_extents=[float(value) / 2 for value in max_point - min_point],
+    )
@@ -0,0 +1,319 @@
+"""
+Module containing the persistent cache of mesh metadata of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from stl_2_scad.convex_hull import OrientedBoundingBox, get_oriented_bounding_box
+from stl_2_scad.mesh_helpers import weld_vertices
+from stl_2_scad.profiling import profile_phase
+from stl_2_scad.settings import STL2SCAD_CACHE_DIR, STL2SCAD_CACHE_SIZE_MB
+from stl_2_scad.stl_helpers import (
+    BoundingBox,
+    StlMesh,
+    get_stl_bounding_box,
+    get_stl_file_bounding_box,
+    load_stl,
+)
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Version of the format of the cache entries. Increment it whenever the
+# format or the content of the entries changes to invalidate old entries.
+CACHE_FORMAT_VERSION = 4
+
+# Opened STL files kept in memory by open_stl() if enabled using
+# enable_memory_cache(). This is used by long running processes like the
+# workers of the serve subcommand to keep the loaded meshes between calls.
+_OPEN_FILES: "OrderedDict[Tuple[str, bool], CachedStl]" = OrderedDict()
+_MAX_OPEN_FILES = 0
+
+
+# -----------------------------------------------------------------------------
+# Mesh Cache
+# -----------------------------------------------------------------------------
+class MeshCache:
+    """Persistent cache of the metadata of STL files.
+
+    The entries are identified by the absolute path, size and modification
+    time of the STL file, so a lookup doesn't need to read the STL file at
+    all. Each STL file has an info entry containing the bounding box, the
+    number of triangles and, once requested, the oriented bounding box, and
+    one entry per tolerance for the welded vertices
+    and faces used by the embed subcommand.
+
+    The total size of the cache is limited. If it is exceeded, the least
+    recently used entries are removed.
+    """
+
+    def __init__(self, directory: str = STL2SCAD_CACHE_DIR, max_size: int = STL2SCAD_CACHE_SIZE_MB << 20) -> None:
+        """Create the cache using the given directory and maximum size in bytes."""
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(filename: str) -> str:
+        """Get the key of the cache entries of the STL file."""
+        stat = os.stat(filename)
+        identity = f"{CACHE_FORMAT_VERSION}\0{os.path.abspath(filename)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def get_info(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the info entry or None if it is not cached."""
+        entry = self.directory / f"{key}.json"
+        try:
+            with open(entry, "r", encoding="utf-8") as file_handle:
+                info = json.load(file_handle)
+        except (OSError, ValueError):
+            return None
+        self._touch(entry)
+        return info
+
+    def put_info(self, key: str, info: Dict[str, Any]) -> None:
+        """Store the info entry."""
+        self._store(f"{key}.json", lambda file_handle: file_handle.write(json.dumps(info).encode("utf-8")))
+
+    def get_welded(self, key: str, tolerance: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Get the welded vertices and faces or None if they are not cached."""
+        entry = self.directory / f"{key}-weld-{tolerance!r}.npz"
+        try:
+            with np.load(entry) as data:
+                welded = (data["vertices"], np.asarray(data["faces"], dtype=np.int64))
+        except (OSError, ValueError, KeyError):
+            return None
+        self._touch(entry)
+        return welded
+
+    def put_welded(self, key: str, tolerance: float, vertices: np.ndarray, faces: np.ndarray) -> None:
+        """Store the welded vertices and faces. The faces are stored as uint32 if possible to halve their size."""
+        if len(vertices) < 2**32:
+            faces = faces.astype(np.uint32)
+        self._store(
+            f"{key}-weld-{tolerance!r}.npz",
+            lambda file_handle: np.savez(file_handle, vertices=vertices, faces=faces),
+        )
+
+    def get_entries(self) -> List[Tuple[str, int]]:
+        """Get the paths and sizes of all entries sorted from the least to the most recently used."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as iterator:
+                for entry in iterator:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+        except FileNotFoundError:
+            return []
+        return [(path, size) for _, path, size in sorted(entries)]
+
+    def clear(self) -> int:
+        """Remove all entries and return the number of removed entries."""
+        entries = self.get_entries()
+        for path, _ in entries:
+            self._remove(path)
+        return len(entries)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the size limit is met."""
+        entries = self.get_entries()
+        total_size = sum(size for _, size in entries)
+        for path, size in entries:
+            if total_size <= self.max_size:
+                break
+            logging.getLogger(__name__).debug("Evicting cache entry %s.", path)
+            self._remove(path)
+            total_size -= size
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        """Mark the entry as recently used."""
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Remove an entry ignoring entries removed in the meantime by another process."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _store(self, name: str, write: Any) -> None:
+        """Store an entry by writing it into a temporary file and renaming it afterwards.
+
+        This makes sure other processes never read partially written entries.
+        A cache that can't be written is not an error, so only a debug message
+        is logged in this case.
+        """
+        temp_name = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=".", delete=False) as file_handle:
+                temp_name = file_handle.name
+                write(file_handle)
+            os.replace(temp_name, self.directory / name)
+            self.evict()
+        except OSError as exception:
+            logging.getLogger(__name__).debug("Can't write cache entry %s: %s", name, exception)
+            if temp_name is not None:
+                self._remove(temp_name)
+
+
+def get_mesh_cache(args) -> Optional[MeshCache]:
+    """Get the mesh cache or None if it is disabled using the --no-cache option."""
+    return None if args.no_cache else MeshCache()
+
+
+# -----------------------------------------------------------------------------
+# Cached STL File
+# -----------------------------------------------------------------------------
+class CachedStl:
+    """Access to the data of an STL file using the mesh cache.
+
+    The STL file is only loaded if the requested data is not cached.
+    """
+
+    def __init__(self, filename: str, cache: Optional[MeshCache], mesh: Optional[StlMesh] = None) -> None:
+        """Create the access to the STL file. Raises FileNotFoundError if the file doesn't exist.
+
+        If the mesh is given, it is used instead of the STL file, which doesn't
+        need to exist then. The mesh cache is not used for such meshes, as they
+        can't be identified by their file.
+        """
+        self.filename = filename
+        self._cache = cache if mesh is None else None
+        self._key = MeshCache.get_key(filename) if mesh is None else ""
+        self._mesh = mesh
+        self._info: Optional[Dict[str, Any]] = None
+        self._welded: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def key(self) -> str:
+        """Get the key of the cache entries of the STL file."""
+        return self._key
+
+    @property
+    def mesh(self) -> StlMesh:
+        """Get the mesh. It is loaded on the first access."""
+        if self._mesh is None:
+            logging.getLogger(__name__).debug("Loading file %s", self.filename)
+            with profile_phase("load"):
+                self._mesh = load_stl(self.filename)
+        return self._mesh
+
+    def _get_info(self) -> Dict[str, Any]:
+        """Get the info entry containing the bounding box and the number of triangles."""
+        if self._info is None and self._cache is not None:
+            self._info = self._cache.get_info(self._key)
+            if self._info is not None:
+                logging.getLogger(__name__).debug("Using cached info of file %s", self.filename)
+
+        if self._info is None:
+            # Without the loaded mesh, the file is streamed to keep the memory usage low
+            with profile_phase("bounding_box"):
+                if self._mesh is None:
+                    bbox, num_triangles = get_stl_file_bounding_box(self.filename)
+                else:
+                    bbox, num_triangles = get_stl_bounding_box(self._mesh), len(self._mesh)
+            self._info = {"triangles": num_triangles, "bounding_box": dataclasses.asdict(bbox)}
+            if self._cache is not None:
+                self._cache.put_info(self._key, self._info)
+        return self._info
+
+    def get_bounding_box(self) -> BoundingBox:
+        """Get the bounding box of the mesh."""
+        return BoundingBox(**self._get_info()["bounding_box"])
+
+    def get_oriented_bounding_box(self) -> OrientedBoundingBox:
+        """Get the oriented bounding box of the mesh. See convex_hull.get_oriented_bounding_box() for details."""
+        info = self._get_info()
+        if "oriented_bounding_box" not in info:
+            # The welded vertices contain each vertex only once, which speeds up the convex hull
+            vertices = self.get_welded(0.0)[0]
+            with profile_phase("oriented_bounding_box"):
+                info["oriented_bounding_box"] = dataclasses.asdict(get_oriented_bounding_box(vertices))
+            if self._cache is not None:
+                self._cache.put_info(self._key, info)
+        return OrientedBoundingBox(**info["oriented_bounding_box"])
+
+    def get_triangle_count(self) -> int:
+        """Get the number of triangles of the mesh."""
+        return int(self._get_info()["triangles"])
+
+    def get_welded(self, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the welded vertices and faces of the mesh. See mesh_helpers.weld_vertices() for details."""
+        if tolerance in self._welded:
+            return self._welded[tolerance]
+
+        welded = self._cache.get_welded(self._key, tolerance) if self._cache is not None else None
+        if welded is not None:
+            logging.getLogger(__name__).debug("Using cached welded mesh of file %s", self.filename)
+        else:
+            vectors = self.mesh.vectors
+            with profile_phase("weld"):
+                welded = weld_vertices(vectors, tolerance)
+            if self._cache is not None:
+                self._cache.put_welded(self._key, tolerance, *welded)
+
+        self._welded[tolerance] = welded
+        return welded
+
+
+def enable_memory_cache(max_files: int) -> None:
+    """Keep up to max_files opened STL files in memory to reuse them by open_stl()."""
+    global _MAX_OPEN_FILES  # pylint: disable=global-statement
+    _MAX_OPEN_FILES = max_files
+
+
+def open_stl(filename: str, args) -> CachedStl:
+    """Open the STL file using the mesh cache unless it is disabled by the --no-cache option.
+
+    If enabled using enable_memory_cache(), the opened file is kept in memory
+    and reused as long as the file is not modified.
+
+    Raises FileNotFoundError if the file doesn't exist.
+    """
+    if _MAX_OPEN_FILES <= 0:
+        return CachedStl(filename, get_mesh_cache(args))
+
+    memory_key = (MeshCache.get_key(filename), args.no_cache)
+    stl_file = _OPEN_FILES.pop(memory_key, None)
+    if stl_file is None:
+        stl_file = CachedStl(filename, get_mesh_cache(args))
+    else:
+        logging.getLogger(__name__).debug("Using opened file %s", filename)
+        stl_file.filename = filename
+
+    _OPEN_FILES[memory_key] = stl_file
+    while len(_OPEN_FILES) > _MAX_OPEN_FILES:
+        _OPEN_FILES.popitem(last=False)
+    return stl_file
@@ -0,0 +1,438 @@
+"""
+Module containing the decimation of triangle meshes of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Weight of the quadrics of the planes perpendicular to boundary edges
+# relative to the quadrics of the faces. A high weight keeps the boundaries
+# of open meshes in place.
+BOUNDARY_WEIGHT = 1000.0
+
+# Minimum determinant of the quadric of an edge, relative to the cube of
+# the trace, to use the optimal position instead of the best of the end
+# points and the midpoint of the edge.
+MIN_RELATIVE_DETERMINANT = 1e-9
+
+# Number of passes selecting independent edges to collapse in each round.
+SELECTION_PASSES = 4
+
+# Number of bands of equal size the candidate edges sorted by their error are
+# split into. Cheaper bands take precedence, but within a band the edges are
+# ranked in a pseudo-random order, so a constant fraction of the edges is
+# independent even if the errors are equal or vary smoothly over the mesh.
+SELECTION_BANDS = 8
+
+
+# -----------------------------------------------------------------------------
+# Quadrics
+# -----------------------------------------------------------------------------
+def _get_plane_quadrics(normals: np.ndarray, points: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Get the weighted quadrics of shape (m, 4, 4) of the planes through the points with the unit normals."""
+    planes = np.concatenate([normals, -np.einsum("ij,ij->i", normals, points)[:, None]], axis=1)
+    return weights[:, None, None] * planes[:, :, None] * planes[:, None, :]
+
+
+def _accumulate(indices: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Sum the values of shape (m, ...) into count entries by the given indices."""
+    flat_values = values.reshape(len(values), -1)
+    result = np.empty((count, flat_values.shape[1]))
+    for column in range(flat_values.shape[1]):
+        result[:, column] = np.bincount(indices, weights=flat_values[:, column], minlength=count)
+    return result.reshape((count,) + values.shape[1:])
+
+
+def _get_vertex_quadrics(
+    vertices: np.ndarray, faces: np.ndarray, edges: np.ndarray, edge_faces: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the quadric of each vertex as the sum of the area weighted quadrics of its faces and the sum of the areas.
+
+    Each boundary edge additionally contributes the quadric of the plane
+    through the edge perpendicular to its face to both of its vertices.
+    """
+    # pylint: disable=too-many-locals
+    corners = vertices[faces]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    unit_normals = normals / np.maximum(lengths, np.finfo(np.float64).tiny)[:, None]
+    face_quadrics = _get_plane_quadrics(unit_normals, corners[:, 0], lengths / 2)
+    quadrics = _accumulate(faces.ravel(), np.repeat(face_quadrics, 3, axis=0), len(vertices))
+    areas = np.bincount(faces.ravel(), weights=np.repeat(lengths / 2, 3), minlength=len(vertices))
+
+    boundary = np.flatnonzero(edge_faces >= 0)
+    if len(boundary) > 0:
+        start = vertices[edges[boundary, 0]]
+        direction = vertices[edges[boundary, 1]] - start
+        perpendicular = np.cross(direction, unit_normals[edge_faces[boundary]])
+        perpendicular /= np.maximum(np.linalg.norm(perpendicular, axis=1), np.finfo(np.float64).tiny)[:, None]
+        weights = BOUNDARY_WEIGHT * np.einsum("ij,ij->i", direction, direction)
+        boundary_quadrics = _get_plane_quadrics(perpendicular, start, weights)
+        quadrics += _accumulate(edges[boundary].ravel(), np.repeat(boundary_quadrics, 2, axis=0), len(vertices))
+    return quadrics, areas
+
+
+def _get_quadric_costs(quadrics: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Get the error p^T Q p of each point for its quadric."""
+    homogeneous = np.concatenate([points, np.ones((len(points), 1))], axis=1)
+    return np.maximum(np.einsum("ij,ijk,ik->i", homogeneous, quadrics, homogeneous), 0.0)
+
+
+def _get_collapse_positions(
+    vertices: np.ndarray, quadrics: np.ndarray, edges: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the position minimizing the error of the collapse of each edge and the error at this position.
+
+    The optimal position is the solution of a 3x3 linear system, solved by
+    Cramer's rule. If the system is ill-conditioned, e.g., for flat regions,
+    the best of the two end points and the midpoint of the edge is used
+    instead.
+    """
+    # pylint: disable=too-many-locals
+    edge_quadrics = quadrics[edges[:, 0]] + quadrics[edges[:, 1]]
+    rows = edge_quadrics[:, :3, :3]
+    cofactors = np.stack(
+        [np.cross(rows[:, 1], rows[:, 2]), np.cross(rows[:, 2], rows[:, 0]), np.cross(rows[:, 0], rows[:, 1])],
+        axis=1,
+    )
+    determinants = np.einsum("ij,ij->i", rows[:, 0], cofactors[:, 0])
+    traces = np.trace(rows, axis1=1, axis2=2)
+    solvable = np.abs(determinants) > MIN_RELATIVE_DETERMINANT * traces**3
+
+    start = vertices[edges[:, 0]]
+    end = vertices[edges[:, 1]]
+    candidates = [start, end, (start + end) / 2]
+    if np.any(solvable):
+        # The matrix is symmetric, so the cofactor matrix is the transposed adjugate
+        optimal = (start + end) / 2
+        optimal[solvable] = -np.einsum("ijk,ij->ik", cofactors[solvable], edge_quadrics[solvable, :3, 3])
+        optimal[solvable] /= determinants[solvable, None]
+        candidates.append(optimal)
+
+    costs = np.stack([_get_quadric_costs(edge_quadrics, candidate) for candidate in candidates])
+    best = np.argmin(costs, axis=0)
+    positions = np.stack(candidates)[best, np.arange(len(edges))]
+    return positions, costs[best, np.arange(len(edges))]
+
+
+def _update_collapses(
+    vertices: np.ndarray,
+    quadrics: np.ndarray,
+    edges: np.ndarray,
+    changed: np.ndarray,
+    previous: Tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the keys of the edges and the positions and errors of their collapses.
+
+    The collapses of the previous round given as keys, positions and errors
+    are reused for all edges that still exist and whose vertices didn't
+    change, so only the new edges and the edges of moved vertices are
+    recalculated.
+    """
+    previous_keys, previous_positions, previous_costs = previous
+    num_vertices = len(vertices)
+    edge_keys = edges[:, 0] * num_vertices + edges[:, 1]
+    previous_index = np.minimum(np.searchsorted(previous_keys, edge_keys), max(len(previous_keys) - 1, 0))
+    outdated = _any_of(changed, edges)
+    if len(previous_keys) > 0:
+        outdated |= previous_keys[previous_index] != edge_keys
+    else:
+        outdated[:] = True
+
+    positions = np.empty((len(edges), 3))
+    costs = np.empty(len(edges))
+    positions[~outdated] = previous_positions[previous_index[~outdated]]
+    costs[~outdated] = previous_costs[previous_index[~outdated]]
+    positions[outdated], costs[outdated] = _get_collapse_positions(vertices, quadrics, edges[outdated])
+    return edge_keys, positions, costs
+
+
+# -----------------------------------------------------------------------------
+# Topology
+# -----------------------------------------------------------------------------
+def _get_edges(faces: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the unique edges of the faces.
+
+    Returns:
+        The sorted edges of shape (k, 2), the number of faces of each edge
+        and for boundary edges the index of their only face (-1 otherwise).
+    """
+    half_edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    keys = half_edges[:, 0] * num_vertices + half_edges[:, 1]
+    unique_keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    edges = np.stack([unique_keys // num_vertices, unique_keys % num_vertices], axis=1)
+    edge_faces = np.where(counts == 1, first // 3, -1)
+    return edges, counts, edge_faces
+
+
+def _get_neighbors(edges: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the neighbors of each vertex in compressed form as offsets and neighbor indices."""
+    sources = np.concatenate([edges[:, 0], edges[:, 1]])
+    targets = np.concatenate([edges[:, 1], edges[:, 0]])
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_vertices), out=offsets[1:])
+    return offsets, targets[order]
+
+
+def _any_of(mask: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Check for each row of the indices if the mask is set for any of its entries."""
+    result = mask[indices[:, 0]]
+    for column in range(1, indices.shape[1]):
+        result |= mask[indices[:, column]]
+    return result
+
+
+def _gather_ranges(offsets: np.ndarray, items: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the concatenated ranges offsets[item] to offsets[item + 1] and the index of the item of each entry."""
+    sizes = offsets[items + 1] - offsets[items]
+    owners = np.repeat(np.arange(len(items)), sizes)
+    positions = np.arange(len(owners)) - np.repeat(np.cumsum(sizes) - sizes, sizes) + offsets[items][owners]
+    return positions, owners
+
+
+# -----------------------------------------------------------------------------
+# Collapse Selection
+# -----------------------------------------------------------------------------
+def _get_allowed_edges(edges: np.ndarray, edge_counts: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the edges that may be collapsed and the vertices on the boundary.
+
+    Edges of vertices of non-manifold edges and edges between two faces
+    connecting two boundary vertices are never collapsed.
+    """
+    locked = np.zeros(num_vertices, dtype=bool)
+    locked[edges[edge_counts > 2].ravel()] = True
+    on_boundary = np.zeros(num_vertices, dtype=bool)
+    on_boundary[edges[edge_counts == 1].ravel()] = True
+    bridges = (edge_counts == 2) & on_boundary[edges[:, 0]] & on_boundary[edges[:, 1]]
+    return ~_any_of(locked, edges) & ~bridges, on_boundary
+
+
+def _select_independent_edges(
+    edges: np.ndarray, candidates: np.ndarray, faces: np.ndarray, num_vertices: int
+) -> np.ndarray:
+    """Select the candidate edges that are the first candidate edge within their neighborhood.
+
+    The candidates must be sorted by their rank. An edge is selected if no
+    cheaper candidate touches a vertex of any face around its end points. So
+    the faces changed by the collapses of the selected edges are disjoint
+    and all selected edges can be collapsed at the same time.
+    """
+    rank = np.arange(len(candidates))
+    vertex_rank = np.full(num_vertices, len(candidates))
+    np.minimum.at(vertex_rank, edges[candidates, 0], rank)
+    np.minimum.at(vertex_rank, edges[candidates, 1], rank)
+    face_rank = np.minimum(np.minimum(vertex_rank[faces[:, 0]], vertex_rank[faces[:, 1]]), vertex_rank[faces[:, 2]])
+    neighborhood_rank = np.full(num_vertices, len(candidates))
+    np.minimum.at(neighborhood_rank, faces.ravel(), np.repeat(face_rank, 3))
+    selected = (neighborhood_rank[edges[candidates, 0]] == rank) & (neighborhood_rank[edges[candidates, 1]] == rank)
+    return candidates[selected]
+
+
+def _check_link_condition(
+    edges: np.ndarray,
+    edge_counts: np.ndarray,
+    on_boundary: np.ndarray,
+    neighbors: Tuple[np.ndarray, np.ndarray],
+    selected: np.ndarray,
+) -> np.ndarray:
+    """Check for each selected edge that its collapse keeps the mesh manifold.
+
+    The end points of an edge between two faces must have exactly the two
+    opposite vertices as common neighbors, the end points of a boundary edge
+    only the single opposite vertex. Additionally, no vertex may be left with
+    less than three neighbors, or two on the boundary, which prevents that a
+    tetrahedron collapses into a double-sided triangle.
+    """
+    # pylint: disable=too-many-locals
+    num_vertices = len(on_boundary)
+    offsets, neighbor_indices = neighbors
+    degrees = np.diff(offsets)
+    min_degrees = np.where(on_boundary, 2, 3)
+    edge_keys = edges[:, 0] * num_vertices + edges[:, 1]
+    positions, owners = _gather_ranges(offsets, edges[selected, 0])
+    others = edges[selected, 1][owners]
+    candidates = neighbor_indices[positions]
+    keys = np.minimum(candidates, others) * num_vertices + np.maximum(candidates, others)
+    found = np.searchsorted(edge_keys, keys)
+    is_common = edge_keys[np.minimum(found, len(edge_keys) - 1)] == keys
+    common = np.bincount(owners[is_common], minlength=len(selected))
+    is_opposite_too_small = degrees[candidates[is_common]] <= min_degrees[candidates[is_common]]
+    opposite_too_small = np.bincount(owners[is_common][is_opposite_too_small], minlength=len(selected))
+
+    kept, removed = edges[selected, 0], edges[selected, 1]
+    new_degrees = degrees[kept] + degrees[removed] - 2 - common
+    new_min_degrees = np.maximum(min_degrees[kept], min_degrees[removed])
+    return (common == edge_counts[selected]) & (opposite_too_small == 0) & (new_degrees >= new_min_degrees)
+
+
+def _check_flips(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edges: np.ndarray,
+    positions: np.ndarray,
+    num_vertices: int,
+) -> np.ndarray:
+    """Check for each collapse of the edges to the positions that no remaining face flips or degenerates."""
+    # pylint: disable=too-many-locals
+    collapse_of_vertex = np.full(num_vertices, -1)
+    collapse_of_vertex[edges[:, 0]] = np.arange(len(edges))
+    collapse_of_vertex[edges[:, 1]] = np.arange(len(edges))
+    face_collapses = collapse_of_vertex[faces]
+    collapse_of_face = np.maximum(np.maximum(face_collapses[:, 0], face_collapses[:, 1]), face_collapses[:, 2])
+    moved = face_collapses >= 0
+    num_moved = moved[:, 0].astype(np.int8) + moved[:, 1] + moved[:, 2]
+    affected = np.flatnonzero((collapse_of_face >= 0) & (num_moved == 1))
+
+    corners = vertices[faces[affected]]
+    new_corners = corners.copy()
+    new_corners[moved[affected]] = positions[collapse_of_face[affected]]
+    old_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    new_normals = np.cross(new_corners[:, 1] - new_corners[:, 0], new_corners[:, 2] - new_corners[:, 0])
+    flipped = np.einsum("ij,ij->i", old_normals, new_normals) <= 0.0
+    return np.bincount(collapse_of_face[affected][flipped], minlength=len(edges)) == 0
+
+
+def _rank_candidates(candidates: np.ndarray) -> np.ndarray:
+    """Order the candidate edges sorted by their cost by their band and pseudo-randomly within each band."""
+    bands = np.arange(len(candidates)) * SELECTION_BANDS // max(len(candidates), 1)
+    # Fibonacci hashing of the edge indices gives a deterministic pseudo-random order
+    scrambled = (candidates.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+    return candidates[np.lexsort((scrambled, bands))]
+
+
+def _select_collapses(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    edges: np.ndarray,
+    edge_counts: np.ndarray,
+    on_boundary: np.ndarray,
+    edge_positions: np.ndarray,
+    candidates: np.ndarray,
+) -> np.ndarray:
+    """Select the candidate edges sorted by their cost to collapse in this round.
+
+    The candidates are ranked by _rank_candidates(). In each pass, the
+    independent edges passing all checks are selected and the vertices of
+    all faces around their end points are blocked for the following passes.
+    Further passes are only done up to SELECTION_PASSES times, unless
+    nothing was selected yet.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    candidates = _rank_candidates(candidates)
+    num_vertices = len(vertices)
+    neighbors = _get_neighbors(edges, num_vertices)
+    blocked = np.zeros(num_vertices, dtype=bool)
+    selections: List[np.ndarray] = []
+    num_passes = 0
+    while len(candidates) > 0 and (num_passes < SELECTION_PASSES or not selections):
+        independent = _select_independent_edges(edges, candidates, faces, num_vertices)
+        selected = independent[_check_link_condition(edges, edge_counts, on_boundary, neighbors, independent)]
+        selected = selected[_check_flips(vertices, faces, edges[selected], edge_positions[selected], num_vertices)]
+        if len(selected) > 0:
+            selections.append(selected)
+            end_points = np.zeros(num_vertices, dtype=bool)
+            end_points[edges[selected].ravel()] = True
+            blocked[faces[_any_of(end_points, faces)].ravel()] = True
+        candidates = candidates[~np.isin(candidates, independent) & ~_any_of(blocked, edges[candidates])]
+        num_passes += 1
+    return np.concatenate(selections) if selections else np.empty(0, dtype=np.int64)
+
+
+# -----------------------------------------------------------------------------
+# Decimation
+# -----------------------------------------------------------------------------
+def decimate_mesh(
+    vertices: np.ndarray, faces: np.ndarray, target_faces: Optional[int] = None, max_error: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce the number of faces of an indexed mesh by quadric error metric edge collapses.
+
+    The edges are collapsed in rounds. In each round, the error of the
+    collapse of every edge is calculated and the cheapest edges with
+    disjoint neighborhoods are collapsed at once, in order of their error.
+    Collapses that would make the mesh non-manifold or flip a face are
+    skipped. Edges of non-manifold regions are never collapsed.
+
+    Args:
+        vertices:     Array of shape (n, 3) containing the vertices.
+        faces:        Array of shape (m, 3) containing the vertex indices of
+                      each triangle, e.g., as returned by weld_vertices().
+        target_faces: Stop if the mesh has at most this number of faces.
+        max_error:    Collapse only edges whose quadric error, given as a
+                      distance, is at most this value. The error is the
+                      root of the mean squared distance of the new vertex
+                      from the planes of the original faces around the
+                      edge, weighted by their area. So it doesn't depend on
+                      the scale of the mesh. The quadrics of the boundaries
+                      only increase it.
+
+    Returns:
+        The remaining vertices in their original order and dtype and the
+        faces referencing them.
+    """
+    # pylint: disable=too-many-locals
+    logger = logging.getLogger(__name__)
+    target = 0 if target_faces is None else target_faces
+    max_cost = np.inf if max_error is None else max_error**2
+    positions = vertices.astype(np.float64)
+    num_vertices = len(positions)
+    quadrics = np.empty((0, 4, 4))
+    areas = np.empty(0)
+    changed = np.ones(num_vertices, dtype=bool)
+    edge_keys = np.empty(0, dtype=np.int64)
+    edge_positions = np.empty((0, 3))
+    costs = np.empty(0)
+    num_rounds = 0
+
+    while len(faces) > target:
+        edges, edge_counts, edge_faces = _get_edges(faces, num_vertices)
+        if num_rounds == 0:
+            quadrics, areas = _get_vertex_quadrics(positions, faces, edges, edge_faces)
+
+        edge_keys, edge_positions, costs = _update_collapses(
+            positions, quadrics, edges, changed, (edge_keys, edge_positions, costs)
+        )
+        allowed, on_boundary = _get_allowed_edges(edges, edge_counts, num_vertices)
+        edge_areas = np.maximum(areas[edges[:, 0]] + areas[edges[:, 1]], np.finfo(np.float64).tiny)
+        candidates = np.flatnonzero(allowed & (costs <= max_cost * edge_areas))
+        candidates = candidates[np.argsort(costs[candidates], kind="stable")]
+        selected = _select_collapses(positions, faces, edges, edge_counts, on_boundary, edge_positions, candidates)
+        selected = selected[np.argsort(costs[selected], kind="stable")]
+        selected = selected[np.cumsum(edge_counts[selected]) <= len(faces) - target]
+        if len(selected) == 0:
+            break
+
+        kept, removed = edges[selected, 0], edges[selected, 1]
+        positions[kept] = edge_positions[selected]
+        quadrics[kept] += quadrics[removed]
+        areas[kept] += areas[removed]
+        changed = np.zeros(num_vertices, dtype=bool)
+        changed[kept] = True
+        remap = np.arange(num_vertices)
+        remap[removed] = kept
+        faces = remap[faces]
+        faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+        num_rounds += 1
+
+    logger.debug("Decimated the mesh in %d rounds.", num_rounds)
+    used = np.zeros(num_vertices, dtype=bool)
+    used[faces.ravel()] = True
+    new_index = np.cumsum(used) - 1
+    return positions[used].astype(vertices.dtype), new_index[faces]
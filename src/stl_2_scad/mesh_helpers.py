@@ -0,0 +1,334 @@
+"""
+Module containing the helpers for processing triangle meshes of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Odd 64-bit constants used to mix the three coordinate keys of a vertex into
+# a single 64-bit hash value.
+_HASH_FACTORS = (
+    np.uint64(0x9E3779B97F4A7C15),
+    np.uint64(0xC2B2AE3D27D4EB4F),
+    np.uint64(0x165667B19E3779F9),
+)
+_HASH_FINALIZER = np.uint64(0xBF58476D1CE4E5B9)
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def _get_vertex_keys(points: np.ndarray, tolerance: float) -> List[np.ndarray]:
+    """Get one contiguous integer key array per axis that are equal for vertices to weld."""
+    if tolerance > 0.0:
+        return [np.floor(points[:, axis] / tolerance + 0.5).astype(np.int64).view(np.uint64) for axis in range(3)]
+
+    # Adding 0.0 turns -0.0 into 0.0, so both get the same bit pattern.
+    key_dtype = np.dtype(f"u{points.dtype.itemsize}")
+    return [np.ascontiguousarray(points[:, axis] + points.dtype.type(0.0)).view(key_dtype) for axis in range(3)]
+
+
+def _hash_vertex_keys(keys: List[np.ndarray]) -> np.ndarray:
+    """Mix the three keys of each vertex into a single 64-bit hash value."""
+    hashes = keys[0] * _HASH_FACTORS[0]
+    for key, factor in zip(keys[1:], _HASH_FACTORS[1:]):
+        hashes ^= key * factor
+    hashes ^= hashes >> np.uint64(31)
+    hashes *= _HASH_FINALIZER
+    hashes ^= hashes >> np.uint64(29)
+    return hashes
+
+
+def _sort_vertex_keys(keys: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort the vertex keys so that equal keys are adjacent.
+
+    Sorting a single 64-bit hash is much faster than a lexicographic sort of
+    the three keys. Only if two different keys share the same hash value, the
+    lexicographic sort is used instead.
+
+    Returns:
+        The sort order and a flag for each sorted entry that marks the start
+        of a group of equal keys.
+    """
+    hashes = _hash_vertex_keys(keys)
+    order = np.argsort(hashes)
+    sorted_hashes = hashes[order]
+    is_new = np.empty(len(order), dtype=bool)
+    is_new[0] = True
+    np.not_equal(sorted_hashes[1:], sorted_hashes[:-1], out=is_new[1:])
+
+    collision = False
+    for key in keys:
+        sorted_key = key[order]
+        collision = collision or bool(np.any((sorted_key[1:] != sorted_key[:-1]) & ~is_new[1:]))
+    if not collision:
+        return order, is_new
+
+    logging.getLogger(__name__).debug("Hash collision detected, using lexicographic sort.")
+    order = np.lexsort(keys[::-1])
+    is_new[1:] = False
+    for key in keys:
+        sorted_key = key[order]
+        is_new[1:] |= sorted_key[1:] != sorted_key[:-1]
+    return order, is_new
+
+
+def group_rows(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort the rows of a non-negative integer array of shape (n, k) with k <= 3 so that equal rows are adjacent.
+
+    If the rows fit into a single 64-bit key, e.g., edges or the faces of
+    meshes with up to two million vertices, only this key is sorted.
+    Otherwise, the rows are sorted like the vertex keys by weld_vertices().
+
+    Returns:
+        The sort order and a flag for each sorted row that marks the start of
+        a group of equal rows.
+    """
+    if len(rows) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+
+    base = int(rows.max()) + 1
+    if base ** rows.shape[1] < 1 << 63:
+        keys = rows[:, 0].astype(np.int64)
+        for column in range(1, rows.shape[1]):
+            keys *= base
+            keys += rows[:, column]
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        is_new = np.empty(len(order), dtype=bool)
+        is_new[0] = True
+        np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=is_new[1:])
+        return order, is_new
+
+    columns = [np.ascontiguousarray(rows[:, column]).astype(np.uint64) for column in range(rows.shape[1])]
+    columns += [np.zeros(len(rows), dtype=np.uint64)] * (3 - len(columns))
+    return _sort_vertex_keys(columns)
+
+
+def weld_vertices(triangles: np.ndarray, tolerance: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Weld the vertices of the given triangles into an indexed mesh.
+
+    Args:
+        triangles: Array of shape (n, 3, 3) containing the three vertices of
+                   each triangle, e.g., the `vectors` of a numpy-stl mesh.
+        tolerance: If zero, only identical vertices are welded. Otherwise
+                   the vertices are snapped to a grid of the given size and
+                   vertices in the same grid cell are welded.
+
+    Returns:
+        The unique vertices of shape (m, 3) in the order of their first
+        occurrence and the faces of shape (k, 3) containing the vertex
+        indices of each triangle. Triangles that degenerate to a line or
+        point by welding are removed.
+    """
+    points = triangles.reshape(-1, 3)
+    if len(points) == 0:
+        return np.empty((0, 3), dtype=points.dtype), np.empty((0, 3), dtype=np.int64)
+
+    order, is_new = _sort_vertex_keys(_get_vertex_keys(points, tolerance))
+    group_starts = np.flatnonzero(is_new)
+    first_occurrence = np.minimum.reduceat(order, group_starts)
+
+    # Number the groups by their first occurrence to keep the original order
+    rank = np.empty(len(first_occurrence), dtype=np.int64)
+    rank[np.argsort(first_occurrence)] = np.arange(len(first_occurrence))
+    inverse = np.empty(len(points), dtype=np.int64)
+    inverse[order] = rank[np.cumsum(is_new) - 1]
+
+    vertices = points[np.sort(first_occurrence)]
+    faces = inverse.reshape(-1, 3)
+
+    degenerated = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 0] == faces[:, 2])
+    if np.any(degenerated):
+        logging.getLogger(__name__).debug("Removed %d degenerated triangles.", np.count_nonzero(degenerated))
+        faces = faces[~degenerated]
+
+    return vertices, faces
+
+
+def remove_duplicate_faces(vertices: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Remove duplicate faces and unused vertices of an indexed mesh.
+
+    Two faces are duplicates if they contain the same vertices in the same
+    cyclic order. The first occurrence of each face is kept. The remaining
+    vertices and faces keep their order.
+
+    Returns:
+        The used vertices and the unique faces referencing them.
+    """
+    if len(faces) > 0:
+        # Rotate each face so that it starts with its smallest index, keeping the winding order
+        shift = np.argmin(faces, axis=1)
+        rotated = faces[np.arange(len(faces))[:, None], (shift[:, None] + np.arange(3)) % 3]
+        _, first_occurrence = np.unique(rotated, axis=0, return_index=True)
+        if len(first_occurrence) < len(faces):
+            logging.getLogger(__name__).debug("Removed %d duplicate faces.", len(faces) - len(first_occurrence))
+            faces = faces[np.sort(first_occurrence)]
+
+    used = np.zeros(len(vertices), dtype=bool)
+    used[faces.ravel()] = True
+    if np.all(used):
+        return vertices, faces
+    logging.getLogger(__name__).debug("Removed %d unused vertices.", len(vertices) - np.count_nonzero(used))
+    new_index = np.cumsum(used) - 1
+    return vertices[used], new_index[faces]
+
+
+def get_connected_components(faces: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, int]:
+    """Get the connected components of an indexed mesh, i.e., the parts sharing no vertex.
+
+    The components are found by a vectorized union-find over the vertex
+    indices: In each round, the root of each edge with different roots is
+    hooked to the smaller root, and the paths are compressed by pointer
+    jumping until each vertex points to its root. Afterwards, the edges are
+    replaced by the edges between their roots, and only edges connecting
+    different roots remain for the next round. Each round takes linear time
+    and the number of remaining edges shrinks quickly, so the total time is
+    linear in the number of faces for meshes.
+
+    As a vertex is only hooked to smaller vertices, the root of each component
+    is its smallest vertex index. So the components are numbered in the order
+    of their first vertex, which is the order of their first face for meshes
+    returned by weld_vertices().
+
+    Returns:
+        The component index of each face and the number of components.
+    """
+    parent = np.arange(num_vertices)
+    first = np.concatenate([faces[:, 0], faces[:, 0]])
+    second = np.concatenate([faces[:, 1], faces[:, 2]])
+    while len(first) > 0:
+        parent[np.maximum(first, second)] = np.minimum(first, second)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        first = parent[first]
+        second = parent[second]
+        connecting = first != second
+        first = first[connecting]
+        second = second[connecting]
+
+    used = np.zeros(num_vertices, dtype=bool)
+    used[faces.ravel()] = True
+    is_root = used & (parent == np.arange(num_vertices))
+    component = np.cumsum(is_root) - 1
+    return component[parent[faces[:, 0]]], int(np.count_nonzero(is_root))
+
+
+def split_mesh(vertices: np.ndarray, faces: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Split an indexed mesh into its connected components. See get_connected_components() for details.
+
+    Returns:
+        The vertices and faces of each component. The vertices and faces keep
+        their order within each component.
+    """
+    face_components, num_components = get_connected_components(faces, len(vertices))
+    if num_components <= 1:
+        return [(vertices, faces)] if len(faces) > 0 else []
+
+    # Assign each used vertex to the component of its faces and number the vertices within each component
+    vertex_components = np.full(len(vertices), num_components, dtype=np.int64)
+    vertex_components[faces.ravel()] = np.repeat(face_components, 3)
+    vertex_order = np.argsort(vertex_components, kind="stable")
+    vertex_ends = np.cumsum(np.bincount(vertex_components, minlength=num_components + 1))
+    local_index = np.empty(len(vertices), dtype=np.int64)
+    local_index[vertex_order] = np.arange(len(vertices)) - np.repeat(
+        np.concatenate([[0], vertex_ends[:-1]]), np.diff(np.concatenate([[0], vertex_ends]))
+    )
+
+    face_order = np.argsort(face_components, kind="stable")
+    face_ends = np.cumsum(np.bincount(face_components, minlength=num_components))
+    parts = []
+    vertex_start = 0
+    face_start = 0
+    for vertex_end, face_end in zip(vertex_ends[:num_components].tolist(), face_ends.tolist()):
+        parts.append(
+            (
+                vertices[vertex_order[vertex_start:vertex_end]],
+                local_index[faces[face_order[face_start:face_end]]],
+            )
+        )
+        vertex_start = vertex_end
+        face_start = face_end
+    logging.getLogger(__name__).debug("Split the mesh into %d connected components.", num_components)
+    return parts
+
+
+def _get_face_cells(vertices: np.ndarray, faces: np.ndarray, divisions: int) -> np.ndarray:
+    """Get the index of the grid cell containing the centroid of each face. See tile_mesh() for details."""
+    points = vertices.astype(np.float64)
+    centroids = points[faces[:, 0]]
+    centroids += points[faces[:, 1]]
+    centroids += points[faces[:, 2]]
+    lower = centroids.min(axis=0)
+    extent = centroids.max(axis=0) - lower
+    scale = np.divide(divisions, extent, out=np.zeros(3), where=extent > 0.0)
+    centroids -= lower
+    centroids *= scale
+    cells = np.minimum(centroids.astype(np.int64), divisions - 1)
+    return (cells[:, 0] * divisions + cells[:, 1]) * divisions + cells[:, 2]
+
+
+def tile_mesh(
+    vertices: np.ndarray, faces: np.ndarray, divisions: int
+) -> List[Tuple[Tuple[int, int, int], np.ndarray, np.ndarray]]:
+    """Partition an indexed mesh into the cells of a uniform grid of divisions^3 cells.
+
+    Each face is assigned to the cell containing its centroid, where the grid
+    spans the bounding box of the centroids. The faces are bucketed in one
+    pass by sorting them by their cell index. The vertices of each cell are
+    the unique (cell, vertex) pairs of the corners, so vertices of faces in
+    several cells are copied into each of them.
+
+    Returns:
+        The grid index (x, y, z), the vertices and the faces of each non-empty
+        cell in the order of the grid indices. The vertices and faces keep
+        their order within each cell.
+    """
+    # pylint: disable=too-many-locals
+    if len(faces) == 0:
+        return []
+
+    face_cells = _get_face_cells(vertices, faces, divisions)
+    face_order = np.argsort(face_cells, kind="stable")
+    sorted_cells = face_cells[face_order]
+    face_starts = np.flatnonzero(np.concatenate([[True], sorted_cells[1:] != sorted_cells[:-1]]))
+    cell_ids = sorted_cells[face_starts]
+
+    # Number the vertices of each cell by sorting the (cell, vertex) pairs of all corners
+    corner_keys = np.repeat(sorted_cells, 3) * len(vertices) + faces[face_order].ravel()
+    vertex_keys, local_index = np.unique(corner_keys, return_inverse=True)
+    vertex_starts = np.searchsorted(vertex_keys, cell_ids * len(vertices))
+    face_counts = np.diff(np.append(face_starts, len(faces)))
+    local_faces = local_index.reshape(-1, 3) - np.repeat(vertex_starts, face_counts)[:, None]
+    vertex_ids = vertex_keys % len(vertices)
+
+    tiles = []
+    vertex_ends = np.append(vertex_starts[1:], len(vertex_keys))
+    face_ends = face_starts + face_counts
+    for cell_id, vertex_start, vertex_end, face_start, face_end in zip(
+        cell_ids.tolist(), vertex_starts.tolist(), vertex_ends.tolist(), face_starts.tolist(), face_ends.tolist()
+    ):
+        grid_index = (cell_id // divisions**2, cell_id // divisions % divisions, cell_id % divisions)
+        tiles.append((grid_index, vertices[vertex_ids[vertex_start:vertex_end]], local_faces[face_start:face_end]))
+    logging.getLogger(__name__).debug("Partitioned the mesh into %d non-empty tiles.", len(tiles))
+    return tiles
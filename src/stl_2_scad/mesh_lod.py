@@ -0,0 +1,136 @@
+"""
+Module containing the generation of the levels of detail of meshes of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import concurrent.futures
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from stl_2_scad.mesh_decimation import decimate_mesh
+
+
+# -----------------------------------------------------------------------------
+# Shared Memory
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class SharedArray:
+    """Description of a numpy array stored in a shared memory block, which is passed to the worker processes."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+@contextlib.contextmanager
+def share_array(array: np.ndarray) -> Iterator[SharedArray]:
+    """Copy the array into a new shared memory block, which is released when the context is left."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        yield SharedArray(block.name, array.shape, array.dtype.str)
+    finally:
+        block.close()
+        block.unlink()
+
+
+@contextlib.contextmanager
+def attach_array(shared: SharedArray) -> Iterator[np.ndarray]:
+    """Get a read-only view of the array in the shared memory block without copying it."""
+    # The worker processes share the resource tracker of the main process, so attaching the block
+    # registers it again without effect, and it is unlinked only by share_array().
+    block = shared_memory.SharedMemory(name=shared.name)
+    try:
+        array: np.ndarray = np.ndarray(shared.shape, dtype=np.dtype(shared.dtype), buffer=block.buf)
+        array.flags.writeable = False
+        yield array
+        # The view must be released before the block can be closed
+        del array
+    finally:
+        block.close()
+
+
+# -----------------------------------------------------------------------------
+# Levels of Detail
+# -----------------------------------------------------------------------------
+def get_lod_target_faces(num_faces: int, ratios: Sequence[float]) -> List[int]:
+    """Get the number of faces of each level of detail given as ratio of the number of faces of the full mesh."""
+    return [max(int(round(num_faces * ratio)), 1) for ratio in ratios]
+
+
+def decimate_shared_mesh(
+    shared_vertices: SharedArray, shared_faces: SharedArray, target_faces: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Decimate the mesh stored in shared memory. This function is executed by the worker processes."""
+    with attach_array(shared_vertices) as vertices, attach_array(shared_faces) as faces:
+        return decimate_mesh(vertices, faces, target_faces)
+
+
+def get_worker_context() -> multiprocessing.context.BaseContext:
+    """Get the context starting the worker processes without forking this process.
+
+    The embed subcommand decimates the levels while the thread of the
+    pipelined writer is running, which might hold locks that a forked
+    process inherits in the locked state.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def get_lod_meshes(
+    vertices: np.ndarray, faces: np.ndarray, ratios: Sequence[float]
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Get the decimated meshes of the levels of detail given as ratios of the number of faces.
+
+    Each level is decimated from the full mesh by its own worker process.
+    The vertices and faces are copied once into shared memory blocks, which
+    the workers map instead of receiving a pickled copy of the mesh, and
+    only the much smaller decimated meshes are returned by pickling.
+
+    The levels are decimated sequentially if there is only one level or if
+    this is not the main process, e.g., a worker of the batch or serve
+    subcommands, so these don't start nested worker pools.
+    """
+    logger = logging.getLogger(__name__)
+    start = time.perf_counter()
+    targets = get_lod_target_faces(len(faces), ratios)
+    num_workers = min(len(targets), os.cpu_count() or 1)
+    if num_workers <= 1 or multiprocessing.parent_process() is not None:
+        levels = [decimate_mesh(vertices, faces, target) for target in targets]
+    else:
+        with share_array(vertices) as shared_vertices, share_array(faces) as shared_faces:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_workers, mp_context=get_worker_context()
+            ) as executor:
+                futures = [
+                    executor.submit(decimate_shared_mesh, shared_vertices, shared_faces, target) for target in targets
+                ]
+                levels = [future.result() for future in futures]
+
+    logger.info(
+        "Decimated %d faces to %s faces for %d levels of detail in %.3f s.",
+        len(faces),
+        ", ".join(str(len(level_faces)) for _, level_faces in levels),
+        len(levels),
+        time.perf_counter() - start,
+    )
+    return levels
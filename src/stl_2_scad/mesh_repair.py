@@ -0,0 +1,384 @@
+"""
+Module containing the validation and repair of triangle meshes of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import logging
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from stl_2_scad.mesh_helpers import group_rows
+from stl_2_scad.scad_writer import iter_chunks
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Faces whose area is at most this fraction of the squared diagonal of the
+# bounding box are degenerate.
+DEGENERATE_AREA_EPSILON = 1e-14
+
+# Maximum number of closed shells tested for nesting. Shells inside another
+# shell are cavities and are oriented inwards. Meshes with more closed shells
+# orient all of them outwards.
+NESTING_MAX_SHELLS = 4096
+
+
+# -----------------------------------------------------------------------------
+# Defects
+# -----------------------------------------------------------------------------
+@dataclass
+class MeshDefects:
+    """Defects of an indexed mesh found by check_mesh().
+
+    The degenerate and duplicate faces and the inconsistent edges and
+    inverted shells are fixed by repair_mesh(). The boundary edges of holes,
+    the non-manifold edges and the non-orientable shells are only reported.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    vertices: int = 0
+    faces: int = 0
+    degenerate_faces: int = 0
+    duplicate_faces: int = 0
+    inconsistent_edges: int = 0
+    boundary_edges: int = 0
+    non_manifold_edges: int = 0
+    shells: int = 0
+    inverted_shells: int = 0
+    non_orientable_shells: int = 0
+
+    def has_defects(self) -> bool:
+        """Check if the mesh has any defect."""
+        return any(
+            [
+                self.degenerate_faces,
+                self.duplicate_faces,
+                self.inconsistent_edges,
+                self.boundary_edges,
+                self.non_manifold_edges,
+                self.inverted_shells,
+                self.non_orientable_shells,
+            ]
+        )
+
+
+@dataclass(frozen=True)
+class _EdgeTopology:
+    """Faces adjacent to the edges of an indexed mesh.
+
+    Each manifold edge shared by exactly two faces connects the faces first
+    and second. It is inconsistent if both faces use the edge in the same
+    direction, i.e., if one of them must be flipped.
+    """
+
+    first: np.ndarray
+    second: np.ndarray
+    inconsistent: np.ndarray
+    open_faces: np.ndarray
+    boundary_edges: int
+    non_manifold_edges: int
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def _get_face_products(vertices: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the squared doubled area and the signed sixfold volume of the tetrahedron with the origin of each face.
+
+    The faces are processed in chunks in float64 precision, so the memory
+    usage is independent of the number of faces.
+    """
+    squared_areas = np.empty(len(faces))
+    volumes = np.empty(len(faces))
+    start = 0
+    for chunk in iter_chunks(faces):
+        corners = vertices[chunk].astype(np.float64)
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        squared_areas[start : start + len(chunk)] = np.einsum("ij,ij->i", normals, normals)
+        volumes[start : start + len(chunk)] = np.einsum(
+            "ij,ij->i", corners[:, 0], np.cross(corners[:, 1], corners[:, 2])
+        )
+        start += len(chunk)
+    return squared_areas, volumes
+
+
+def _get_degenerate_faces(vertices: np.ndarray, squared_areas: np.ndarray) -> np.ndarray:
+    """Get a flag for each face with (almost) zero area."""
+    diagonal = vertices.max(axis=0).astype(np.float64) - vertices.min(axis=0)
+    limit = 2.0 * DEGENERATE_AREA_EPSILON * float(diagonal @ diagonal)
+    return squared_areas <= limit * limit
+
+
+def _get_duplicate_faces(faces: np.ndarray) -> np.ndarray:
+    """Get a flag for each face using the same vertices as a previous face, regardless of the winding order."""
+    order, is_new = group_rows(np.sort(faces, axis=1))
+    duplicate = np.ones(len(faces), dtype=bool)
+    duplicate[np.minimum.reduceat(order, np.flatnonzero(is_new))] = False
+    return duplicate
+
+
+def _get_edge_topology(faces: np.ndarray) -> _EdgeTopology:
+    """Get the faces adjacent to each edge by sorting the undirected edges of all faces."""
+    starts = faces.ravel()
+    ends = faces[:, [1, 2, 0]].ravel()
+    order, is_new = group_rows(np.stack([np.minimum(starts, ends), np.maximum(starts, ends)], axis=1))
+    group_starts = np.flatnonzero(is_new)
+    counts = np.diff(np.append(group_starts, len(order)))
+
+    # Half edges of the manifold edges, the edges shared by exactly two faces
+    manifold = group_starts[counts == 2]
+    first_edges = order[manifold]
+    second_edges = order[manifold + 1]
+    inconsistent = (starts[first_edges] < ends[first_edges]) == (starts[second_edges] < ends[second_edges])
+
+    # Faces with a boundary edge or a non-manifold edge
+    open_edges = order[np.repeat(counts != 2, counts)]
+    open_faces = np.zeros(len(faces), dtype=bool)
+    open_faces[open_edges // 3] = True
+    return _EdgeTopology(
+        first_edges // 3,
+        second_edges // 3,
+        inconsistent,
+        open_faces,
+        int(np.count_nonzero(counts == 1)),
+        int(np.count_nonzero(counts > 2)),
+    )
+
+
+def _orient_faces(num_faces: int, topology: _EdgeTopology) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the faces to flip to make the winding order consistent within each shell.
+
+    Like mesh_helpers.get_connected_components(), this is a vectorized
+    union-find over the faces connected by manifold edges, but each face also
+    stores whether it has to be flipped relative to its parent. Hooking a
+    root to another root sets this parity so that the edge becomes
+    consistent, and pointer jumping accumulates the parities along the path,
+    so in the end each face knows whether it must be flipped relative to the
+    root of its shell.
+
+    Returns:
+        The root face of the shell of each face, the flag whether each face
+        must be flipped and the roots of the shells that are not orientable,
+        e.g., Moebius strips.
+    """
+    parent = np.arange(num_faces)
+    parity = np.zeros(num_faces, dtype=bool)
+    first, second, inconsistent = topology.first, topology.second, topology.inconsistent
+    conflicts = []
+    winner = np.empty(num_faces, dtype=np.int64)
+    while len(first) > 0:
+        # Hook each root to the smaller root of one of its edges
+        high = np.maximum(first, second)
+        winner[high] = np.arange(len(high))
+        hooked = np.flatnonzero(winner[high] == np.arange(len(high)))
+        parent[high[hooked]] = np.minimum(first, second)[hooked]
+        parity[high[hooked]] = inconsistent[hooked]
+
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parity ^= parity[parent]
+            parent = grandparent
+
+        # Replace the edges by the edges between the roots
+        inconsistent = inconsistent ^ parity[first] ^ parity[second]
+        first = parent[first]
+        second = parent[second]
+        same_root = first == second
+        conflicts.append(first[same_root & inconsistent])
+        first = first[~same_root]
+        second = second[~same_root]
+        inconsistent = inconsistent[~same_root]
+
+    return parent, parity, np.unique(np.concatenate([np.empty(0, dtype=np.int64), *conflicts]))
+
+
+def _get_shell_bounds(vertices: np.ndarray, faces: np.ndarray, shells: np.ndarray, num_shells: int) -> np.ndarray:
+    """Get the minimum and maximum point of each shell as array of shape (num_shells, 2, 3)."""
+    corners = vertices[faces]
+    order = np.argsort(shells, kind="stable")
+    starts = np.flatnonzero(np.diff(shells[order], prepend=-1))
+    bounds = np.empty((num_shells, 2, 3))
+    bounds[:, 0] = np.minimum.reduceat(corners.min(axis=1)[order], starts)
+    bounds[:, 1] = np.maximum.reduceat(corners.max(axis=1)[order], starts)
+    return bounds
+
+
+def _is_inside(point: np.ndarray, corners: np.ndarray) -> bool:
+    """Check if the point is inside the closed shell given by the corners of its faces using a ray along +x."""
+    edge1 = corners[:, 1, 1:] - corners[:, 0, 1:]
+    edge2 = corners[:, 2, 1:] - corners[:, 0, 1:]
+    offset = point[1:] - corners[:, 0, 1:]
+    determinant = edge1[:, 0] * edge2[:, 1] - edge1[:, 1] * edge2[:, 0]
+    valid = determinant != 0.0
+    determinant = np.where(valid, determinant, 1.0)
+    first = (offset[:, 0] * edge2[:, 1] - offset[:, 1] * edge2[:, 0]) / determinant
+    second = (edge1[:, 0] * offset[:, 1] - edge1[:, 1] * offset[:, 0]) / determinant
+    hit = valid & (first > 0.0) & (second > 0.0) & (first + second < 1.0)
+    hit_x = (
+        corners[:, 0, 0]
+        + first * (corners[:, 1, 0] - corners[:, 0, 0])
+        + second * (corners[:, 2, 0] - corners[:, 0, 0])
+    )
+    return bool(np.count_nonzero(hit & (hit_x > point[0])) % 2)
+
+
+def _get_nesting_depths(vertices: np.ndarray, faces: np.ndarray, shells: np.ndarray, closed: np.ndarray) -> np.ndarray:
+    """Get the number of closed shells containing each shell. Shells with an odd depth are cavities."""
+    # pylint: disable=too-many-locals
+    num_shells = len(closed)
+    depths = np.zeros(num_shells, dtype=np.int64)
+    closed_shells = np.flatnonzero(closed)
+    if len(closed_shells) < 2:
+        return depths
+    if len(closed_shells) > NESTING_MAX_SHELLS:
+        logging.getLogger(__name__).debug("Not testing the nesting of %d closed shells.", len(closed_shells))
+        return depths
+
+    bounds = _get_shell_bounds(vertices, faces, shells, num_shells)[closed_shells]
+    contains = np.all(bounds[:, None, 0] < bounds[None, :, 0], axis=2) & np.all(
+        bounds[:, None, 1] > bounds[None, :, 1], axis=2
+    )
+    containers, contained = np.nonzero(contains)
+    if len(containers) == 0:
+        return depths
+
+    # Move the test point slightly off the grid, so the ray doesn't hit an edge of an axis aligned shell
+    diagonal = float(np.linalg.norm(bounds[:, 1] - bounds[:, 0], axis=1).max())
+    jitter = np.array([0.0, np.sqrt(2.0), np.sqrt(3.0)]) * 1e-9 * diagonal
+    order = np.argsort(shells, kind="stable")
+    starts = np.searchsorted(shells[order], np.arange(num_shells + 1))
+    for container, shell in zip(closed_shells[containers].tolist(), closed_shells[contained].tolist()):
+        point = vertices[faces[order[starts[shell]], 0]].astype(np.float64) + jitter
+        corners = vertices[faces[order[starts[container] : starts[container + 1]]]].astype(np.float64)
+        depths[shell] += _is_inside(point, corners)
+    return depths
+
+
+# -----------------------------------------------------------------------------
+# Check and Repair
+# -----------------------------------------------------------------------------
+def _find_defects(vertices: np.ndarray, faces: np.ndarray) -> Tuple[MeshDefects, np.ndarray, np.ndarray]:
+    """Find the defects of an indexed mesh and the changes to repair them.
+
+    Returns:
+        The defects, the faces without the degenerate and duplicate faces and
+        for each of these faces the flag whether it must be flipped to orient
+        all shells consistently.
+    """
+    # pylint: disable=too-many-locals
+    logger = logging.getLogger(__name__)
+    defects = MeshDefects(vertices=len(vertices), faces=len(faces))
+    if len(faces) == 0:
+        return defects, faces, np.zeros(0, dtype=bool)
+
+    start = time.perf_counter()
+    squared_areas, volumes = _get_face_products(vertices, faces)
+    degenerate = _get_degenerate_faces(vertices, squared_areas)
+    faces = faces[~degenerate]
+    volumes = volumes[~degenerate]
+    duplicate = _get_duplicate_faces(faces) if len(faces) > 0 else np.zeros(0, dtype=bool)
+    faces = faces[~duplicate]
+    volumes = volumes[~duplicate]
+    defects.degenerate_faces = int(np.count_nonzero(degenerate))
+    defects.duplicate_faces = int(np.count_nonzero(duplicate))
+    logger.debug("Found the degenerate and duplicate faces in %.3f s.", time.perf_counter() - start)
+    if len(faces) == 0:
+        return defects, faces, np.zeros(0, dtype=bool)
+
+    start = time.perf_counter()
+    topology = _get_edge_topology(faces)
+    roots, flip, conflicts = _orient_faces(len(faces), topology)
+    is_root = roots == np.arange(len(faces))
+    shell_index = np.cumsum(is_root) - 1
+    shells = shell_index[roots]
+    num_shells = int(np.count_nonzero(is_root))
+    logger.debug("Oriented the faces of %d shells in %.3f s.", num_shells, time.perf_counter() - start)
+
+    # Closed shells are oriented by the sign of their volume, open shells by the majority of their faces
+    start = time.perf_counter()
+    closed = np.bincount(shells, weights=topology.open_faces, minlength=num_shells) == 0
+    closed[shell_index[conflicts]] = False
+    shell_volumes = np.bincount(shells, weights=np.where(flip, -volumes, volumes), minlength=num_shells)
+    cavities = _get_nesting_depths(vertices, faces, shells, closed) % 2 == 1
+    inverted = closed & (shell_volumes != 0.0) & ((shell_volumes < 0.0) != cavities)
+    flipped_faces = np.bincount(shells, weights=flip, minlength=num_shells)
+    shell_faces = np.bincount(shells, minlength=num_shells)
+    flip ^= np.where(closed, inverted, 2 * flipped_faces > shell_faces)[shells]
+    logger.debug("Oriented the shells in %.3f s.", time.perf_counter() - start)
+
+    defects.inconsistent_edges = int(np.count_nonzero(topology.inconsistent))
+    defects.boundary_edges = topology.boundary_edges
+    defects.non_manifold_edges = topology.non_manifold_edges
+    defects.shells = num_shells
+    defects.inverted_shells = int(np.count_nonzero(inverted))
+    defects.non_orientable_shells = len(conflicts)
+    return defects, faces, flip
+
+
+def check_mesh(vertices: np.ndarray, faces: np.ndarray) -> MeshDefects:
+    """Find the defects of an indexed mesh, e.g., as returned by mesh_helpers.weld_vertices().
+
+    The shells are the sets of faces connected by manifold edges. The
+    inconsistent edges, boundary edges and non-manifold edges are counted
+    after removing the degenerate and duplicate faces.
+    """
+    return _find_defects(vertices, faces)[0]
+
+
+def repair_mesh(vertices: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray, MeshDefects]:
+    """Repair an indexed mesh, e.g., as returned by mesh_helpers.weld_vertices().
+
+    The repair removes degenerate and duplicate faces, makes the winding
+    order consistent within each shell and orients each closed shell
+    outwards, or inwards if it is a cavity inside another closed shell. Open
+    shells keep the winding order of the majority of their faces. Holes and
+    non-manifold edges are only reported.
+
+    Returns:
+        The used vertices and the repaired faces in their original order and
+        the defects found in the original mesh.
+    """
+    logger = logging.getLogger(__name__)
+    start = time.perf_counter()
+    defects, faces, flip = _find_defects(vertices, faces)
+    faces = np.where(flip[:, None], faces[:, ::-1], faces)
+
+    used = np.zeros(len(vertices), dtype=bool)
+    used[faces.ravel()] = True
+    if not np.all(used):
+        vertices, faces = vertices[used], (np.cumsum(used) - 1)[faces]
+
+    logger.info(
+        "Repaired the mesh in %.3f s: Removed %d degenerate and %d duplicate faces and flipped %d faces "
+        "to fix %d inconsistent edges and %d inverted shells.",
+        time.perf_counter() - start,
+        defects.degenerate_faces,
+        defects.duplicate_faces,
+        np.count_nonzero(flip),
+        defects.inconsistent_edges,
+        defects.inverted_shells,
+    )
+    if defects.boundary_edges or defects.non_manifold_edges or defects.non_orientable_shells:
+        logger.warning(
+            "Can't repair %d boundary edges, %d non-manifold edges and %d non-orientable shells.",
+            defects.boundary_edges,
+            defects.non_manifold_edges,
+            defects.non_orientable_shells,
+        )
+    return vertices, faces, defects
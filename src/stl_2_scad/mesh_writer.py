@@ -0,0 +1,95 @@
+"""
+Module containing the writers of mesh files of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import io
+from typing import BinaryIO, TextIO
+
+import numpy as np
+
+from stl_2_scad.scad_writer import (
+    FLOAT_FORMAT,
+    FULL_PRECISION,
+    INDEX_FORMAT,
+    Precision,
+    format_floats,
+    iter_chunks,
+)
+from stl_2_scad.settings import STL2SCAD_VERSION
+from stl_2_scad.stl_helpers import STL_COUNT_SIZE, STL_HEADER_SIZE, STL_RECORD_DTYPE
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Header of the binary STL files. It must not start with "solid", otherwise
+# the file might be detected as ASCII STL file.
+BINARY_STL_HEADER = f"Generated by stl2scad v{STL2SCAD_VERSION}".encode("ascii")[:STL_HEADER_SIZE].ljust(
+    STL_HEADER_SIZE, b" "
+)
+
+
+# -----------------------------------------------------------------------------
+# Writers
+# -----------------------------------------------------------------------------
+def write_binary_stl(file_handle: BinaryIO, vertices: np.ndarray, faces: np.ndarray) -> None:
+    """Write the indexed mesh as binary STL file with unit normals."""
+    file_handle.write(BINARY_STL_HEADER)
+    file_handle.write(len(faces).to_bytes(STL_COUNT_SIZE, "little"))
+    for chunk in iter_chunks(faces):
+        records = np.zeros(len(chunk), dtype=STL_RECORD_DTYPE)
+        records["vectors"] = vertices[chunk]
+        corners = records["vectors"].astype(np.float64)
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = np.linalg.norm(normals, axis=1)[:, None]
+        records["normals"] = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0.0)
+        file_handle.write(records.tobytes())
+
+
+def write_off(
+    file_handle: TextIO, vertices: np.ndarray, faces: np.ndarray, precision: Precision = FULL_PRECISION
+) -> None:
+    """Write the indexed mesh as OFF file with the vertices formatted with the given precision."""
+    file_handle.write(f"OFF\n{len(vertices)} {len(faces)} 0\n")
+    vertex_line = " ".join([FLOAT_FORMAT] * 3) + "\n"
+    for chunk in iter_chunks(vertices):
+        file_handle.write(format_floats(vertex_line * len(chunk), chunk, precision))
+    face_line = "3 " + " ".join([INDEX_FORMAT] * 3) + "\n"
+    for chunk in iter_chunks(faces):
+        file_handle.write((face_line * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def write_mesh(
+    file_handle: BinaryIO,
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    mesh_format: str,
+    precision: Precision = FULL_PRECISION,
+) -> None:
+    """Write the indexed mesh in the given format ('stl' or 'off') into the binary file handle.
+
+    The precision is only used for text formats.
+    """
+    if mesh_format == "stl":
+        write_binary_stl(file_handle, vertices, faces)
+    elif mesh_format == "off":
+        text_handle = io.TextIOWrapper(file_handle, encoding="utf-8", newline="\n")
+        try:
+            write_off(text_handle, vertices, faces, precision)
+        finally:
+            # Don't close the file handle of the caller together with the wrapper
+            text_handle.flush()
+            text_handle.detach()
+    else:
+        raise ValueError(f"Unsupported mesh format {mesh_format}.")
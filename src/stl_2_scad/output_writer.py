@@ -0,0 +1,182 @@
+"""
+Module containing the pipelined writing of the generated code of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import contextlib
+import gzip
+import importlib.util
+import io
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional, Sequence, TextIO, cast
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Number of characters collected into a block before it is passed to the writer thread.
+BLOCK_SIZE = 1 << 20
+
+# Maximum number of blocks waiting for the writer thread. The formatting blocks
+# if the writer falls behind, so the memory usage stays bounded.
+QUEUE_BLOCKS = 16
+
+# Suffixes of the compressed archive files.
+ARCHIVE_SUFFIXES = (".gz", ".zst")
+
+
+# -----------------------------------------------------------------------------
+# Pipelined Writer
+# -----------------------------------------------------------------------------
+class PipelinedWriter(io.TextIOBase):
+    """Text file that writes the text into the given file handles in a background thread.
+
+    The written text is collected into blocks of about BLOCK_SIZE characters,
+    which are passed to the writer thread by a queue of at most QUEUE_BLOCKS
+    blocks. So the formatting of the next block overlaps with writing and
+    compressing the previous ones. Errors of the writer thread are raised by
+    the next call of write() or close().
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, file_handles: Sequence[TextIO], name: str) -> None:
+        """Start the writer thread writing into the file handles, which are not closed by close()."""
+        super().__init__()
+        self._file_handles = list(file_handles)
+        self._name = name
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=QUEUE_BLOCKS)
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._num_chars = 0
+        self._error: Optional[Exception] = None
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._write_blocks, name="stl2scad-writer", daemon=True)
+        self._thread.start()
+
+    def writable(self) -> bool:
+        """Return True as the file is writable."""
+        return True
+
+    def write(self, text: str) -> int:
+        """Queue the text for writing and return the number of characters."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self._raise_error()
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= BLOCK_SIZE:
+            self._queue_pending()
+        return len(text)
+
+    def flush(self) -> None:
+        """Pass the collected text to the writer thread without waiting for it."""
+        self._queue_pending()
+
+    def close(self) -> None:
+        """Wait until all text is written and log the throughput."""
+        if self.closed:
+            return
+        try:
+            self._queue_pending()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            super().close()
+        self._raise_error()
+
+        seconds = time.perf_counter() - self._start
+        megabytes = self._num_chars / (1 << 20)
+        logging.getLogger(__name__).info(
+            "Wrote %.1f MB to %s in %.3f s (%.1f MB/s).", megabytes, self._name, seconds, megabytes / max(seconds, 1e-9)
+        )
+
+    def _queue_pending(self) -> None:
+        """Pass the collected text as one block to the writer thread."""
+        if self._pending:
+            block = "".join(self._pending)
+            self._pending = []
+            self._pending_size = 0
+            self._num_chars += len(block)
+            self._queue.put(block)
+
+    def _raise_error(self) -> None:
+        """Raise the error of the writer thread, if any."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_blocks(self) -> None:
+        """Write the queued blocks until the end marker None is received. This is the writer thread."""
+        while True:
+            block = self._queue.get()
+            if block is None:
+                break
+            # After an error, the blocks are still taken from the queue, so write() never blocks forever.
+            if self._error is None:
+                try:
+                    for file_handle in self._file_handles:
+                        file_handle.write(block)
+                except Exception as exception:  # pylint: disable=broad-exception-caught
+                    self._error = exception
+
+
+# -----------------------------------------------------------------------------
+# Output Files
+# -----------------------------------------------------------------------------
+def check_archive(filename: str) -> None:
+    """Check that the archive file can be written, see open_archive(). Raises ValueError otherwise."""
+    if not filename.endswith(ARCHIVE_SUFFIXES):
+        raise ValueError(f"Unsupported archive file {filename}, use one of the suffixes {', '.join(ARCHIVE_SUFFIXES)}.")
+    if filename.endswith(".zst") and importlib.util.find_spec("zstandard") is None:
+        raise ValueError("Writing .zst files requires the zstandard package.")
+
+
+def open_archive(filename: str) -> TextIO:
+    """Open the compressed archive file for writing text.
+
+    Files with the suffix .gz are compressed using gzip, files with the
+    suffix .zst using zstd, which requires the zstandard package. Raises
+    ValueError for other suffixes or if zstandard is not installed.
+    """
+    check_archive(filename)
+    if filename.endswith(".gz"):
+        return cast(TextIO, gzip.open(filename, "wt", encoding="utf-8"))
+
+    import zstandard  # pylint: disable=import-outside-toplevel,import-error
+
+    # pylint: disable=consider-using-with
+    writer = zstandard.ZstdCompressor().stream_writer(open(filename, "wb"), closefd=True)
+    return io.TextIOWrapper(writer, encoding="utf-8")
+
+
+@contextlib.contextmanager
+def open_output(filename: Optional[str], archive: Optional[str] = None) -> Iterator[TextIO]:
+    """Open the output file, or stdout if filename is None, as pipelined writer.
+
+    If archive is given, the text is written compressed into this file as
+    well, see open_archive().
+    """
+    with contextlib.ExitStack() as stack:
+        file_handles = [sys.stdout if filename is None else stack.enter_context(open(filename, "w", encoding="utf-8"))]
+        if archive is not None:
+            file_handles.append(stack.enter_context(open_archive(archive)))
+        writer = PipelinedWriter(file_handles, "stdout" if filename is None else filename)
+        try:
+            yield cast(TextIO, writer)
+        finally:
+            writer.close()
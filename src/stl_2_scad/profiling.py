@@ -0,0 +1,206 @@
+"""
+Module containing the profiling of the phases of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import contextlib
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Name of the phase covering the whole subcommand.
+TOTAL_PHASE = "total"
+
+# Profiler of the current process, if profiling is enabled.
+_PROFILER: Optional["Profiler"] = None
+
+
+# -----------------------------------------------------------------------------
+# Peak Memory
+# -----------------------------------------------------------------------------
+def read_peak_rss() -> Optional[float]:
+    """Get the peak resident set size of the process in MB or None if it is not available.
+
+    On Linux, the peak can be reset using reset_peak_rss() to get the peak of
+    each phase. On other systems, it is the peak since the process started.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as file_handle:
+            for line in file_handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak_rss / (1 << 20) if sys.platform == "darwin" else peak_rss / 1024
+
+
+def reset_peak_rss() -> None:
+    """Reset the peak resident set size to the current resident set size if supported (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as file_handle:
+            file_handle.write("5")
+    except OSError:
+        pass
+
+
+# -----------------------------------------------------------------------------
+# Profiler
+# -----------------------------------------------------------------------------
+@dataclass
+class PhaseStats:
+    """Accumulated statistics of a phase."""
+
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+
+    def add(self, other: "PhaseStats") -> None:
+        """Add the statistics of another run of the phase."""
+        self.calls += other.calls
+        self.wall_seconds += other.wall_seconds
+        self.cpu_seconds += other.cpu_seconds
+        if other.peak_rss_mb is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, other.peak_rss_mb)
+
+
+class Profiler:
+    """Collects the wall time, CPU time and peak memory of named phases.
+
+    Phases can be nested. The time of a nested phase is included in the time
+    of the outer phase, and so is its peak memory.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty profiler."""
+        self.phases: Dict[str, PhaseStats] = {}
+        self._nested_peaks: List[float] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the enclosed code as the given phase."""
+        if self._nested_peaks:
+            # Keep the peak of the outer phase so far before resetting it
+            self._nested_peaks[-1] = max(self._nested_peaks[-1], read_peak_rss() or 0.0)
+        reset_peak_rss()
+        self._nested_peaks.append(0.0)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            stats = PhaseStats(1, time.perf_counter() - start_wall, time.process_time() - start_cpu)
+            peak_rss = read_peak_rss()
+            nested_peak = self._nested_peaks.pop()
+            if peak_rss is not None:
+                stats.peak_rss_mb = max(peak_rss, nested_peak)
+                if self._nested_peaks:
+                    self._nested_peaks[-1] = max(self._nested_peaks[-1], stats.peak_rss_mb)
+            self.phases.setdefault(name, PhaseStats()).add(stats)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Get the statistics of all phases as JSON serializable dictionary."""
+        return {name: asdict(stats) for name, stats in self.phases.items()}
+
+    def merge(self, phases: Dict[str, Dict[str, Any]]) -> None:
+        """Add the statistics returned by to_dict() of another profiler, e.g., of a worker process."""
+        for name, stats in phases.items():
+            self.phases.setdefault(name, PhaseStats()).add(PhaseStats(**stats))
+
+    def write_report(self, file_handle: TextIO, report_format: str) -> None:
+        """Write the statistics of all phases as 'table' or 'json'."""
+        if report_format == "json":
+            json.dump(self.to_dict(), file_handle, indent=2)
+            file_handle.write("\n")
+            return
+
+        width = max([len("Phase")] + [len(name) for name in self.phases])
+        file_handle.write(f"{'Phase':<{width}}  {'Calls':>7}  {'Wall [s]':>9}  {'CPU [s]':>9}  {'Peak RSS [MB]':>13}\n")
+        for name, stats in sorted(
+            self.phases.items(), key=lambda item: (item[0] == TOTAL_PHASE, -item[1].wall_seconds)
+        ):
+            peak_rss = f"{stats.peak_rss_mb:>13.1f}" if stats.peak_rss_mb is not None else f"{'-':>13}"
+            file_handle.write(
+                f"{name:<{width}}  {stats.calls:>7}  {stats.wall_seconds:>9.3f}  "
+                f"{stats.cpu_seconds:>9.3f}  {peak_rss}\n"
+            )
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Get the profiler of the current process or None if profiling is disabled."""
+    return _PROFILER
+
+
+@contextlib.contextmanager
+def use_profiler(profiler: Optional[Profiler]) -> Iterator[Optional[Profiler]]:
+    """Use the given profiler for the enclosed code and restore the previous one afterwards."""
+    global _PROFILER  # pylint: disable=global-statement
+    previous = _PROFILER
+    _PROFILER = profiler
+    try:
+        yield profiler
+    finally:
+        _PROFILER = previous
+
+
+def profile_phase(name: str) -> "contextlib.AbstractContextManager[None]":
+    """Measure the enclosed code as the given phase if profiling is enabled."""
+    if _PROFILER is None:
+        return contextlib.nullcontext()
+    return _PROFILER.phase(name)
+
+
+# -----------------------------------------------------------------------------
+# Command Execution
+# -----------------------------------------------------------------------------
+def run_profiled(args) -> int:
+    """Execute the subcommand and write the profile report if requested using the --profile options."""
+    if not args.profile and args.profile_dump is None:
+        return args.func(args)
+
+    profiler = Profiler()
+    cprofile = None
+    if args.profile_dump is not None:
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        cprofile = cProfile.Profile()
+
+    try:
+        with use_profiler(profiler), profiler.phase(TOTAL_PHASE):
+            if cprofile is None:
+                return args.func(args)
+            return cprofile.runcall(args.func, args)
+    finally:
+        if cprofile is not None:
+            logging.getLogger(__name__).info("Writing cProfile statistics to file %s.", args.profile_dump)
+            cprofile.dump_stats(args.profile_dump)
+        if args.profile:
+            if args.profile_output is None:
+                profiler.write_report(sys.stderr, args.profile_format)
+            else:
+                with open(args.profile_output, "w", encoding="utf-8") as file_handle:
+                    profiler.write_report(file_handle, args.profile_format)
@@ -0,0 +1,342 @@
+"""
+Module containing the generation of the OpenSCAD modules of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import logging
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+
+from stl_2_scad.convex_hull import OrientedBoundingBox, get_oriented_bounding_box
+from stl_2_scad.mesh_cache import CachedStl
+from stl_2_scad.mesh_decimation import decimate_mesh
+from stl_2_scad.mesh_helpers import remove_duplicate_faces, split_mesh, tile_mesh
+from stl_2_scad.mesh_lod import get_lod_meshes
+from stl_2_scad.mesh_repair import repair_mesh
+from stl_2_scad.mesh_writer import write_mesh
+from stl_2_scad.profiling import profile_phase
+from stl_2_scad.scad_writer import (
+    FLOAT32_PRECISION,
+    FULL_PRECISION,
+    Precision,
+    format_float,
+    format_float_rows,
+    format_vector,
+    iter_chunks,
+    iter_triangle_face_chunks,
+    iter_triangle_vertex_chunks,
+    write_import_polyhedron_module,
+    write_lod_polyhedron_module,
+    write_parts_polyhedron_module,
+    write_polyhedron_module,
+    write_tiles_polyhedron_module,
+)
+from stl_2_scad.stl_helpers import BoundingBox, get_points_bounding_box
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Bounding boxes used to place the object.
+AnyBoundingBox = Union[BoundingBox, OrientedBoundingBox]
+
+
+# -----------------------------------------------------------------------------
+# Import
+# -----------------------------------------------------------------------------
+def get_bounding_box(stl_file: CachedStl, args) -> AnyBoundingBox:
+    """Get the axis aligned or oriented bounding box of the STL file as selected by args.bbox."""
+    if args.bbox == "oriented":
+        return stl_file.get_oriented_bounding_box()
+    return stl_file.get_bounding_box()
+
+
+def get_placement(bbox: AnyBoundingBox, precision: Precision = FULL_PRECISION) -> str:
+    """Get the statements of a module placing the object according to its bounding box and the anchor.
+
+    For an oriented bounding box, the object is rotated into the frame of the
+    box, so the anchor refers to the axes of the box. The rotation is written
+    with at least float32 precision to keep it a rotation.
+    """
+    half_dims = [format_float(value, precision) for value in bbox.half_extents]
+    center = format_vector(bbox.center, precision)
+    displacement = f"""displacement = [anchor.x * {half_dims[0]},
+                    anchor.y * {half_dims[1]},
+                    anchor.z * {half_dims[2]}];"""
+
+    if isinstance(bbox, OrientedBoundingBox):
+        rotation_precision = FULL_PRECISION if precision == FULL_PRECISION else FLOAT32_PRECISION
+        rotation = format_float_rows(np.array([row + [0.0] for row in bbox.rotation]), rotation_precision)
+        return f"""    center = {center};
+    rotation = [{rotation}];
+    {displacement}
+
+    translate(-displacement)
+    multmatrix(rotation)
+    translate(-center)
+"""
+
+    return f"""    center = {center};
+    {displacement}
+
+    translate(-center - displacement)
+"""
+
+
+def get_import_module(
+    bbox: AnyBoundingBox, object_name: str, import_path: str, precision: Precision = FULL_PRECISION
+) -> str:
+    """Get the OpenSCAD module importing the STL file with anchoring support."""
+    return f"""
+/*
+ * Import the file {Path(import_path).name}.
+ */
+module {object_name}(anchor = [0, 0, 0]) {{
+{get_placement(bbox, precision)}    import("{import_path}");
+}}
+"""
+
+
+# -----------------------------------------------------------------------------
+# Embed
+# -----------------------------------------------------------------------------
+def get_indexed_mesh(stl_file: CachedStl, args) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the welded and optionally repaired and decimated mesh as vertices and faces.
+
+    The faces have the winding order of the STL file, unless the mesh is
+    repaired, which orients the faces outwards like in a valid STL file.
+    """
+    logger = logging.getLogger(__name__)
+    vertices, faces = stl_file.get_welded(args.tolerance)
+    logger.debug("Welded %d triangles into %d vertices.", stl_file.get_triangle_count(), len(vertices))
+    if args.repair:
+        with profile_phase("repair"):
+            vertices, faces, _ = repair_mesh(vertices, faces)
+    if args.target_faces is not None or args.max_error is not None:
+        start = time.perf_counter()
+        num_faces = len(faces)
+        with profile_phase("decimate"):
+            vertices, faces = decimate_mesh(vertices, faces, args.target_faces, args.max_error)
+        logger.info(
+            "Decimated %d faces to %d faces (-%.1f %%) in %.3f s.",
+            num_faces,
+            len(faces),
+            100.0 * (num_faces - len(faces)) / max(num_faces, 1),
+            time.perf_counter() - start,
+        )
+    return vertices, faces
+
+
+def get_vertex_and_face_chunks(stl_file: CachedStl, args) -> Tuple[Iterable[np.ndarray], Iterable[np.ndarray]]:
+    """Get the vertices and faces of the polyhedron as iterables of chunks."""
+    if (
+        args.indexed
+        or args.repair
+        or args.tolerance > 0.0
+        or args.target_faces is not None
+        or args.max_error is not None
+    ):
+        vertices, faces = get_indexed_mesh(stl_file, args)
+        return iter_chunks(vertices), iter_chunks(faces if args.reverse_faces else faces[:, ::-1])
+
+    vectors = stl_file.mesh.vectors
+    return iter_triangle_vertex_chunks(vectors), iter_triangle_face_chunks(len(vectors), args.reverse_faces)
+
+
+def write_sidecar(file_handle: BinaryIO, stl_file: CachedStl, args, mesh_format: str) -> None:
+    """Write the cleaned mesh in the given format ('stl' or 'off') into the binary file handle.
+
+    The sidecar contains each vertex and face only once and keeps the winding
+    order of the STL file, unless args.reverse_faces is set.
+    """
+    logger = logging.getLogger(__name__)
+    vertices, faces = remove_duplicate_faces(*get_indexed_mesh(stl_file, args))
+    logger.info("Writing %d vertices and %d faces as %s mesh.", len(vertices), len(faces), mesh_format.upper())
+    with profile_phase("write_mesh"):
+        write_mesh(file_handle, vertices, faces[:, ::-1] if args.reverse_faces else faces, mesh_format, args.precision)
+
+
+def get_part_bounding_box(vertices: np.ndarray, args) -> AnyBoundingBox:
+    """Get the axis aligned or oriented bounding box of the vertices of a part as selected by args.bbox."""
+    if args.bbox == "oriented":
+        return get_oriented_bounding_box(vertices)
+    return get_points_bounding_box(vertices)
+
+
+def get_placement_module(
+    object_name: str,
+    polyhedron_name: str,
+    bbox: AnyBoundingBox,
+    description: str,
+    args,
+    forwarded: Sequence[str] = (),
+) -> str:
+    """Get the module <object_name> placing the polyhedron module into the scene taking the anchor into account.
+
+    The optional parameters given by forwarded are passed on to the polyhedron module.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    parameters = "".join(f", {name} = undef" for name in forwarded)
+    arguments = ", ".join(f"{name} = {name}" for name in forwarded)
+    return f"""
+/*
+ * Place the {description} into the scene taking the
+ * given anchor into account.
+ */
+module {object_name}(anchor = [0, 0, 0]{parameters}) {{
+{get_placement(bbox, args.precision)}    {polyhedron_name}({arguments});
+}}
+"""
+
+
+def write_part_modules(file_handle: TextIO, stl_file: CachedStl, args, object_name: str, file_name: str) -> None:
+    """Write the modules of each connected part of the STL file and the module polyhedron_<object_name> of all parts.
+
+    Each part i gets the module polyhedron_<object_name>_part<i> containing
+    its mesh and the module <object_name>_part<i> placing it using its own
+    bounding box.
+    """
+    vertices, faces = get_indexed_mesh(stl_file, args)
+    with profile_phase("split"):
+        parts = split_mesh(vertices, faces)
+    logging.getLogger(__name__).info("Split the mesh into %d parts.", len(parts))
+
+    part_names = []
+    for index, (part_vertices, part_faces) in enumerate(parts, start=1):
+        part_name = f"{object_name}_part{index}"
+        part_names.append(part_name)
+        write_polyhedron_module(
+            file_handle,
+            part_name,
+            file_name,
+            iter_chunks(part_vertices),
+            iter_chunks(part_faces if args.reverse_faces else part_faces[:, ::-1]),
+            args.precision,
+        )
+        file_handle.write(
+            get_placement_module(
+                part_name,
+                f"polyhedron_{part_name}",
+                get_part_bounding_box(part_vertices, args),
+                f"part {index} of the embedded STL object {object_name}",
+                args,
+            )
+        )
+    write_parts_polyhedron_module(file_handle, object_name, file_name, part_names)
+
+
+def write_tile_modules(file_handle: TextIO, stl_file: CachedStl, args, object_name: str, file_name: str) -> None:
+    """Write the modules of each tile of the STL file and the module polyhedron_<object_name> of all tiles.
+
+    The faces are partitioned into a grid of args.tile^3 cells by their
+    centroids. Each non-empty cell (x, y, z) gets the module
+    polyhedron_<object_name>_tile_<x>_<y>_<z> containing its faces.
+    """
+    vertices, faces = get_indexed_mesh(stl_file, args)
+    with profile_phase("tile"):
+        tiles = tile_mesh(vertices, faces, args.tile)
+    logging.getLogger(__name__).info("Partitioned the mesh into %d tiles.", len(tiles))
+
+    tile_bounds = []
+    for grid_index, tile_vertices, tile_faces in tiles:
+        tile_name = f"{object_name}_tile_" + "_".join(str(index) for index in grid_index)
+        write_polyhedron_module(
+            file_handle,
+            tile_name,
+            file_name,
+            iter_chunks(tile_vertices),
+            iter_chunks(tile_faces if args.reverse_faces else tile_faces[:, ::-1]),
+            args.precision,
+        )
+        bbox = get_points_bounding_box(tile_vertices)
+        tile_bounds.append((tile_name, bbox.min_point, bbox.max_point))
+    write_tiles_polyhedron_module(file_handle, object_name, file_name, tile_bounds, args.precision)
+
+
+def write_lod_modules(file_handle: TextIO, stl_file: CachedStl, args, object_name: str, file_name: str) -> None:
+    """Write the modules of each level of detail of the STL file and the module polyhedron_<object_name> selecting one.
+
+    The level 0 is the full mesh in the module polyhedron_<object_name>_lod0
+    and each level i given by the ratio args.lod[i - 1] of its number of faces
+    is written into the module polyhedron_<object_name>_lod<i>.
+    """
+    vertices, faces = get_indexed_mesh(stl_file, args)
+    with profile_phase("lod"):
+        levels = [(vertices, faces)] + get_lod_meshes(vertices, faces, args.lod)
+
+    level_names = []
+    for index, (level_vertices, level_faces) in enumerate(levels):
+        level_name = f"{object_name}_lod{index}"
+        level_names.append(level_name)
+        write_polyhedron_module(
+            file_handle,
+            level_name,
+            file_name,
+            iter_chunks(level_vertices),
+            iter_chunks(level_faces if args.reverse_faces else level_faces[:, ::-1]),
+            args.precision,
+        )
+    write_lod_polyhedron_module(file_handle, object_name, file_name, level_names)
+
+
+def write_embed_modules(
+    file_handle: TextIO,
+    stl_file: CachedStl,
+    args,
+    object_name: str,
+    file_name: str,
+    sidecar_path: Optional[str] = None,
+) -> None:
+    """Write the OpenSCAD modules embedding the STL file into the given file handle.
+
+    If sidecar_path is given, the polyhedron module imports the mesh from
+    this path instead of embedding it. Otherwise, if args.split is set, the
+    mesh is split into its connected parts, see write_part_modules(), or if
+    args.tile is set, into tiles, see write_tile_modules(), or if args.lod is
+    set, into levels of detail, see write_lod_modules().
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    forwarded: List[str] = []
+    if sidecar_path is not None:
+        bbox = get_bounding_box(stl_file, args)
+        write_import_polyhedron_module(file_handle, object_name, file_name, sidecar_path)
+    elif args.split:
+        write_part_modules(file_handle, stl_file, args, object_name, file_name)
+        bbox = get_bounding_box(stl_file, args)
+    elif args.tile is not None:
+        write_tile_modules(file_handle, stl_file, args, object_name, file_name)
+        bbox = get_bounding_box(stl_file, args)
+        forwarded.append("clip")
+    elif args.lod is not None:
+        write_lod_modules(file_handle, stl_file, args, object_name, file_name)
+        bbox = get_bounding_box(stl_file, args)
+        forwarded.append("lod")
+    else:
+        # Get the chunks first, so the bounding box is calculated from the mesh if it is loaded anyway
+        vertex_chunks, face_chunks = get_vertex_and_face_chunks(stl_file, args)
+        bbox = get_bounding_box(stl_file, args)
+        write_polyhedron_module(file_handle, object_name, file_name, vertex_chunks, face_chunks, args.precision)
+
+    file_handle.write(
+        get_placement_module(
+            object_name,
+            f"polyhedron_{object_name}",
+            bbox,
+            f"embedded STL object {object_name}",
+            args,
+            forwarded,
+        )
+    )
@@ -0,0 +1,324 @@
+"""
+Module containing the writer of the generated OpenSCAD code of stl2scad.
+
+Copyright:
+    2026 by Clemens Rabe <clemens.rabe@clemensrabe.de>
+
+    All rights reserved.
+
+    This file is part of stl2scad (https://github.com/seeraven/stl2scad)
+    and is released under the "BSD 3-Clause License". Please see the ``LICENSE`` file
+    that is included as part of this package.
+"""
+
+# -----------------------------------------------------------------------------
+# Module Import
+# -----------------------------------------------------------------------------
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, TextIO, Tuple, Union
+
+import numpy as np
+
+from stl_2_scad.profiling import profile_phase
+from stl_2_scad.settings import STL2SCAD_VERSION
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Number of rows (vertices or faces) formatted and written at once. This
+# limits the memory used for the text representation independent of the size
+# of the mesh.
+CHUNK_SIZE = 1 << 16
+
+# Format of a single float value. The values are converted to python floats
+# before formatting, so this gives the same result as the repr() of the
+# python float.
+FLOAT_FORMAT = "%r"
+
+# Format of a single index value.
+INDEX_FORMAT = "%d"
+
+# Precision of the float values in the generated code. The precision
+# FULL_PRECISION writes the repr() of the python float, FLOAT32_PRECISION the
+# shortest representation that is read back as the same float32 value and an
+# integer precision the value rounded to this number of decimals. Except for
+# FULL_PRECISION, the trailing ".0" of integer values is dropped.
+Precision = Union[str, int]
+FULL_PRECISION = "full"
+FLOAT32_PRECISION = "float32"
+
+# Number of significant decimal digits that are sufficient to represent any
+# float32 value and number of digits that every decimal number can be
+# represented with by a float32 value.
+FLOAT32_DIGITS = 9
+FLOAT32_MIN_DIGITS = 6
+
+# Powers of ten used for rounding. The powers up to 10 ** 22 are exact.
+_POWERS_OF_TEN = 10.0 ** np.arange(0, 309)
+
+# Trailing ".0" of a formatted float value.
+_TRAILING_ZERO = re.compile(r"\.0\b")
+
+
+# -----------------------------------------------------------------------------
+# Chunk Generators
+# -----------------------------------------------------------------------------
+def iter_chunks(array: np.ndarray, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Iterate over the array in chunks of chunk_size rows."""
+    for start in range(0, len(array), chunk_size):
+        yield array[start : start + chunk_size]
+
+
+def iter_triangle_vertex_chunks(triangles: np.ndarray, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Iterate over the vertices of the triangles of shape (n, 3, 3) in chunks of shape (m, 3).
+
+    Only the vertices of a single chunk are copied into a contiguous array, so
+    the strided `vectors` view of a numpy-stl mesh can be used directly.
+    """
+    for block in iter_chunks(triangles, max(1, chunk_size // 3)):
+        yield block.reshape(-1, 3)
+
+
+def iter_triangle_face_chunks(
+    num_triangles: int, reverse_faces: bool, chunk_size: int = CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """Iterate over the faces of unconnected triangles in chunks of shape (m, 3).
+
+    The vertices of triangle i are expected at the indices 3 * i to 3 * i + 2.
+    Per default, the indices of each face are given in reverse order. If
+    reverse_faces is set, they are given in the original order.
+    """
+    for start in range(0, num_triangles, chunk_size):
+        stop = min(start + chunk_size, num_triangles)
+        faces = np.arange(3 * start, 3 * stop, dtype=np.int64).reshape(-1, 3)
+        yield faces if reverse_faces else faces[:, ::-1]
+
+
+# -----------------------------------------------------------------------------
+# Rounding
+# -----------------------------------------------------------------------------
+def _round_to_digits(values: np.ndarray, shifts: np.ndarray) -> np.ndarray:
+    """Round the values to the decimal digit 10 ** -shifts.
+
+    The result is the float closest to the decimal number, because the
+    integer value is multiplied or divided by an exact power of ten (for
+    shifts up to 22 digits). So its repr() gives the decimal number.
+    """
+    scales = _POWERS_OF_TEN[np.minimum(np.abs(shifts), len(_POWERS_OF_TEN) - 1)]
+    return np.where(shifts >= 0, np.rint(values * scales) / scales, np.rint(values / scales) * scales)
+
+
+def _round_to_float32(values: np.ndarray) -> np.ndarray:
+    """Round the values to the shortest decimal number that is read back as the same float32 value.
+
+    A float32 value is represented by at most FLOAT32_DIGITS significant
+    digits. The rounding interval of a float32 value is smaller than half
+    of the spacing of decimal numbers with FLOAT32_MIN_DIGITS significant
+    digits, so if a value can be represented by this number of digits or
+    less, the rounded value is the shortest representation. Otherwise, one
+    more digit is tried until the result converts to the same float32 value.
+    """
+    single = values.astype(np.float32).ravel()
+    exact = single.astype(np.float64)
+    result = exact.copy()
+    pending = np.flatnonzero(np.isfinite(exact) & (exact != 0.0))
+    exponents = np.floor(np.log10(np.abs(exact[pending]))).astype(np.int64)
+    for digits in range(FLOAT32_MIN_DIGITS, FLOAT32_DIGITS + 1):
+        candidates = _round_to_digits(exact[pending], digits - 1 - exponents)
+        matches = candidates.astype(np.float32) == single[pending]
+        result[pending[matches]] = candidates[matches]
+        pending = pending[~matches]
+        exponents = exponents[~matches]
+        if len(pending) == 0:
+            break
+    return result.reshape(values.shape) + 0.0
+
+
+def round_values(values: np.ndarray, precision: Precision) -> np.ndarray:
+    """Round the values to the given precision. The repr() of each resulting value gives its representation."""
+    if precision == FULL_PRECISION:
+        return values
+    if precision == FLOAT32_PRECISION:
+        return _round_to_float32(values)
+    return _round_to_digits(values.astype(np.float64), np.full(values.shape, int(precision))) + 0.0
+
+
+# -----------------------------------------------------------------------------
+# Formatting
+# -----------------------------------------------------------------------------
+def format_rows(block: np.ndarray, value_format: str) -> str:
+    """Format a block of shape (m, k) as comma separated OpenSCAD vectors.
+
+    The whole block is formatted by a single string formatting operation
+    instead of formatting each value separately.
+    """
+    row_format = "[" + ", ".join([value_format] * block.shape[1]) + "]"
+    return ", ".join([row_format] * len(block)) % tuple(block.ravel().tolist())
+
+
+def format_floats(text_format: str, values: np.ndarray, precision: Precision) -> str:
+    """Format the float values with the given precision into the text_format containing one FLOAT_FORMAT per value."""
+    text = text_format % tuple(round_values(values, precision).ravel().tolist())
+    return text if precision == FULL_PRECISION else _TRAILING_ZERO.sub("", text)
+
+
+def format_float_rows(block: np.ndarray, precision: Precision) -> str:
+    """Format a block of float values of shape (m, k) as comma separated OpenSCAD vectors."""
+    row_format = "[" + ", ".join([FLOAT_FORMAT] * block.shape[1]) + "]"
+    return format_floats(", ".join([row_format] * len(block)), block, precision)
+
+
+def format_vector(values: List[float], precision: Precision = FULL_PRECISION) -> str:
+    """Format a list of float values as OpenSCAD vector with the given precision."""
+    return format_float_rows(np.array([values], dtype=np.float64), precision)
+
+
+def format_float(value: float, precision: Precision = FULL_PRECISION) -> str:
+    """Format a single float value with the given precision."""
+    return format_floats(FLOAT_FORMAT, np.array([value], dtype=np.float64), precision)
+
+
+def write_array(
+    file_handle: TextIO, chunks: Iterable[np.ndarray], value_format: str, precision: Precision = FULL_PRECISION
+) -> None:
+    """Write the chunks of rows as a single OpenSCAD vector of vectors.
+
+    The precision is only used for float values, i.e., if the value_format
+    is FLOAT_FORMAT.
+    """
+    file_handle.write("[")
+    separator = ""
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        with profile_phase("format"):
+            if value_format == FLOAT_FORMAT:
+                text = format_float_rows(chunk, precision)
+            else:
+                text = format_rows(chunk, value_format)
+        with profile_phase("write"):
+            file_handle.write(separator)
+            file_handle.write(text)
+        separator = ", "
+    file_handle.write("]")
+
+
+# -----------------------------------------------------------------------------
+# Modules
+# -----------------------------------------------------------------------------
+def write_header(file_handle: TextIO) -> None:
+    """Write the header of a generated OpenSCAD file."""
+    file_handle.write(f"""/*
+ * Generated code by stl2scad v{STL2SCAD_VERSION} (https://github.com/seeraven/stl2scad)
+ */
+""")
+
+
+def write_polyhedron_module(
+    file_handle: TextIO,
+    object_name: str,
+    file_name: str,
+    vertex_chunks: Iterable[np.ndarray],
+    face_chunks: Iterable[np.ndarray],
+    precision: Precision = FULL_PRECISION,
+) -> None:
+    """Write the module polyhedron_<object_name> containing the given vertices and faces."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    file_handle.write(f"""
+/*
+ * Embedded STL object {object_name} from file {file_name}.
+ */
+module polyhedron_{object_name}(convexity = 1) {{
+    vertices = """)
+    write_array(file_handle, vertex_chunks, FLOAT_FORMAT, precision)
+    file_handle.write(""";
+    faces = """)
+    write_array(file_handle, face_chunks, INDEX_FORMAT)
+    file_handle.write(""";
+    polyhedron(points = vertices, faces = faces, convexity = convexity);
+}
+""")
+
+
+def write_import_polyhedron_module(file_handle: TextIO, object_name: str, file_name: str, import_path: str) -> None:
+    """Write the module polyhedron_<object_name> importing the mesh from the given sidecar file."""
+    file_handle.write(f"""
+/*
+ * STL object {object_name} from file {file_name} stored in the file {Path(import_path).name}.
+ */
+module polyhedron_{object_name}(convexity = 1) {{
+    import("{import_path}", convexity = convexity);
+}}
+""")
+
+
+def write_parts_polyhedron_module(file_handle: TextIO, object_name: str, file_name: str, part_names: List[str]) -> None:
+    """Write the module polyhedron_<object_name> combining the polyhedron modules of the given parts."""
+    parts = "".join(f"    polyhedron_{part_name}(convexity = convexity);\n" for part_name in part_names)
+    file_handle.write(f"""
+/*
+ * Embedded STL object {object_name} from file {file_name} consisting of {len(part_names)} parts.
+ */
+module polyhedron_{object_name}(convexity = 1) {{
+{parts}}}
+""")
+
+
+def write_tiles_polyhedron_module(
+    file_handle: TextIO,
+    object_name: str,
+    file_name: str,
+    tiles: List[Tuple[str, List[float], List[float]]],
+    precision: Precision = FULL_PRECISION,
+) -> None:
+    """Write the module polyhedron_<object_name> combining the polyhedron modules of the given tiles.
+
+    Each tile is given by its name and the minimum and maximum point of its
+    vertices. If the module is called with a clip box, only the tiles whose
+    bounds overlap the box are instantiated.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    instances = "".join(
+        f"    if (overlaps({format_vector(min_point, precision)}, {format_vector(max_point, precision)}))\n"
+        f"        polyhedron_{tile_name}(convexity = convexity);\n"
+        for tile_name, min_point, max_point in tiles
+    )
+    file_handle.write(f"""
+/*
+ * Embedded STL object {object_name} from file {file_name} consisting of {len(tiles)} tiles.
+ * If the box clip = [min_point, max_point] is given, only the tiles
+ * overlapping this box are instantiated.
+ */
+module polyhedron_{object_name}(convexity = 1, clip = undef) {{
+    function overlaps(min_point, max_point) = is_undef(clip) || (
+        clip[0].x <= max_point.x && clip[0].y <= max_point.y && clip[0].z <= max_point.z &&
+        clip[1].x >= min_point.x && clip[1].y >= min_point.y && clip[1].z >= min_point.z);
+
+{instances}}}
+""")
+
+
+def write_lod_polyhedron_module(file_handle: TextIO, object_name: str, file_name: str, level_names: List[str]) -> None:
+    """Write the module polyhedron_<object_name> selecting one of the polyhedron modules of the levels of detail.
+
+    The first level is the full mesh and each further level is coarser. If
+    the level isn't given by the lod argument, the last level is used for
+    previews and the first level otherwise.
+    """
+    conditions = ["if (level <= 0)"] + [f"else if (level == {index})" for index in range(1, len(level_names) - 1)]
+    branches = "".join(
+        f"    {condition}\n        polyhedron_{level_name}(convexity = convexity);\n"
+        for condition, level_name in zip(conditions + ["else"], level_names)
+    )
+    file_handle.write(f"""
+/*
+ * Embedded STL object {object_name} from file {file_name} with {len(level_names)} levels of detail.
+ * The level lod = 0 is the full mesh and each further level is coarser.
+ * Per default, the coarsest level is used for previews and the full mesh
+ * for renderings.
+ */
+module polyhedron_{object_name}(convexity = 1, lod = undef) {{
+    level = is_undef(lod) ? ($preview ? {len(level_names) - 1} : 0) : lod;
+{branches}}}
+""")
@@ -21,3 +21,8 @@ import os
 # -----------------------------------------------------------------------------
 STL2SCAD_VERSION = "1.0.1"
 STL2SCAD_LOGFORMAT = os.getenv("STL2SCAD_LOGFORMAT", "%(asctime)s %(message)s")
+STL2SCAD_CACHE_DIR = os.getenv(
+    "STL2SCAD_CACHE_DIR",
+    os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "stl2scad"),
+)
+STL2SCAD_CACHE_SIZE_MB = int(os.getenv("STL2SCAD_CACHE_SIZE_MB", "1024"))
@@ -14,21 +14,484 @@ Copyright:
 # -----------------------------------------------------------------------------
 # Module Import
 # -----------------------------------------------------------------------------
-import functools
-from typing import Any
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Generator, Iterator, List, Optional, Tuple, Union
 
-import stl
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Module Variables
+# -----------------------------------------------------------------------------
+# Number of triangles (or points) reduced at once. Small enough to keep a block
+# in the CPU cache, so the min and max reduction only reads main memory once.
+BOUNDS_BLOCK_SIZE = 1 << 14
+
+# Layout of a binary STL file: An 80 byte header, the number of triangles as
+# unsigned 32-bit integer and a 50 byte record per triangle.
+STL_HEADER_SIZE = 80
+STL_COUNT_SIZE = 4
+STL_RECORD_DTYPE = np.dtype([("normals", "<f4", (3,)), ("vectors", "<f4", (3, 3)), ("attr", "<u2")])
+
+# Number of bytes of an ASCII STL file tokenized and parsed at once.
+ASCII_BLOCK_SIZE = 1 << 20
+
+# Number of bytes of a binary STL file read at once to determine the bounding
+# box without loading the whole file.
+BINARY_BLOCK_SIZE = 1 << 24
+
+# Number of float values parsed at once. Small enough to keep the state of the
+# parser of all values of a batch in the CPU cache.
+FLOAT_BATCH_SIZE = 1 << 16
+
+# Layout of a facet of an ASCII STL file as 21 whitespace separated tokens:
+#   facet normal nx ny nz outer loop vertex x y z vertex x y z vertex x y z endloop endfacet
+ASCII_FACET_TOKENS = 21
+ASCII_FACET_KEYWORDS = {
+    0: b"facet",
+    1: b"normal",
+    5: b"outer",
+    6: b"loop",
+    7: b"vertex",
+    11: b"vertex",
+    15: b"vertex",
+    19: b"endloop",
+    20: b"endfacet",
+}
+ASCII_FACET_VALUES = [2, 3, 4, 8, 9, 10, 12, 13, 14, 16, 17, 18]
+
+# Exact powers of ten used by the fast path of the float parser.
+_EXACT_POWERS_OF_TEN = np.array([10.0**exponent for exponent in range(23)])
+
+
+# -----------------------------------------------------------------------------
+# STL Mesh
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class StlMesh:
+    """Triangles of an STL file.
+
+    The normals have the shape (n, 3) and the vectors containing the three
+    vertices of each triangle have the shape (n, 3, 3). For binary STL files
+    both are read-only views on the memory mapped file.
+    """
+
+    normals: np.ndarray
+    vectors: np.ndarray
+
+    def __len__(self) -> int:
+        """Get the number of triangles."""
+        return len(self.vectors)
+
+
+# -----------------------------------------------------------------------------
+# Bounding Box
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class BoundingBox:
+    """Axis aligned bounding box of an STL object.
+
+    All values are python floats, so the bounding box can be stored in the
+    mesh cache and used without numpy. The center and half extents are
+    calculated with the precision of the mesh (usually float32) when the
+    bounding box is created using from_min_max().
+    """
+
+    min_point: List[float]
+    max_point: List[float]
+    center: List[float]
+    half_extents: List[float]
+
+    @classmethod
+    def from_min_max(cls, min_point: np.ndarray, max_point: np.ndarray) -> "BoundingBox":
+        """Create the bounding box from the minimum and maximum points."""
+        return cls(
+            min_point=[float(value) for value in min_point],
+            max_point=[float(value) for value in max_point],
+            center=[float(value) for value in (max_point + min_point) / 2],
+            half_extents=[float(value) / 2 for value in max_point - min_point],
+        )
 
 
 # -----------------------------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------------------------
-def get_stl_bounding_box(mesh: stl.mesh.Mesh):
+def _get_points_min_max(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the minimum and maximum point of an array of points of shape (n, ..., 3)."""
+    points = points.reshape(len(points), -1, 3)
+    block_size = max(1, min(BOUNDS_BLOCK_SIZE, len(points)))
+    buffer = np.empty((3, points.shape[1], block_size), dtype=points.dtype)
+    min_point = np.full(3, np.inf, dtype=points.dtype)
+    max_point = np.full(3, -np.inf, dtype=points.dtype)
+    for start in range(0, len(points), block_size):
+        block = points[start : start + block_size]
+        block_buffer = buffer[:, :, : len(block)]
+        np.copyto(block_buffer, block.transpose(2, 1, 0))
+        block_buffer = block_buffer.reshape(3, -1)
+        np.minimum(min_point, block_buffer.min(axis=1), out=min_point)
+        np.maximum(max_point, block_buffer.max(axis=1), out=max_point)
+    return min_point, max_point
+
+
+def get_points_bounding_box(points: np.ndarray) -> BoundingBox:
+    """Get the bounding box of an array of points of shape (..., 3).
+
+    The array is processed in blocks of BOUNDS_BLOCK_SIZE entries along the
+    first axis. Each block is transposed into a small, contiguous buffer with
+    one row per coordinate axis, which is reduced to its minimum and maximum
+    while it is still in the cache. So the whole reduction is a single pass
+    over the data, even for the unaligned and strided `vectors` view of a
+    numpy-stl mesh.
+    """
+    if points.size == 0:
+        raise ValueError("Can't determine the bounding box of an empty mesh.")
+    min_point, max_point = _get_points_min_max(points)
+    return BoundingBox.from_min_max(min_point, max_point)
+
+
+def get_stl_bounding_box(mesh: StlMesh) -> BoundingBox:
     """Get the bounding box of the STL mesh."""
+    return get_points_bounding_box(mesh.vectors)
+
+
+# -----------------------------------------------------------------------------
+# Loading
+# -----------------------------------------------------------------------------
+def get_binary_stl_count(filename: Union[str, os.PathLike]) -> int:
+    """Get the number of triangles of a binary STL file or -1 if it is not a binary STL file.
+
+    A file is considered a binary STL file if its size matches the number of
+    triangles given in its header. As some tools write binary files with a
+    header starting with `solid` as well, such a file is only considered an
+    ASCII file if it also contains the keyword `facet` right after the header.
+    """
+    with open(filename, "rb") as file_handle:
+        start = file_handle.read(1024)
+        size = os.fstat(file_handle.fileno()).st_size
+
+    if len(start) < STL_HEADER_SIZE + STL_COUNT_SIZE:
+        return -1
+    count = int(np.frombuffer(start, dtype="<u4", count=1, offset=STL_HEADER_SIZE)[0])
+    if size != STL_HEADER_SIZE + STL_COUNT_SIZE + count * STL_RECORD_DTYPE.itemsize:
+        return -1
+    if start.lstrip().lower().startswith(b"solid") and b"facet" in start.lower():
+        return -1
+    return count
+
+
+def load_binary_stl(filename: Union[str, os.PathLike], count: int) -> StlMesh:
+    """Load a binary STL file with the given number of triangles by memory mapping it."""
+    if count == 0:
+        records = np.empty(0, dtype=STL_RECORD_DTYPE)
+    else:
+        records = np.memmap(
+            filename, dtype=STL_RECORD_DTYPE, mode="r", offset=STL_HEADER_SIZE + STL_COUNT_SIZE, shape=(count,)
+        )
+    return StlMesh(normals=records["normals"], vectors=records["vectors"])
+
+
+def _tokenize(buffer: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the start offsets and lengths of the whitespace separated tokens of the buffer."""
+    # The bytes considered as whitespace by bytes.split() are the space and \t, \n, \v, \f, \r (9 to 13).
+    is_space = (buffer == ord(" ")) | (buffer - np.uint8(9) <= 4)
+    is_start = ~is_space
+    is_start[1:] &= is_space[:-1]
+    is_end = ~is_space
+    is_end[:-1] &= is_space[1:]
+    starts = np.flatnonzero(is_start)
+    return starts, np.flatnonzero(is_end) + 1 - starts
+
+
+def _match_keyword(buffer: np.ndarray, starts: np.ndarray, lengths: np.ndarray, keyword: bytes) -> np.ndarray:
+    """Check which of the tokens are the given lower case keyword ignoring the case."""
+    matches = lengths == len(keyword)
+    for offset, character in enumerate(keyword):
+        matches &= (np.take(buffer, starts + offset, mode="clip") | 0x20) == character
+    return matches
+
+
+def _parse_float_batch(buffer: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Parse a batch of tokens as float64 values. See _parse_floats() for details."""
+    # pylint: disable=too-many-locals
+    count = len(starts)
+    mantissa = np.zeros(count, dtype=np.uint64)
+    mantissa_digits = np.zeros(count, dtype=np.int64)
+    fraction_digits = np.zeros(count, dtype=np.int64)
+    exponent = np.zeros(count, dtype=np.int64)
+    negative = np.zeros(count, dtype=bool)
+    negative_exponent = np.zeros(count, dtype=bool)
+    has_exponent_digits = np.zeros(count, dtype=bool)
+    after_dot = np.zeros(count, dtype=bool)
+    after_e = np.zeros(count, dtype=bool)
+    previous_e = np.zeros(count, dtype=bool)
+    invalid = np.zeros(count, dtype=bool)
+
+    positions = starts.copy()
+    for position in range(int(lengths.max(initial=0))):
+        active = lengths > position
+        character = np.take(buffer, positions, mode="clip")
+        positions += 1
+
+        digit = character - np.uint8(ord("0"))
+        is_digit = (digit < 10) & active
+        is_minus = character == ord("-")
+        is_sign = is_minus | (character == ord("+"))
+        if position == 0:
+            negative = is_minus
+        else:
+            is_sign &= previous_e
+            negative_exponent |= is_sign & is_minus
+        is_dot = (character == ord(".")) & active & ~after_dot & ~after_e
+        is_e = ((character | 0x20) == ord("e")) & active & ~after_e & (mantissa_digits > 0)
+        invalid |= active & ~(is_digit | is_sign | is_dot | is_e)
+
+        is_mantissa_digit = is_digit & ~after_e
+        mantissa *= np.where(is_mantissa_digit, np.uint64(10), np.uint64(1))
+        mantissa += np.where(is_mantissa_digit, digit, np.uint8(0))
+        mantissa_digits += is_mantissa_digit
+        fraction_digits += is_mantissa_digit & after_dot
+
+        is_exponent_digit = is_digit & after_e
+        if np.any(is_exponent_digit):
+            exponent = np.where(is_exponent_digit, np.minimum(exponent * 10 + digit, 1 << 20), exponent)
+            has_exponent_digits |= is_exponent_digit
+
+        after_dot |= is_dot
+        after_e |= is_e
+        previous_e = is_e
+
+    decimal_exponent = np.where(negative_exponent, -exponent, exponent) - fraction_digits
+    fast = ~invalid & (mantissa_digits > 0) & (mantissa_digits <= 19) & (has_exponent_digits | ~after_e)
+    fast &= (mantissa <= np.uint64(1 << 53)) & (np.abs(decimal_exponent) < len(_EXACT_POWERS_OF_TEN))
+
+    power = _EXACT_POWERS_OF_TEN[np.minimum(np.abs(decimal_exponent), len(_EXACT_POWERS_OF_TEN) - 1)]
+    values = mantissa.astype(np.float64)
+    values = np.where(decimal_exponent >= 0, values * power, values / power)
+    values = np.where(negative, -values, values)
+
+    for index in np.flatnonzero(~fast):
+        values[index] = float(buffer[starts[index] : starts[index] + lengths[index]].tobytes())
+    return values
+
+
+def _parse_floats(buffer: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Parse the tokens as float64 values with the same result as the python float() function.
+
+    The tokens are parsed in batches of FLOAT_BATCH_SIZE tokens, one character
+    position at a time for all tokens of the batch. Tokens of the form
+    [+-]digits[.digits][(e|E)[+-]digits] with at most 19 digits, at most 2^53
+    as mantissa and at most 22 as absolute decimal exponent are converted by
+    a single multiplication or division by an exact power of ten, which gives
+    the correctly rounded result. The remaining tokens are rare and are
+    converted using float(), which raises a ValueError for invalid tokens.
+    """
+    return np.concatenate(
+        [np.empty(0)]
+        + [
+            _parse_float_batch(
+                buffer, starts[start : start + FLOAT_BATCH_SIZE], lengths[start : start + FLOAT_BATCH_SIZE]
+            )
+            for start in range(0, len(starts), FLOAT_BATCH_SIZE)
+        ]
+    )
+
+
+def _parse_ascii_facets(buffer: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Parse the tokens of complete facets and return the vertices of shape (n, 3, 3) as float32."""
+    facet_starts = starts.reshape(-1, ASCII_FACET_TOKENS)
+    facet_lengths = lengths.reshape(-1, ASCII_FACET_TOKENS)
+    for column, keyword in ASCII_FACET_KEYWORDS.items():
+        if not np.all(_match_keyword(buffer, facet_starts[:, column], facet_lengths[:, column], keyword)):
+            raise ValueError(f"Unexpected token instead of keyword {keyword.decode()}.")
+
+    values = _parse_floats(
+        buffer, facet_starts[:, ASCII_FACET_VALUES].ravel(), facet_lengths[:, ASCII_FACET_VALUES].ravel()
+    )
+    # The normals are only parsed to detect invalid values, as they are
+    # recalculated from the vertices like numpy-stl does.
+    return values.reshape((-1, 4, 3))[:, 1:].astype(np.float32)
+
+
+def _iter_ascii_solid_blocks(
+    file_handle: BinaryIO, data: bytes, block_size: int
+) -> Generator[np.ndarray, None, Optional[bytes]]:
+    """Iterate over the vertices of the triangles of a single solid of an ASCII STL file in blocks.
+
+    The data contains the bytes following the solid line that were already
+    read from the file. Returns the bytes following the endsolid line that
+    were already read from the file or None at the end of the file.
+    """
+    while True:
+        block = file_handle.read(block_size)
+        data += block
+        end = len(data) if not block else data.rfind(b"\n") + 1
+        buffer = np.frombuffer(data, dtype=np.uint8, count=end)
+        starts, lengths = _tokenize(buffer)
+
+        # Locate the end of the solid at the start of the first token that is not a facet
+        num_facets = len(starts) // ASCII_FACET_TOKENS
+        boundaries = np.arange(0, len(starts), ASCII_FACET_TOKENS)
+        not_facet = np.flatnonzero(~_match_keyword(buffer, starts[boundaries], lengths[boundaries], b"facet"))
+        if len(not_facet) > 0:
+            first = boundaries[not_facet[0]]
+            if lengths[first] >= 8 and data[starts[first] : starts[first] + 8].lower() == b"endsolid":
+                line_end = data.find(b"\n", starts[first])
+            elif (
+                _match_keyword(buffer, starts[first : first + 1], lengths[first : first + 1], b"end")[0]
+                and first + 1 < len(starts)
+                and data[starts[first + 1] : starts[first + 1] + 5].lower() == b"solid"
+            ):
+                line_end = data.find(b"\n", starts[first + 1])
+            else:
+                raise ValueError("Unexpected token instead of keyword facet.")
+            yield _parse_ascii_facets(buffer, starts[:first], lengths[:first])
+            return data[line_end + 1 :] if line_end >= 0 else None
+
+        if not block:
+            raise ValueError("Unexpected end of file.")
+        tokens = num_facets * ASCII_FACET_TOKENS
+        yield _parse_ascii_facets(buffer, starts[:tokens], lengths[:tokens])
+        data = data[starts[tokens] if tokens < len(starts) else end :]
+
+
+def _skip_solid_line(file_handle: BinaryIO, data: bytes, block_size: int) -> Optional[bytes]:
+    """Skip the solid line of the next solid of an ASCII STL file.
+
+    Returns the bytes following the solid line that were already read from
+    the file or None if no further solid follows.
+    """
+    data = data.lstrip()
+    while b"\n" not in data:
+        block = file_handle.read(block_size)
+        if not block:
+            break
+        data = (data + block).lstrip()
+    header_end = data.find(b"\n")
+    if data[:5].lower() != b"solid" or header_end < 0:
+        return None
+    return data[header_end + 1 :]
+
+
+def iter_ascii_stl_blocks(
+    filename: Union[str, os.PathLike], block_size: int = ASCII_BLOCK_SIZE
+) -> Iterator[np.ndarray]:
+    """Iterate over the vertices of the triangles of an ASCII STL file in blocks of shape (n, 3, 3).
+
+    The file is read in blocks of about block_size bytes. All tokens of a
+    block are located and parsed by vectorized numpy operations, so the
+    memory usage is bounded by the block size. Like numpy-stl, the vertices
+    are parsed as float64 values and rounded to float32 afterwards, so the
+    result is identical. Unlike numpy-stl, which reads only the first solid,
+    the triangles of all solids of the file are returned.
+
+    Raises ValueError if the file is not a well-formed ASCII STL file.
+    """
+    with open(filename, "rb") as file_handle:
+        first_block = file_handle.read(block_size).lstrip()
+        if not first_block[:5].lower() == b"solid" or b"\n" not in first_block:
+            raise ValueError("File doesn't start with a solid line.")
+
+        data = _skip_solid_line(file_handle, first_block, block_size)
+        while data is not None:
+            data = yield from _iter_ascii_solid_blocks(file_handle, data, block_size)
+            if data is not None:
+                data = _skip_solid_line(file_handle, data, block_size)
+
+
+def iter_binary_stl_blocks(
+    filename: Union[str, os.PathLike], count: int, block_size: int = BINARY_BLOCK_SIZE
+) -> Iterator[np.ndarray]:
+    """Iterate over the vertices of the triangles of a binary STL file with the given number of triangles.
+
+    The file is read in blocks of about block_size bytes, each yielded as an
+    array of shape (n, 3, 3).
+    """
+    block_count = max(1, block_size // STL_RECORD_DTYPE.itemsize)
+    with open(filename, "rb") as file_handle:
+        file_handle.seek(STL_HEADER_SIZE + STL_COUNT_SIZE)
+        for start in range(0, count, block_count):
+            records = np.fromfile(file_handle, dtype=STL_RECORD_DTYPE, count=min(block_count, count - start))
+            yield records["vectors"]
+
+
+def get_stl_file_bounding_box(filename: Union[str, os.PathLike]) -> Tuple[BoundingBox, int]:
+    """Get the bounding box and the number of triangles of an STL file without loading the whole file.
+
+    The file is read in blocks and only the running minimum and maximum are
+    kept, so the memory usage is independent of the size of the file. Only
+    files that can't be parsed by iter_ascii_stl_blocks() are loaded
+    completely using numpy-stl.
+    """
+    logger = logging.getLogger(__name__)
+    start_time = time.perf_counter()
+    count = get_binary_stl_count(filename)
+    blocks = iter_binary_stl_blocks(filename, count) if count >= 0 else iter_ascii_stl_blocks(filename)
+
+    min_point = np.full(3, np.inf, dtype=np.float32)
+    max_point = np.full(3, -np.inf, dtype=np.float32)
+    num_triangles = 0
+    try:
+        for block in blocks:
+            block_min, block_max = _get_points_min_max(block)
+            np.minimum(min_point, block_min, out=min_point)
+            np.maximum(max_point, block_max, out=max_point)
+            num_triangles += len(block)
+    except ValueError as exception:
+        logger.debug("Can't parse file %s as ASCII STL file (%s), using numpy-stl instead.", filename, exception)
+        mesh = load_stl(filename)
+        min_point, max_point = _get_points_min_max(mesh.vectors)
+        num_triangles = len(mesh)
+
+    if num_triangles == 0:
+        raise ValueError("Can't determine the bounding box of an empty mesh.")
+
+    seconds = time.perf_counter() - start_time
+    megabytes = os.path.getsize(filename) / (1 << 20)
+    logger.debug(
+        "Read %d triangles (%.1f MB) of file %s in %.3f s (%.1f MB/s).",
+        num_triangles,
+        megabytes,
+        filename,
+        seconds,
+        megabytes / max(seconds, 1e-9),
+    )
+    return BoundingBox.from_min_max(min_point, max_point), num_triangles
+
+
+def load_ascii_stl(filename: Union[str, os.PathLike]) -> StlMesh:
+    """Load an ASCII STL file. See iter_ascii_stl_blocks() for details.
+
+    The normals are calculated from the vertices exactly like numpy-stl does.
+    """
+    vectors = np.concatenate([np.empty((0, 3, 3), dtype=np.float32), *iter_ascii_stl_blocks(filename)])
+    normals = np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    return StlMesh(normals=normals, vectors=vectors)
+
+
+def load_stl(filename: Union[str, os.PathLike]) -> StlMesh:
+    """Load an STL file.
+
+    Binary STL files are memory mapped, so no data is copied and only the
+    pages of the file that are actually accessed are read. ASCII STL files
+    are parsed using load_ascii_stl(). Only files that can't be parsed this
+    way, e.g., binary files with an invalid size, are loaded using numpy-stl.
+    """
+    logger = logging.getLogger(__name__)
+    count = get_binary_stl_count(filename)
+    if count >= 0:
+        logger.debug("Memory mapping binary STL file %s with %d triangles.", filename, count)
+        return load_binary_stl(filename, count)
+
+    try:
+        ascii_mesh = load_ascii_stl(filename)
+        logger.debug("Loaded ASCII STL file %s with %d triangles.", filename, len(ascii_mesh))
+        return ascii_mesh
+    except ValueError as exception:
+        logger.debug("Can't parse file %s as ASCII STL file (%s), using numpy-stl instead.", filename, exception)
 
-    def get_value(p: Any, i: int) -> Any:
-        return p[i]
+    import stl  # pylint: disable=import-outside-toplevel
 
-    min_point = [min(mesh.points, key=functools.partial(get_value, i=idx))[idx] for idx in range(3)]
-    max_point = [max(mesh.points, key=functools.partial(get_value, i=idx))[idx] for idx in range(3)]
-    return min_point + max_point
+    mesh = stl.mesh.Mesh.from_file(str(filename))
+    return StlMesh(normals=mesh.normals, vectors=mesh.vectors)
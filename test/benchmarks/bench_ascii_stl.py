@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark of the ASCII STL parser against numpy-stl.
+
+Usage:
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_ascii_stl.py [--sizes 10000 ...]
+
+The synthetic meshes are written as ASCII STL files using numpy-stl and
+loaded using both stl.mesh.Mesh.from_file() and load_ascii_stl(). The
+resulting vertices and normals must be bit-identical.
+"""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import stl
+from bench_helpers import create_synthetic_mesh, timed
+
+from stl_2_scad.stl_helpers import load_ascii_stl
+
+
+# ----------------------------------------------------------------------------
+#  MAIN
+# ----------------------------------------------------------------------------
+def main() -> int:
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10_000, 100_000, 1_000_000],
+        help="Number of triangles of the synthetic meshes. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'Triangles':>12} {'Size [MB]':>10} {'Parser [s]':>11} {'MB/s':>8} {'numpy-stl [s]':>14} {'Speedup':>9}")
+    with tempfile.TemporaryDirectory(prefix="stl2scad-bench-") as temp_dir:
+        for size in args.sizes:
+            filename = os.path.join(temp_dir, f"mesh_{size}.stl")
+            create_synthetic_mesh(size).save(filename, mode=stl.Mode.ASCII)
+            megabytes = os.path.getsize(filename) / (1 << 20)
+
+            mesh, new_time = timed(load_ascii_stl, filename)
+            reference, reference_time = timed(stl.mesh.Mesh.from_file, filename)
+            if not (
+                np.array_equal(mesh.vectors.view(np.uint32), reference.vectors.view(np.uint32))
+                and np.array_equal(mesh.normals.view(np.uint32), reference.normals.view(np.uint32))
+            ):
+                print(f"Mismatch for {size} triangles.")
+                failed = True
+            print(
+                f"{size:>12} {megabytes:>10.1f} {new_time:>11.4f} {megabytes / new_time:>8.1f} "
+                f"{reference_time:>14.4f} {reference_time / new_time:>8.1f}x"
+            )
+            os.remove(filename)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark of the bounding box calculation against the former implementation.
+
+Usage:
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_bounding_box.py [--sizes 10000 ...]
+
+The former implementation takes minutes on meshes with millions of triangles,
+so it is only run up to the number of triangles given by `--legacy-max`.
+"""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import argparse
+import functools
+import sys
+from typing import Any, List
+
+import numpy as np
+import stl
+from bench_helpers import create_synthetic_mesh, timed
+
+from stl_2_scad.stl_helpers import get_stl_bounding_box
+
+
+# ----------------------------------------------------------------------------
+#  FORMER IMPLEMENTATION
+# ----------------------------------------------------------------------------
+def legacy_get_stl_bounding_box(mesh: stl.mesh.Mesh) -> List[Any]:
+    """The implementation of get_stl_bounding_box of stl2scad v1.0.1."""
+
+    def get_value(p: Any, i: int) -> Any:
+        return p[i]
+
+    min_point = [min(mesh.points, key=functools.partial(get_value, i=idx))[idx] for idx in range(3)]
+    max_point = [max(mesh.points, key=functools.partial(get_value, i=idx))[idx] for idx in range(3)]
+    return min_point + max_point
+
+
+# ----------------------------------------------------------------------------
+#  MAIN
+# ----------------------------------------------------------------------------
+def main() -> int:
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10_000, 100_000, 1_000_000, 10_000_000],
+        help="Number of triangles of the synthetic meshes. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=1_000_000,
+        help="Run the former implementation only up to this number of triangles. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'Triangles':>12} {'Vectorized [s]':>15} {'Former [s]':>12} {'Speedup':>9}")
+    for size in args.sizes:
+        mesh = create_synthetic_mesh(size)
+        bbox, new_time = timed(get_stl_bounding_box, mesh)
+
+        if size > args.legacy_max:
+            print(f"{size:>12} {new_time:>15.4f} {'-':>12} {'-':>9}")
+            continue
+
+        legacy_bbox, legacy_time = timed(legacy_get_stl_bounding_box, mesh)
+        if not np.array_equal(np.concatenate([bbox.min_point, bbox.max_point]), np.array(legacy_bbox)):
+            print(f"Mismatch for {size} triangles: {bbox} != {legacy_bbox}")
+            failed = True
+        print(f"{size:>12} {new_time:>15.4f} {legacy_time:>12.4f} {legacy_time / new_time:>8.1f}x")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
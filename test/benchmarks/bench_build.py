@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark of the incremental build of a manifest with many items.
+
+Usage:
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_build.py [--items 1000] [--triangles 1000]
+        [--jobs N] [--max-seconds 1.0]
+
+A manifest of `--items` items is created, each referring to its own binary
+STL file of a synthetic mesh. The following builds are measured by calling
+`stl2scad build` in a separate process, so the times include the startup of
+the interpreter:
+
+    full      Generate all outputs.
+    no-op     Check all items without changes.
+    touched   Check all items after updating the modification times of all
+              STL files, which requires hashing them.
+
+The benchmark fails if the no-op build takes longer than `--max-seconds`.
+"""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_helpers import create_synthetic_mesh, timed
+
+STL2SCAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "stl2scad")
+
+
+# ----------------------------------------------------------------------------
+#  HELPERS
+# ----------------------------------------------------------------------------
+def create_manifest(directory: str, num_items: int, num_triangles: int) -> str:
+    """Create the STL files and the JSON manifest and return the path of the manifest."""
+    os.makedirs(os.path.join(directory, "parts"))
+    items = []
+    for index in range(num_items):
+        stl_file = f"parts/part_{index:05d}.stl"
+        create_synthetic_mesh(num_triangles, seed=index).save(os.path.join(directory, stl_file))
+        items.append({"stl": stl_file, "output": f"scad/part_{index:05d}.scad"})
+
+    manifest = os.path.join(directory, "manifest.json")
+    with open(manifest, "w", encoding="utf-8") as file_handle:
+        json.dump({"defaults": {"precision": "float32"}, "items": items}, file_handle)
+    return manifest
+
+
+def run_build(manifest: str, jobs: int) -> None:
+    """Call stl2scad build on the manifest."""
+    subprocess.run(
+        [sys.executable, STL2SCAD, "--no-cache", "build", "--jobs", str(jobs), manifest],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def touch_all(directory: str) -> None:
+    """Update the modification times of all STL files."""
+    parts_dir = os.path.join(directory, "parts")
+    for filename in os.listdir(parts_dir):
+        os.utime(os.path.join(parts_dir, filename))
+
+
+# ----------------------------------------------------------------------------
+#  MAIN
+# ----------------------------------------------------------------------------
+def main() -> int:
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000, help="Number of items. Default: %(default)s")
+    parser.add_argument(
+        "--triangles", type=int, default=1000, help="Number of triangles of each mesh. Default: %(default)s"
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=1.0,
+        help="Maximum time in seconds of the no-op build. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="stl2scad-bench-") as temp_dir:
+        manifest = create_manifest(temp_dir, args.items, args.triangles)
+        _, full_time = timed(run_build, manifest, args.jobs)
+        _, noop_time = timed(run_build, manifest, args.jobs)
+        touch_all(temp_dir)
+        _, touched_time = timed(run_build, manifest, args.jobs)
+
+    print(f"{'Items':>8} {'Full [s]':>9} {'No-op [s]':>10} {'Touched [s]':>12}")
+    print(f"{args.items:>8} {full_time:>9.3f} {noop_time:>10.3f} {touched_time:>12.3f}")
+    if noop_time > args.max_seconds:
+        print(f"The no-op build took longer than {args.max_seconds} s.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Helpers for the benchmarks of stl2scad."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import time
+from typing import Any, Callable, Tuple
+
+import numpy as np
+import stl
+
+
+# ----------------------------------------------------------------------------
+#  SYNTHETIC MESHES
+# ----------------------------------------------------------------------------
+def create_synthetic_mesh(num_triangles: int, seed: int = 0) -> stl.mesh.Mesh:
+    """Create a closed mesh of approximately the given number of triangles.
+
+    The mesh is a torus with a noisy surface, tessellated as a regular grid
+    that wraps around in both directions. So like a real scanned part every
+    vertex is shared by six triangles and each vertex is the first vertex of
+    at least one triangle.
+    """
+    rng = np.random.default_rng(seed)
+    num_u = max(3, int(np.sqrt(num_triangles / 2)))
+    num_v = max(3, num_triangles // (2 * num_u))
+
+    angle_u, angle_v = np.meshgrid(
+        np.linspace(0.0, 2 * np.pi, num_u, endpoint=False),
+        np.linspace(0.0, 2 * np.pi, num_v, endpoint=False),
+        indexing="ij",
+    )
+    radius = 20.0 + rng.uniform(-0.5, 0.5, size=angle_u.shape)
+    ring = 60.0 + radius * np.cos(angle_v)
+    points = np.stack([ring * np.cos(angle_u), ring * np.sin(angle_u), radius * np.sin(angle_v)], axis=-1)
+    points = points.astype(np.float32)
+
+    index_u, index_v = np.meshgrid(np.arange(num_u), np.arange(num_v), indexing="ij")
+    next_u = (index_u + 1) % num_u
+    next_v = (index_v + 1) % num_v
+    p00 = points[index_u, index_v].reshape(-1, 3)
+    p10 = points[next_u, index_v].reshape(-1, 3)
+    p11 = points[next_u, next_v].reshape(-1, 3)
+    p01 = points[index_u, next_v].reshape(-1, 3)
+
+    data = np.zeros(2 * num_u * num_v, dtype=stl.mesh.Mesh.dtype)
+    data["vectors"][0::2] = np.stack([p00, p10, p11], axis=1)
+    data["vectors"][1::2] = np.stack([p00, p11, p01], axis=1)
+    return stl.mesh.Mesh(data, calculate_normals=False)
+
+
+# ----------------------------------------------------------------------------
+#  TIMING
+# ----------------------------------------------------------------------------
+def timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Call the function and return its result and the elapsed wall time in seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
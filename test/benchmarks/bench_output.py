@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark of the pipelined output writer against writing directly into the file.
+
+Usage:
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_output.py [--sizes 100000 ...]
+        [--output-dir DIR] [--latency SECONDS]
+
+The embed code of synthetic meshes is generated using write_embed() into a
+file opened by open() and into the pipelined writer of open_output(). Both
+files must be identical. The file is written into a temporary directory or
+into `--output-dir`, e.g., on a network file system. A slow file system can
+be simulated using `--latency`, which sleeps the given time per MB written
+while releasing the GIL like a blocking write.
+"""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import argparse
+import contextlib
+import filecmp
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Iterator, TextIO
+from unittest import mock
+
+from bench_helpers import create_synthetic_mesh, timed
+
+from stl_2_scad.api import write_embed
+from stl_2_scad.output_writer import open_output
+
+
+# ----------------------------------------------------------------------------
+#  SLOW FILES
+# ----------------------------------------------------------------------------
+class SlowFile:
+    """Text file that sleeps the given time per MB written."""
+
+    def __init__(self, file_handle: TextIO, latency: float) -> None:
+        """Wrap the file handle."""
+        self._file_handle = file_handle
+        self._latency = latency
+
+    def write(self, text: str) -> int:
+        """Write the text and sleep according to its length."""
+        time.sleep(self._latency * len(text) / (1 << 20))
+        return self._file_handle.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward all other attributes to the wrapped file handle."""
+        return getattr(self._file_handle, name)
+
+
+@contextlib.contextmanager
+def open_slow(filename: str, latency: float) -> Iterator[TextIO]:
+    """Open the file for writing, wrapped into a SlowFile if latency is given."""
+    with open(filename, "w", encoding="utf-8") as file_handle:
+        yield SlowFile(file_handle, latency) if latency > 0.0 else file_handle  # type: ignore[misc]
+
+
+def write_direct(filename: str, mesh: Any, latency: float) -> None:
+    """Write the embed code directly into the file."""
+    with open_slow(filename, latency) as file_handle:
+        write_embed(file_handle, mesh, "mesh")
+
+
+def write_pipelined(filename: str, mesh: Any, latency: float) -> None:
+    """Write the embed code into the file using the pipelined writer."""
+    with mock.patch("stl_2_scad.output_writer.open", lambda name, *_args, **_kwargs: open_slow(name, latency)):
+        with open_output(filename) as file_handle:
+            write_embed(file_handle, mesh, "mesh")
+
+
+# ----------------------------------------------------------------------------
+#  MAIN
+# ----------------------------------------------------------------------------
+def main() -> int:
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[100_000, 1_000_000],
+        help="Number of triangles of the synthetic meshes. Default: %(default)s",
+    )
+    parser.add_argument("--output-dir", help="Directory of the written files. Default: A temporary directory.")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated time in seconds to write one MB. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'Triangles':>12} {'Size [MB]':>10} {'Direct [s]':>11} {'Pipelined [s]':>14} {'MB/s':>8} {'Speedup':>9}")
+    with tempfile.TemporaryDirectory(prefix="stl2scad-bench-", dir=args.output_dir) as temp_dir:
+        for size in args.sizes:
+            mesh = create_synthetic_mesh(size).vectors
+            direct_file = os.path.join(temp_dir, "direct.scad")
+            pipelined_file = os.path.join(temp_dir, "pipelined.scad")
+
+            _, direct_time = timed(write_direct, direct_file, mesh, args.latency)
+            _, pipelined_time = timed(write_pipelined, pipelined_file, mesh, args.latency)
+            if not filecmp.cmp(direct_file, pipelined_file, shallow=False):
+                print(f"Mismatch for {size} triangles.")
+                failed = True
+            megabytes = os.path.getsize(pipelined_file) / (1 << 20)
+            print(
+                f"{size:>12} {megabytes:>10.1f} {direct_time:>11.3f} {pipelined_time:>14.3f} "
+                f"{megabytes / pipelined_time:>8.1f} {direct_time / pipelined_time:>8.2f}x"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark of the startup time of stl2scad.
+
+Usage:
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_startup.py [--repeat 5] [--max-import-ms 250]
+
+Runs `stl2scad --version`, `stl2scad --help` and `stl2scad embed --help`
+using `python -X importtime` and prints the wall time and the cumulative
+import time of the stl_2_scad.cli module, each the minimum of `--repeat`
+runs. The benchmark fails if the import time exceeds `--max-import-ms`.
+"""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import argparse
+import os
+import subprocess
+import sys
+from typing import List
+
+from bench_helpers import timed
+
+STL2SCAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "stl2scad")
+
+ARGUMENTS = [["--version"], ["--help"], ["embed", "--help"]]
+
+
+# ----------------------------------------------------------------------------
+#  HELPERS
+# ----------------------------------------------------------------------------
+def get_cli_import_time(args: List[str]) -> int:
+    """Run stl2scad using 'python -X importtime' and return the cumulative import time of the cli in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", STL2SCAD] + args,
+        text=True,
+        check=True,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+    )
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.endswith("| stl_2_scad.cli"):
+            return int(line.split("|")[1])
+    raise RuntimeError("The module stl_2_scad.cli was not imported.")
+
+
+# ----------------------------------------------------------------------------
+#  MAIN
+# ----------------------------------------------------------------------------
+def main() -> int:
+    """Run the benchmark and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs of each call. Default: %(default)s")
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=250.0,
+        help="Maximum import time of stl_2_scad.cli in milliseconds. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'Arguments':<16} {'Wall [ms]':>10} {'Import cli [ms]':>16}")
+    for stl2scad_args in ARGUMENTS:
+        runs = [timed(get_cli_import_time, stl2scad_args) for _ in range(args.repeat)]
+        import_ms = min(import_time for import_time, _ in runs) / 1000.0
+        wall_ms = min(seconds for _, seconds in runs) * 1000.0
+        print(f"{' '.join(stl2scad_args):<16} {wall_ms:>10.1f} {import_ms:>16.1f}")
+        if import_ms > args.max_import_ms:
+            print(f"Importing stl_2_scad.cli took longer than {args.max_import_ms} ms.")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
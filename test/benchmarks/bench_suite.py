@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Benchmark suite of stl2scad with a comparison against stored results.
+
+Usage:
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_suite.py run [--sizes 1000 ...] [--output results.json]
+    PYTHONPATH=src:test/benchmarks python test/benchmarks/bench_suite.py compare baseline.json results.json
+
+The `run` command writes synthetic meshes as binary STL files and measures
+each phase in its own process, so the peak RSS of a phase doesn't include the
+memory of the other phases:
+
+    load               Load the STL file using load_stl().
+    bounding_box       Calculate the bounding box of the loaded mesh using
+                       get_stl_bounding_box().
+    file_bounding_box  Calculate the bounding box by streaming the STL file
+                       using get_stl_file_bounding_box().
+    embed              Generate and write the code of `stl2scad embed`.
+    embed_indexed      Generate and write the code of `stl2scad embed --indexed`.
+
+The wall time is the minimum of `--repeat` runs, the peak RSS the maximum.
+The results are printed as a table and written as JSON file.
+
+The `compare` command compares the results with a baseline and fails if the
+wall time or the peak RSS of a metric measured in both files exceeds the
+baseline by more than the threshold. Wall times below `--min-seconds` are
+ignored as they are dominated by noise.
+"""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import stl
+from bench_helpers import create_synthetic_mesh
+
+from stl_2_scad.settings import STL2SCAD_VERSION
+
+# Phases measured for each mesh size.
+PHASES = ["load", "bounding_box", "file_bounding_box", "embed", "embed_indexed"]
+
+# Format version of the JSON results.
+RESULTS_VERSION = 1
+
+
+# ----------------------------------------------------------------------------
+#  PHASES
+# ----------------------------------------------------------------------------
+def run_load(filename: str, _output: str) -> float:
+    """Measure the loading of the STL file."""
+    from stl_2_scad.stl_helpers import load_stl  # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+    load_stl(filename)
+    return time.perf_counter() - start
+
+
+def run_bounding_box(filename: str, _output: str) -> float:
+    """Measure the bounding box calculation of the loaded mesh."""
+    # pylint: disable=import-outside-toplevel
+    from stl_2_scad.stl_helpers import get_stl_bounding_box, load_stl
+
+    mesh = load_stl(filename)
+    start = time.perf_counter()
+    get_stl_bounding_box(mesh)
+    return time.perf_counter() - start
+
+
+def run_file_bounding_box(filename: str, _output: str) -> float:
+    """Measure the bounding box calculation by streaming the STL file."""
+    from stl_2_scad.stl_helpers import get_stl_file_bounding_box  # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+    get_stl_file_bounding_box(filename)
+    return time.perf_counter() - start
+
+
+def run_embed_command(filename: str, output: str, options: List[str]) -> float:
+    """Measure the embed subcommand including loading the STL file."""
+    from stl_2_scad.cli import get_parser  # pylint: disable=import-outside-toplevel
+
+    args = get_parser().parse_args(["--no-cache", "embed", *options, "--output", output, filename])
+    start = time.perf_counter()
+    if args.func(args) != 0:
+        raise RuntimeError(f"stl2scad embed failed for {filename}")
+    return time.perf_counter() - start
+
+
+PHASE_FUNCTIONS: Dict[str, Callable[[str, str], float]] = {
+    "load": run_load,
+    "bounding_box": run_bounding_box,
+    "file_bounding_box": run_file_bounding_box,
+    "embed": lambda filename, output: run_embed_command(filename, output, []),
+    "embed_indexed": lambda filename, output: run_embed_command(filename, output, ["--indexed"]),
+}
+
+
+def get_peak_rss_mb() -> float:
+    """Get the peak resident set size of this process in MB."""
+    import resource  # pylint: disable=import-outside-toplevel
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak_rss / (1 << 20) if sys.platform == "darwin" else peak_rss / (1 << 10)
+
+
+def run_child(phase: str, filename: str, output: str) -> int:
+    """Measure a single phase and print the result as JSON on stdout."""
+    seconds = PHASE_FUNCTIONS[phase](filename, output)
+    print(json.dumps({"seconds": seconds, "peak_rss_mb": get_peak_rss_mb()}))
+    return 0
+
+
+def measure_phase(phase: str, filename: str, output: str) -> Dict[str, float]:
+    """Measure a single phase in a new process."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "child", phase, filename, output],
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+# ----------------------------------------------------------------------------
+#  RUN
+# ----------------------------------------------------------------------------
+def get_environment() -> Dict[str, Any]:
+    """Get a description of the environment the benchmarks are run in."""
+    return {
+        "stl2scad": STL2SCAD_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(args: argparse.Namespace) -> int:
+    """Run the benchmarks and write the results."""
+    metrics: Dict[str, Dict[str, float]] = {}
+    print(f"{'Triangles':>12} {'Phase':<18} {'Time [s]':>10} {'Peak RSS [MB]':>14}")
+    with tempfile.TemporaryDirectory(prefix="stl2scad-bench-") as temp_dir:
+        for size in args.sizes:
+            filename = os.path.join(temp_dir, f"mesh_{size}.stl")
+            output = os.path.join(temp_dir, f"mesh_{size}.scad")
+            create_synthetic_mesh(size).save(filename, mode=stl.Mode.BINARY)
+
+            for phase in args.phases:
+                runs = [measure_phase(phase, filename, output) for _ in range(args.repeat)]
+                metric = {
+                    "seconds": min(run["seconds"] for run in runs),
+                    "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+                }
+                metrics[f"{phase}/{size}"] = metric
+                print(f"{size:>12} {phase:<18} {metric['seconds']:>10.4f} {metric['peak_rss_mb']:>14.1f}")
+                if os.path.exists(output):
+                    os.remove(output)
+            os.remove(filename)
+
+    results = {"version": RESULTS_VERSION, "environment": get_environment(), "metrics": metrics}
+    with open(args.output, "w", encoding="utf-8") as file_handle:
+        json.dump(results, file_handle, indent=2)
+        file_handle.write("\n")
+    print(f"\nWrote results to {args.output}.")
+    return 0
+
+
+# ----------------------------------------------------------------------------
+#  COMPARE
+# ----------------------------------------------------------------------------
+def load_metrics(filename: str) -> Dict[str, Dict[str, float]]:
+    """Load the metrics of a results file."""
+    with open(filename, "r", encoding="utf-8") as file_handle:
+        results = json.load(file_handle)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported results version in {filename}.")
+    return results["metrics"]
+
+
+def compare_results(args: argparse.Namespace) -> int:
+    """Compare the results with the baseline and fail on regressions."""
+    baseline = load_metrics(args.baseline)
+    current = load_metrics(args.results)
+
+    regressions = 0
+    print(f"{'Metric':<28} {'Value':<12} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    for name in sorted(set(baseline) & set(current), key=lambda name: (int(name.split("/")[1]), name)):
+        for value, limit in [("seconds", args.min_seconds), ("peak_rss_mb", 0.0)]:
+            old_value = baseline[name][value]
+            new_value = current[name][value]
+            change = (new_value - old_value) / old_value if old_value > 0 else 0.0
+            regressed = change > args.threshold and max(old_value, new_value) >= limit
+            regressions += regressed
+            print(
+                f"{name:<28} {value:<12} {old_value:>10.4f} {new_value:>10.4f} {change:>+7.1%}"
+                f"{'  REGRESSION' if regressed else ''}"
+            )
+
+    for name in sorted(set(baseline) - set(current)):
+        print(f"Metric {name} is missing in {args.results}.")
+
+    if regressions:
+        print(f"\n{regressions} metrics regressed by more than {args.threshold:.0%}.")
+        return 1
+    print(f"\nNo metric regressed by more than {args.threshold:.0%}.")
+    return 0
+
+
+# ----------------------------------------------------------------------------
+#  MAIN
+# ----------------------------------------------------------------------------
+def main() -> int:
+    """Parse the arguments and execute the command."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+        help="Number of triangles of the synthetic meshes. Default: %(default)s",
+    )
+    run_parser.add_argument(
+        "--phases",
+        nargs="+",
+        choices=PHASES,
+        default=PHASES,
+        help="Phases to measure. Default: All phases.",
+    )
+    run_parser.add_argument("--repeat", type=int, default=3, help="Number of runs per phase. Default: %(default)s")
+    run_parser.add_argument(
+        "--output", default="benchmark_results.json", help="JSON file of the results. Default: %(default)s"
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="Compare the results with a baseline.")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Maximum allowed relative increase of a metric. Default: %(default)s",
+    )
+    compare_parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="Ignore the wall time of metrics faster than this. Default: %(default)s",
+    )
+    compare_parser.add_argument("baseline", help="JSON file of the baseline results.")
+    compare_parser.add_argument("results", help="JSON file of the current results.")
+
+    child_parser = subparsers.add_parser("child", help="Measure a single phase (used internally).")
+    child_parser.add_argument("phase", choices=PHASES)
+    child_parser.add_argument("filename")
+    child_parser.add_argument("output")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run_benchmarks(args)
+    if args.command == "compare":
+        return compare_results(args)
+    return run_child(args.phase, args.filename, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,6 +43,14 @@ def executable(pytestconfig) -> List[str]:
     return abs_args
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory) -> Path:
+    """Use a temporary directory as the cache of stl2scad for all tests."""
+    directory = tmp_path_factory.mktemp("cache")
+    os.environ["STL2SCAD_CACHE_DIR"] = str(directory)
+    return directory
+
+
 @pytest.fixture
 def stl2scad_ifc(executable: List[str]) -> helpers.stl2scad_ifc.Stl2scadIfc:
     """Return the high-level interface to stl2scad."""
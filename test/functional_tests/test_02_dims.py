@@ -18,3 +18,12 @@ def test_dims(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
     assert "X: -3.0 - 7.0" in result.stdout
     assert "Y: -7.0 - 13.0" in result.stdout
     assert "Z: -13.0 - 17.0" in result.stdout
+
+
+def test_dims_binary(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the output of the dims subcommand on a binary STL file."""
+    result = stl2scad_ifc.run_ok(["dims", str(test_data_dir / "example_cube_binary.stl")])
+
+    assert "X: -3.0 - 7.0" in result.stdout
+    assert "Y: -7.0 - 13.0" in result.stdout
+    assert "Z: -13.0 - 17.0" in result.stdout
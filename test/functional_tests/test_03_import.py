@@ -3,8 +3,11 @@
 # ----------------------------------------------------------------------------
 #  MODULE IMPORTS
 # ----------------------------------------------------------------------------
+import math
 from pathlib import Path
+from typing import List
 
+import pytest
 from helpers.stl2scad_ifc import Stl2scadIfc
 
 
@@ -26,3 +29,74 @@ def test_import(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
 }}
 """
     assert expected_stdout in result.stdout
+
+
+def test_import_precision(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the output of the import subcommand with reduced precision."""
+    result = stl2scad_ifc.run_ok(["import", "--precision", "1", str(test_data_dir / "example_sphere.stl")])
+
+    assert "    center = [3, -7, 13];" in result.stdout
+    assert "    displacement = [anchor.x * 10,\n" in result.stdout
+
+
+def subdivide_triangle(corners: List[List[float]], subdivisions: int) -> List[List[List[float]]]:
+    """Subdivide the triangle into subdivisions * subdivisions triangles."""
+    first, second, third = corners
+
+    def get_point(i: int, j: int) -> List[float]:
+        return [
+            first[axis] + ((second[axis] - first[axis]) * i + (third[axis] - first[axis]) * j) / subdivisions
+            for axis in range(3)
+        ]
+
+    triangles = [[(i, j), (i + 1, j), (i, j + 1)] for i in range(subdivisions) for j in range(subdivisions - i)]
+    triangles += [
+        [(i + 1, j), (i + 1, j + 1), (i, j + 1)] for i in range(subdivisions) for j in range(subdivisions - i - 1)
+    ]
+    return [[get_point(i, j) for i, j in triangle] for triangle in triangles]
+
+
+def write_rotated_box(
+    filename: Path, half_extents: List[float], angle: float, center: List[float], subdivisions: int = 1
+) -> None:
+    """Write a box rotated by the angle in degrees around the z axis as ASCII STL file.
+
+    Each triangle is subdivided into subdivisions * subdivisions triangles.
+    """
+    cosine, sine = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    corners = []
+    for index in range(8):
+        offset = [half_extents[axis] * (1 if index >> axis & 1 else -1) for axis in range(3)]
+        corners.append(
+            [
+                cosine * offset[0] - sine * offset[1] + center[0],
+                sine * offset[0] + cosine * offset[1] + center[1],
+                offset[2] + center[2],
+            ]
+        )
+    faces = [[0, 2, 1], [1, 2, 3], [4, 5, 6], [5, 7, 6], [0, 1, 4], [1, 5, 4]]
+    faces += [[2, 6, 3], [3, 6, 7], [0, 4, 2], [2, 4, 6], [1, 3, 5], [3, 7, 5]]
+    lines = ["solid box"]
+    for face in faces:
+        for triangle in subdivide_triangle([corners[index] for index in face], subdivisions):
+            lines += ["facet normal 0 0 0", "outer loop"]
+            lines += [f"vertex {' '.join(repr(value) for value in vertex)}" for vertex in triangle]
+            lines += ["endloop", "endfacet"]
+    lines.append("endsolid box")
+    filename.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("subdivisions", [1, 30])
+def test_import_oriented(stl2scad_ifc: Stl2scadIfc, tmp_path: Path, subdivisions: int):
+    """Test the oriented bounding box of the import subcommand, also with the approximate hull of a fine mesh."""
+    write_rotated_box(tmp_path / "box.stl", [5.0, 2.0, 1.0], 30.0, [1.0, 2.0, 3.0], subdivisions)
+    result = stl2scad_ifc.run_ok(
+        ["--no-cache", "import", "--bbox", "oriented", "--precision", "3", "box.stl"], tmp_path
+    )
+
+    assert "    center = [1, 2, 3];\n" in result.stdout
+    assert "    rotation = [[0.8660254, 0.5, 0, 0], [-0.5, 0.8660254, 0, 0], [0, 0, 1, 0]];\n" in result.stdout
+    assert "displacement = [anchor.x * 5,\n                    anchor.y * 2,\n                    anchor.z * 1];" in (
+        result.stdout
+    )
+    assert "    translate(-displacement)\n    multmatrix(rotation)\n    translate(-center)\n" in result.stdout
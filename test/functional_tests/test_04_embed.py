@@ -0,0 +1,246 @@
+"""Test the output of the embed subcommand."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import gzip
+import json
+import re
+from pathlib import Path
+
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_embed(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the output of the embed subcommand."""
+    result = stl2scad_ifc.run_ok(["embed", str(test_data_dir / "example_cube.stl")])
+
+    assert "module polyhedron_example_cube(convexity = 1) {" in result.stdout
+    assert "    vertices = [[-3.0, 13.0, 17.0], [7.0, -7.0, 17.0], [7.0, 13.0, 17.0], [7.0, -7.0, 17.0]," in (
+        result.stdout
+    )
+    assert "    faces = [[2, 1, 0], [5, 4, 3], [8, 7, 6]," in result.stdout
+
+    expected_stdout = """module example_cube(anchor = [0, 0, 0]) {
+    center = [2.0, 3.0, 2.0];
+    displacement = [anchor.x * 5.0,
+                    anchor.y * 10.0,
+                    anchor.z * 15.0];
+
+    translate(-center - displacement)
+    polyhedron_example_cube();
+}
+"""
+    assert expected_stdout in result.stdout
+
+
+def test_embed_indexed(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the output of the embed subcommand with welded vertices."""
+    result = stl2scad_ifc.run_ok(["embed", "--indexed", "--name", "MyCube", str(test_data_dir / "example_cube.stl")])
+
+    expected_stdout = (
+        "module polyhedron_MyCube(convexity = 1) {\n"
+        "    vertices = [[-3.0, 13.0, 17.0], [7.0, -7.0, 17.0], [7.0, 13.0, 17.0], [-3.0, -7.0, 17.0], "
+        "[-3.0, -7.0, -13.0], [7.0, 13.0, -13.0], [7.0, -7.0, -13.0], [-3.0, 13.0, -13.0]];\n"
+    )
+    assert expected_stdout in result.stdout
+    assert "    faces = [[2, 1, 0], [3, 0, 1], [6, 5, 4], [7, 4, 5]," in result.stdout
+
+
+def test_embed_binary(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test that the embed subcommand generates the same code for the binary and ASCII STL files."""
+    result_ascii = stl2scad_ifc.run_ok(["embed", "--name", "MyCube", str(test_data_dir / "example_cube.stl")])
+    result_binary = stl2scad_ifc.run_ok(["embed", "--name", "MyCube", str(test_data_dir / "example_cube_binary.stl")])
+
+    assert result_ascii.stdout.replace("example_cube.stl", "example_cube_binary.stl") == result_binary.stdout
+
+
+def test_embed_decimated(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the output of the embed subcommand decimating the mesh."""
+    result = stl2scad_ifc.run_ok(["embed", "--target-faces", "100", str(test_data_dir / "example_sphere.stl")])
+    assert "Decimated 1020 faces to 100 faces" in result.stderr
+    faces = result.stdout.split("faces = ")[1].split(";")[0]
+    assert faces.count("[") == 101
+
+    # The faces of the cube can't be collapsed without changing its shape
+    result_indexed = stl2scad_ifc.run_ok(["embed", "--indexed", str(test_data_dir / "example_cube.stl")])
+    result_decimated = stl2scad_ifc.run_ok(["embed", "--max-error", "0", str(test_data_dir / "example_cube.stl")])
+    assert "Decimated 12 faces to 12 faces" in result_decimated.stderr
+    assert result_decimated.stdout == result_indexed.stdout
+
+
+def test_embed_decimated_scale(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test that the maximum error of the decimation is a distance, so the result doesn't depend on the scale."""
+    lines = (test_data_dir / "example_sphere.stl").read_text(encoding="utf-8").splitlines()
+    decimated = []
+    for scale in [1 / 64, 1, 64]:
+        scaled_lines = [
+            (
+                "vertex " + " ".join(repr(float(value) * scale) for value in line.split()[1:])
+                if line.strip().startswith("vertex")
+                else line
+            )
+            for line in lines
+        ]
+        (tmp_path / "sphere.stl").write_text("\n".join(scaled_lines) + "\n", encoding="utf-8")
+        result = stl2scad_ifc.run_ok(["--no-cache", "embed", "--max-error", repr(0.05 * scale), "sphere.stl"], tmp_path)
+        decimated.append(result.stderr.split("Decimated 1020 faces to ")[1].split()[0])
+
+    assert decimated == ["682"] * 3
+
+
+def test_embed_sidecar(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the output of the embed subcommand writing the mesh into a sidecar file."""
+    output = tmp_path / "cube.scad"
+    stl2scad_ifc.run_ok(["embed", "--format", "stl", "--output", str(output), str(test_data_dir / "example_cube.stl")])
+    sidecar = tmp_path / "example_cube_embedded.stl"
+    assert 'import("example_cube_embedded.stl", convexity = convexity);' in output.read_text(encoding="utf-8")
+    assert "    center = [2.0, 3.0, 2.0];" in output.read_text(encoding="utf-8")
+    assert sidecar.stat().st_size == 84 + 12 * 50
+
+    result = stl2scad_ifc.run_ok(["dims", str(sidecar)])
+    assert "X: -3.0 - 7.0" in result.stdout
+
+    sidecar = tmp_path / "cube.off"
+    result = stl2scad_ifc.run_ok(
+        ["embed", "--format", "off", "--sidecar", str(sidecar), str(test_data_dir / "example_cube.stl")], cwd=tmp_path
+    )
+    assert 'import("cube.off", convexity = convexity);' in result.stdout
+    assert sidecar.read_text(encoding="utf-8").startswith("OFF\n8 12 0\n-3.0 13.0 17.0\n")
+
+    stl2scad_ifc.run_fail(
+        ["embed", "--format", "stl", "--sidecar", "example_cube.stl", "example_cube.stl"], cwd=test_data_dir
+    )
+
+
+def test_embed_precision(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the output of the embed subcommand with reduced precision."""
+    result = stl2scad_ifc.run_ok(["embed", "--precision", "float32", str(test_data_dir / "example_sphere.stl")])
+    assert "vertices = [[3.9613376, -6.808778, 22.951847], [3.9613376, -7.191222, 22.951847]," in result.stdout
+    assert "    center = [3, -7, 13];" in result.stdout
+
+    result = stl2scad_ifc.run_ok(["embed", "--precision", "2", str(test_data_dir / "example_sphere.stl")])
+    assert "vertices = [[3.96, -6.81, 22.95], [3.96, -7.19, 22.95], [3.98, -7, 22.95]," in result.stdout
+    assert "                    anchor.z * 9.95];" in result.stdout
+
+    stl2scad_ifc.run_fail(["embed", "--precision", "many", str(test_data_dir / "example_sphere.stl")])
+
+
+def test_embed_profile(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the profile report of the embed subcommand."""
+    report_file = tmp_path / "profile.json"
+    dump_file = tmp_path / "profile.prof"
+    result = stl2scad_ifc.run_ok(
+        [
+            "--no-cache",
+            "--profile",
+            "--profile-format",
+            "json",
+            "--profile-output",
+            str(report_file),
+            "--profile-dump",
+            str(dump_file),
+            "embed",
+            "--indexed",
+            str(test_data_dir / "example_cube.stl"),
+        ]
+    )
+
+    assert "module polyhedron_example_cube(" in result.stdout
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert {"total", "load", "weld", "format", "write"} <= set(report)
+    assert report["total"]["calls"] == 1
+    assert report["total"]["wall_seconds"] >= report["weld"]["wall_seconds"]
+    assert dump_file.stat().st_size > 0
+
+
+def test_embed_split(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the embed subcommand splitting an ASCII STL file with two solids into its parts."""
+    cube = (test_data_dir / "example_cube.stl").read_text(encoding="utf-8")
+    moved_cube = re.sub(r"vertex (\S+)", lambda match: f"vertex {float(match.group(1)) + 100}", cube)
+    (tmp_path / "cubes.stl").write_text(cube + moved_cube, encoding="utf-8")
+    result = stl2scad_ifc.run_ok(["--no-cache", "embed", "--split", "--precision", "float32", "cubes.stl"], tmp_path)
+
+    assert "module polyhedron_cubes_part1(convexity = 1) {\n    vertices = [[-3, 13, 17], [7, -7, 17]," in result.stdout
+    assert "module polyhedron_cubes_part2(convexity = 1) {\n    vertices = [[97, 13, 17], [107, -7, 17]," in (
+        result.stdout
+    )
+    assert "module cubes_part2(anchor = [0, 0, 0]) {\n    center = [102, 3, 2];\n" in result.stdout
+    expected_stdout = """module polyhedron_cubes(convexity = 1) {
+    polyhedron_cubes_part1(convexity = convexity);
+    polyhedron_cubes_part2(convexity = convexity);
+}
+"""
+    assert expected_stdout in result.stdout
+    assert "module cubes(anchor = [0, 0, 0]) {\n    center = [52, 3, 2];\n" in result.stdout
+    assert "anchor.x * 55," in result.stdout
+
+
+def test_embed_tile(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the embed subcommand partitioning two separate cubes into tiles."""
+    cube = (test_data_dir / "example_cube.stl").read_text(encoding="utf-8")
+    moved_cube = re.sub(r"vertex (\S+)", lambda match: f"vertex {float(match.group(1)) + 100}", cube)
+    (tmp_path / "cubes.stl").write_text(cube + moved_cube, encoding="utf-8")
+    result = stl2scad_ifc.run_ok(
+        ["--no-cache", "embed", "--tile", "2", "--precision", "float32", "cubes.stl"], tmp_path
+    )
+
+    assert len(re.findall(r"module polyhedron_cubes_tile_\d_\d_\d\(convexity = 1\)", result.stdout)) == 8
+    assert "module polyhedron_cubes_tile_1_1_1(convexity = 1) {\n    vertices = [[97, 13, 17], [107, -7, 17]," in (
+        result.stdout
+    )
+    assert "module polyhedron_cubes(convexity = 1, clip = undef) {" in result.stdout
+    expected_stdout = """    if (overlaps([-3, -7, -13], [7, 13, 17]))
+        polyhedron_cubes_tile_0_1_1(convexity = convexity);
+    if (overlaps([97, -7, -13], [107, 13, 17]))
+        polyhedron_cubes_tile_1_0_0(convexity = convexity);
+"""
+    assert expected_stdout in result.stdout
+    assert "module cubes(anchor = [0, 0, 0], clip = undef) {" in result.stdout
+    assert "    polyhedron_cubes(clip = clip);\n" in result.stdout
+
+    stl2scad_ifc.run_fail(["embed", "--tile", "2", "--split", "cubes.stl"], tmp_path)
+    stl2scad_ifc.run_fail(["embed", "--tile", "0", "cubes.stl"], tmp_path)
+
+
+def test_embed_lod(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the embed subcommand writing levels of detail."""
+    result = stl2scad_ifc.run_ok(
+        ["--no-cache", "embed", "--lod", "50%,0.25", str(test_data_dir / "example_sphere.stl")]
+    )
+
+    face_counts = [
+        len(json.loads(faces))
+        for faces in re.findall(r"module polyhedron_example_sphere_lod\d.*\n.*\n    faces = (.*);", result.stdout)
+    ]
+    assert face_counts == [1020, 510, 256]
+    expected_stdout = """module polyhedron_example_sphere(convexity = 1, lod = undef) {
+    level = is_undef(lod) ? ($preview ? 2 : 0) : lod;
+    if (level <= 0)
+        polyhedron_example_sphere_lod0(convexity = convexity);
+    else if (level == 1)
+        polyhedron_example_sphere_lod1(convexity = convexity);
+    else
+        polyhedron_example_sphere_lod2(convexity = convexity);
+}
+"""
+    assert expected_stdout in result.stdout
+    assert "module example_sphere(anchor = [0, 0, 0], lod = undef) {" in result.stdout
+    assert "    polyhedron_example_sphere(lod = lod);\n" in result.stdout
+
+    stl2scad_ifc.run_fail(["embed", "--lod", "150%", str(test_data_dir / "example_sphere.stl")])
+
+
+def test_embed_archive(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the embed subcommand writing the code compressed into an archive file as well."""
+    stl_file = str(test_data_dir / "example_sphere.stl")
+    result = stl2scad_ifc.run_ok(["embed", "--archive", "sphere.scad.gz", stl_file], tmp_path)
+
+    assert gzip.decompress((tmp_path / "sphere.scad.gz").read_bytes()).decode("utf-8") == result.stdout
+    assert "Wrote 0.2 MB to stdout in " in result.stderr
+
+    stl2scad_ifc.run_fail(["embed", "--archive", "sphere.scad.bz2", stl_file], tmp_path)
+    assert not (tmp_path / "sphere.scad.bz2").exists()
@@ -0,0 +1,79 @@
+"""Test the output of the batch subcommand."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import shutil
+from pathlib import Path
+
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_batch_output_dir(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the batch subcommand writing one file per STL file."""
+    result = stl2scad_ifc.run_ok(
+        ["batch", "--mode", "embed", "--jobs", "2", "--output-dir", str(tmp_path), str(test_data_dir)]
+    )
+
+    assert "Converted 3 of 3 files" in result.stdout
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "example_cube.scad",
+        "example_cube_binary.scad",
+        "example_sphere.scad",
+    ]
+    embed_result = stl2scad_ifc.run_ok(["embed", str(test_data_dir / "example_cube.stl")])
+    assert (tmp_path / "example_cube.scad").read_text(encoding="utf-8") == embed_result.stdout
+
+
+def test_batch_library(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the batch subcommand writing a single library file."""
+    shutil.copy(test_data_dir / "example_cube.stl", tmp_path)
+    shutil.copy(test_data_dir / "example_sphere.stl", tmp_path)
+    stl2scad_ifc.run_ok(["batch", "--library", "library.scad", "*.stl"], cwd=tmp_path)
+
+    library = (tmp_path / "library.scad").read_text(encoding="utf-8")
+    assert library.count("Generated code by stl2scad") == 1
+    assert library.index("module example_cube(") < library.index("module example_sphere(")
+    assert 'import("example_cube.stl");' in library
+
+
+def test_batch_library_names(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the disambiguation of the object names in a library file."""
+    for directory in ["a", "b"]:
+        (tmp_path / directory).mkdir()
+        shutil.copy(test_data_dir / "example_cube.stl", tmp_path / directory / "my-part.stl")
+    shutil.copy(test_data_dir / "example_cube.stl", tmp_path / "my_part_2.stl")
+    stl2scad_ifc.run_ok(
+        ["batch", "--mode", "embed", "--jobs", "3", "--library", "library.scad", "a", "b", "my_part_2.stl"],
+        cwd=tmp_path,
+    )
+
+    library = (tmp_path / "library.scad").read_text(encoding="utf-8")
+    assert library.count("Generated code by stl2scad") == 1
+    assert library.index("module my_part(") < library.index("module my_part_3(") < library.index("module my_part_2(")
+    assert "module polyhedron_my_part_3(" in library
+
+
+def test_batch_profile(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the aggregation of the profiles of the worker processes by the batch subcommand."""
+    result = stl2scad_ifc.run_ok(
+        ["--profile", "batch", "--mode", "embed", "--jobs", "2", "--output-dir", str(tmp_path), str(test_data_dir)]
+    )
+
+    convert_line = [line for line in result.stderr.splitlines() if line.startswith("convert ")]
+    assert len(convert_line) == 1
+    assert convert_line[0].split()[1] == "3"
+
+
+def test_batch_failure(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the summary of the batch subcommand if a file can't be converted."""
+    shutil.copy(test_data_dir / "example_cube.stl", tmp_path)
+    (tmp_path / "broken.stl").write_text("broken", encoding="utf-8")
+    result = stl2scad_ifc.run_fail(["batch", str(tmp_path)])
+
+    assert "Converted 1 of 2 files" in result.stdout
+    assert f"Failed to convert {tmp_path / 'broken.stl'}" in result.stdout
+    assert (tmp_path / "example_cube.scad").exists()
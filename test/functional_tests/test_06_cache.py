@@ -0,0 +1,57 @@
+"""Test the cache of the mesh metadata."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import shutil
+from pathlib import Path
+
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_cache(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test that a second call uses the cached data and doesn't load the STL file again."""
+    stl_file = tmp_path / "example_cube.stl"
+    shutil.copy(test_data_dir / "example_cube.stl", stl_file)
+    stl2scad_ifc.run_ok(["cache", "clear"])
+
+    first = stl2scad_ifc.run_ok(["--loglevel", "DEBUG", "embed", "--indexed", str(stl_file)])
+    assert "Loading file" in first.stderr
+    result = stl2scad_ifc.run_ok(["cache", "info"])
+    assert "Entries:         2" in result.stdout
+
+    second = stl2scad_ifc.run_ok(["--loglevel", "DEBUG", "embed", "--indexed", str(stl_file)])
+    assert "Loading file" not in second.stderr
+    assert "Using cached info" in second.stderr
+    assert "Using cached welded mesh" in second.stderr
+    assert first.stdout == second.stdout
+
+    result = stl2scad_ifc.run_ok(["--loglevel", "DEBUG", "dims", str(stl_file)])
+    assert "Loading file" not in result.stderr
+    assert "X: -3.0 - 7.0" in result.stdout
+
+
+def test_cache_invalidation(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test that a modified STL file is loaded again."""
+    stl_file = tmp_path / "example.stl"
+    shutil.copy(test_data_dir / "example_cube.stl", stl_file)
+    stl2scad_ifc.run_ok(["dims", str(stl_file)])
+
+    shutil.copy(test_data_dir / "example_sphere.stl", stl_file)
+    result = stl2scad_ifc.run_ok(["--loglevel", "DEBUG", "dims", str(stl_file)])
+    assert "Read 1020 triangles" in result.stderr
+    assert "Z: 3.0481526851654053 - 22.951847076416016" in result.stdout
+
+
+def test_no_cache(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the --no-cache option and the clear action."""
+    stl2scad_ifc.run_ok(["dims", str(test_data_dir / "example_cube.stl")])
+    result = stl2scad_ifc.run_ok(["cache", "clear"])
+    assert "Removed" in result.stdout
+
+    stl2scad_ifc.run_ok(["--no-cache", "dims", str(test_data_dir / "example_cube.stl")])
+    result = stl2scad_ifc.run_ok(["cache", "info"])
+    assert "Entries:         0" in result.stdout
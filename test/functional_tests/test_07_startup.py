@@ -0,0 +1,55 @@
+"""Test the imports at the startup of the application."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+
+# ----------------------------------------------------------------------------
+#  SETTINGS
+# ----------------------------------------------------------------------------
+# Modules that must not be imported for the --version and --help options.
+HEAVY_MODULES = ["numpy", "stl", "coloredlogs"]
+
+
+# ----------------------------------------------------------------------------
+#  HELPERS
+# ----------------------------------------------------------------------------
+def get_import_times(executable: List[str], args: List[str]) -> Dict[str, int]:
+    """Run stl2scad using 'python -X importtime' and return the cumulative import time of each module."""
+    with open(executable[-1], "rb") as file_handle:
+        first_line = file_handle.readline()
+    if len(executable) != 1 or not first_line.startswith(b"#!") or b"python" not in first_line:
+        pytest.skip("The import time can only be measured if the executable is a python script.")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", executable[0]] + args,
+        text=True,
+        check=True,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+@pytest.mark.parametrize("args", [["--version"], ["--help"], ["embed", "--help"]])
+def test_startup_imports(executable: List[str], args: List[str]):
+    """Test that the heavy dependencies are not imported if no subcommand is executed."""
+    import_times = get_import_times(executable, args)
+
+    assert "stl_2_scad.cli" in import_times
+    for module in HEAVY_MODULES:
+        assert module not in import_times, f"Module {module} is imported by stl2scad {' '.join(args)}"
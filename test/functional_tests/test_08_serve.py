@@ -0,0 +1,76 @@
+"""Test the serve subcommand."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import json
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_serve_stdin(executable: List[str], stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the serve subcommand reading the requests from stdin."""
+    requests = [
+        {"id": 1, "argv": ["dims", "example_cube.stl"], "cwd": str(test_data_dir)},
+        {"id": 2, "argv": ["--loglevel", "DEBUG", "embed", "--indexed", "example_cube.stl"], "cwd": str(test_data_dir)},
+        {"id": 3, "argv": ["--loglevel", "DEBUG", "embed", "--indexed", "example_cube.stl"], "cwd": str(test_data_dir)},
+        {"id": 4, "argv": ["dims", "missing.stl"], "cwd": str(test_data_dir)},
+        {"id": 5, "argv": ["serve"]},
+    ]
+    result = subprocess.run(
+        executable + ["serve", "--workers", "1"],
+        input="".join(json.dumps(request) + "\n" for request in requests),
+        text=True,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    responses = {response["id"]: response for response in map(json.loads, result.stdout.splitlines())}
+
+    assert sorted(responses) == [1, 2, 3, 4, 5]
+    assert responses[1]["returncode"] == 0
+    assert "X: -3.0 - 7.0" in responses[1]["stdout"]
+    embed_result = stl2scad_ifc.run_ok(["embed", "--indexed", str(test_data_dir / "example_cube.stl")])
+    assert responses[2]["stdout"] == embed_result.stdout
+    assert responses[3]["stdout"] == embed_result.stdout
+    assert "Using opened file" in responses[3]["stderr"]
+    assert responses[4]["returncode"] == 1
+    assert "not found" in responses[4]["stderr"]
+    assert responses[5]["returncode"] == 1
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not supported.")
+def test_serve_socket(
+    executable: List[str], stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path, monkeypatch
+):
+    """Test forwarding the calls to a server listening on a Unix domain socket."""
+    socket_path = tmp_path / "stl2scad.sock"
+    with subprocess.Popen(executable + ["serve", "--workers", "1", "--socket", str(socket_path)]) as server:
+        try:
+            for _ in range(100):
+                if socket_path.exists():
+                    break
+                time.sleep(0.1)
+
+            monkeypatch.setenv("STL2SCAD_SERVER", str(socket_path))
+            result = stl2scad_ifc.run_ok(["--loglevel", "DEBUG", "dims", "example_cube.stl"], cwd=test_data_dir)
+            assert "X: -3.0 - 7.0" in result.stdout
+            result = stl2scad_ifc.run_ok(["--loglevel", "DEBUG", "dims", "example_cube.stl"], cwd=test_data_dir)
+            assert "Using opened file" in result.stderr
+            stl2scad_ifc.run_fail(["dims", "missing.stl"], cwd=test_data_dir)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    assert not socket_path.exists()
+    result = stl2scad_ifc.run_ok(["dims", str(test_data_dir / "example_cube.stl")])
+    assert "X: -3.0 - 7.0" in result.stdout
@@ -0,0 +1,67 @@
+"""Test the watch subcommand."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+
+# ----------------------------------------------------------------------------
+#  HELPERS
+# ----------------------------------------------------------------------------
+def wait_for(condition: Callable[[], bool], timeout: float = 20.0) -> bool:
+    """Wait until the condition is met or the timeout expired."""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+@pytest.mark.parametrize("polling", [False, True])
+def test_watch(executable: List[str], test_data_dir: Path, tmp_path: Path, polling: bool):
+    """Test the regeneration of the changed STL files."""
+    parts_dir = tmp_path / "parts"
+    parts_dir.mkdir()
+    shutil.copy(test_data_dir / "example_cube.stl", parts_dir / "part.stl")
+    output = parts_dir / "part.scad"
+
+    options = ["--polling", "--interval", "0.1"] if polling else []
+    command = (
+        executable
+        + ["--loglevel", "DEBUG", "watch", "--debounce", "0.1", "--mode", "embed"]
+        + options
+        + [str(parts_dir)]
+    )
+    with subprocess.Popen(command, stderr=subprocess.PIPE, text=True) as watcher:
+        try:
+            assert wait_for(output.exists)
+            assert "module polyhedron_part(" in output.read_text(encoding="utf-8")
+            assert "[-3.0, 13.0, 17.0]" in output.read_text(encoding="utf-8")
+
+            shutil.copy(test_data_dir / "example_sphere.stl", parts_dir / "part.stl")
+            assert wait_for(lambda: "[-3.0, 13.0, 17.0]" not in output.read_text(encoding="utf-8"))
+
+            shutil.copy(test_data_dir / "example_cube.stl", parts_dir / "new.stl")
+            assert wait_for((parts_dir / "new.scad").exists)
+
+            # Touching the file changes the modification time, but not the content
+            (parts_dir / "part.stl").touch()
+            time.sleep(0.5)
+        finally:
+            watcher.terminate()
+            _, stderr = watcher.communicate(timeout=10)
+
+    assert "latency" in stderr
+    assert "part.stl is unchanged" in stderr
+    assert not list(parts_dir.glob("*.tmp"))
@@ -0,0 +1,68 @@
+"""Test the python API of stl2scad."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import stl
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+import stl_2_scad
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_api_lazy_import():
+    """Test that importing the package doesn't import numpy until the API is used."""
+    script = (
+        "import sys, stl_2_scad\n"
+        "assert 'numpy' not in sys.modules\n"
+        "assert stl_2_scad.get_bounds is not None\n"
+        "assert 'numpy' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=Path(stl_2_scad.__file__).parent.parent)
+
+
+def test_api_import(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test that the import module generated from the mesh in memory equals the output of the import subcommand."""
+    stl_file = str(test_data_dir / "example_cube.stl")
+    result = stl2scad_ifc.run_ok(["import", "--precision", "float32", stl_file])
+    mesh = stl.mesh.Mesh.from_file(stl_file)
+    options = stl_2_scad.ConversionOptions(precision="float32")
+
+    assert stl_2_scad.generate_import(mesh, "example_cube", stl_file, options) + "\n" == result.stdout
+    assert stl_2_scad.generate_import(stl_file, options=options) + "\n" == result.stdout
+
+    bbox = stl_2_scad.get_bounds(mesh.vectors)
+    assert bbox.center == [2.0, 3.0, 2.0]
+    assert bbox.half_extents == [5.0, 10.0, 15.0]
+
+
+def test_api_embed(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test that the code embedding the mesh in memory equals the output of the embed subcommand."""
+    stl_file = str(test_data_dir / "example_cube.stl")
+    result = stl2scad_ifc.run_ok(["embed", "--indexed", "--name", "cube", stl_file])
+    vertices, faces = stl_2_scad.load_stl(stl_file).vectors.reshape(-1, 3), np.arange(36).reshape(-1, 3)
+
+    file_handle = io.StringIO()
+    stl_2_scad.write_embed(file_handle, (vertices, faces), "cube", stl_2_scad.ConversionOptions(indexed=True))
+    assert file_handle.getvalue() == result.stdout.replace("example_cube.stl", "<memory>")
+
+    binary_handle = io.BytesIO()
+    stl_2_scad.write_mesh(binary_handle, (vertices, faces), "off")
+    assert binary_handle.getvalue().startswith(b"OFF\n8 12 0\n")
+
+    with pytest.raises(ValueError):
+        stl_2_scad.generate_embed(vertices)
+    for invalid_faces in ([[0, 1, -1]], [[0, 1, 36]]):
+        with pytest.raises(ValueError):
+            stl_2_scad.as_mesh((vertices, np.array(invalid_faces)))
+    with pytest.raises(ValueError):
+        stl_2_scad.ConversionOptions(precision=16)
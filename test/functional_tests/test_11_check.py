@@ -0,0 +1,55 @@
+"""Test the check subcommand and the repair of meshes."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+from pathlib import Path
+
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+
+# ----------------------------------------------------------------------------
+#  HELPERS
+# ----------------------------------------------------------------------------
+def create_defective_cube(test_data_dir: Path, target: Path) -> None:
+    """Create the cube with the winding order of the last face flipped and the first face duplicated."""
+    lines = (test_data_dir / "example_cube.stl").read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[-5], lines[-4] = lines[-4], lines[-5]
+    target.write_text("".join(lines[:-1] + lines[1:8] + lines[-1:]), encoding="utf-8")
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_check(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path):
+    """Test the check subcommand on valid STL files."""
+    stl_files = [str(test_data_dir / "example_cube.stl"), str(test_data_dir / "example_sphere.stl")]
+    result = stl2scad_ifc.run_ok(["--no-cache", "check"] + stl_files)
+
+    assert f"{stl_files[0]}:\n    Vertices:              8\n    Faces:                 12\n" in result.stdout
+    assert "    Inconsistent edges:    0\n    Boundary edges:        0\n    Non-manifold edges:    0\n" in result.stdout
+
+
+def test_check_defects(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the check subcommand on an STL file with defects."""
+    create_defective_cube(test_data_dir, tmp_path / "cube.stl")
+    result = stl2scad_ifc.run_fail(["--no-cache", "check", "cube.stl"], tmp_path)
+
+    assert "    Faces:                 13\n" in result.stdout
+    assert "    Duplicate faces:       1\n" in result.stdout
+    assert "    Inconsistent edges:    3\n" in result.stdout
+
+    stl2scad_ifc.run_fail(["--no-cache", "check", "missing.stl"], tmp_path)
+
+
+def test_embed_repair(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test that the embed subcommand repairs the defects of the STL file."""
+    create_defective_cube(test_data_dir, tmp_path / "cube.stl")
+    result = stl2scad_ifc.run_ok(["--no-cache", "embed", "--repair", "cube.stl"], tmp_path)
+
+    assert "Removed 0 degenerate and 1 duplicate faces and flipped 1 faces" in result.stderr
+    expected_faces = (
+        "    faces = [[2, 1, 0], [3, 0, 1], [6, 5, 4], [7, 4, 5], [3, 1, 4], [6, 4, 1],"
+        " [2, 5, 1], [6, 1, 5], [2, 0, 5], [7, 5, 0], [7, 0, 4], [0, 3, 4]];\n"
+    )
+    assert expected_faces in result.stdout
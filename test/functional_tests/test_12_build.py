@@ -0,0 +1,105 @@
+"""Test the build subcommand."""
+
+# ----------------------------------------------------------------------------
+#  MODULE IMPORTS
+# ----------------------------------------------------------------------------
+import json
+import os
+import shutil
+from pathlib import Path
+
+from helpers.stl2scad_ifc import Stl2scadIfc
+
+# ----------------------------------------------------------------------------
+#  MODULE VARIABLES
+# ----------------------------------------------------------------------------
+MANIFEST = """
+[defaults]
+precision = "float32"
+
+[[items]]
+stl = "parts/example_cube.stl"
+output = "scad/cube.scad"
+name = "Cube"
+
+[[items]]
+stl = "parts/example_sphere.stl"
+mode = "import"
+"""
+
+
+# ----------------------------------------------------------------------------
+#  HELPERS
+# ----------------------------------------------------------------------------
+def create_project(test_data_dir: Path, target: Path) -> None:
+    """Create the manifest and copy the STL files into the parts directory."""
+    (target / "parts").mkdir(parents=True)
+    for name in ["example_cube.stl", "example_sphere.stl"]:
+        shutil.copy(test_data_dir / name, target / "parts" / name)
+    (target / "parts.toml").write_text(MANIFEST, encoding="utf-8")
+
+
+# ----------------------------------------------------------------------------
+#  TESTS
+# ----------------------------------------------------------------------------
+def test_build(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test that the build subcommand generates the outputs that are out of date."""
+    create_project(test_data_dir, tmp_path)
+    result = stl2scad_ifc.run_ok(["--no-cache", "build", "--jobs", "1", "parts.toml"], tmp_path)
+    assert "Converted 2 of 2 files" in result.stdout
+    assert "module Cube(" in (tmp_path / "scad" / "cube.scad").read_text(encoding="utf-8")
+    assert 'import("example_sphere.stl");' in (tmp_path / "parts" / "example_sphere.scad").read_text(encoding="utf-8")
+
+    lock = json.loads((tmp_path / "parts.toml.lock").read_text(encoding="utf-8"))
+    assert sorted(lock["outputs"]) == ["parts/example_sphere.scad", "scad/cube.scad"]
+
+    # Updating the modification time of an STL file doesn't change its content
+    os.utime(tmp_path / "parts" / "example_cube.stl", ns=(0, 0))
+    result = stl2scad_ifc.run_ok(["--no-cache", "build", "parts.toml"], tmp_path)
+    assert "All 2 outputs are up to date." in result.stdout
+
+    # Changing the options of an item regenerates its output only
+    (tmp_path / "parts.toml").write_text(MANIFEST.replace('"Cube"', '"Box"'), encoding="utf-8")
+    result = stl2scad_ifc.run_ok(["--no-cache", "build", "--dry-run", "parts.toml"], tmp_path)
+    assert result.stdout == f"{os.path.join('scad', 'cube.scad')}\n"
+    result = stl2scad_ifc.run_ok(["--no-cache", "build", "parts.toml"], tmp_path)
+    assert "Converted 1 of 1 files" in result.stdout
+    assert "module Box(" in (tmp_path / "scad" / "cube.scad").read_text(encoding="utf-8")
+
+    result = stl2scad_ifc.run_ok(["--no-cache", "build", "--force", "parts.toml"], tmp_path)
+    assert "Converted 2 of 2 files" in result.stdout
+
+
+def test_build_absolute_output(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the build subcommand with absolute outputs and a manifest outside of the working directory."""
+    create_project(test_data_dir, tmp_path / "project")
+    manifest = {
+        "items": [
+            {"stl": "parts/example_cube.stl", "output": str(tmp_path / "out" / "cube.scad")},
+            {"stl": "parts/example_sphere.stl", "output": str(tmp_path / "out" / "sphere.scad"), "mode": "import"},
+        ]
+    }
+    (tmp_path / "project" / "parts.json").write_text(json.dumps(manifest), encoding="utf-8")
+    (tmp_path / "elsewhere").mkdir()
+    result = stl2scad_ifc.run_ok(["--no-cache", "build", "../project/parts.json"], tmp_path / "elsewhere")
+    assert "Converted 2 of 2 files" in result.stdout
+    assert 'import("../project/parts/example_sphere.stl");' in (tmp_path / "out" / "sphere.scad").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_build_failures(stl2scad_ifc: Stl2scadIfc, test_data_dir: Path, tmp_path: Path):
+    """Test the build subcommand with missing STL files and invalid manifests."""
+    create_project(test_data_dir, tmp_path)
+    (tmp_path / "parts" / "example_cube.stl").unlink()
+    result = stl2scad_ifc.run_fail(["--no-cache", "build", "parts.toml"], tmp_path)
+    assert "Converted 1 of 2 files" in result.stdout
+
+    (tmp_path / "invalid.json").write_text('{"items": [{"stl": "a.stl", "mode": "export"}]}', encoding="utf-8")
+    stl2scad_ifc.run_fail(["--no-cache", "build", "invalid.json"], tmp_path)
+    stl2scad_ifc.run_fail(["--no-cache", "build", "missing.toml"], tmp_path)
+
+    for manifest in ['{"targets": []}', '{"items": [], "targets": []}', '{"defaults": [1, 2], "items": []}']:
+        (tmp_path / "invalid.json").write_text(manifest, encoding="utf-8")
+        result = stl2scad_ifc.run_fail(["--no-cache", "build", "invalid.json"], tmp_path)
+        assert "Traceback" not in result.stderr